@@ -2,6 +2,8 @@
 
 from rest_framework import serializers  
 from django.contrib.auth import get_user_model  
+from django.db.models import Case, CharField, F, Value, When
+from django.db.models.functions import Concat
 from timesystem.models import Employee, Project, Task, TimeEntry, ClockInRecord, JobRecord, BreakRecord,LeaveRequest, LeaveBalance, Performance, WorkHours
 
 User = get_user_model()  
@@ -33,12 +35,26 @@ class ProjectSerializer(serializers.ModelSerializer):
         fields = '__all__'  
 
 
+def annotate_task_names(queryset):
+    """Assignee and project names as columns, joined through ``assigned_to__user`` and ``project``."""
+    return queryset.annotate(
+        assigned_to_full_name=Case(
+            When(assigned_to__isnull=True, then=Value(None)),
+            default=Concat('assigned_to__user__first_name', Value(' '), 'assigned_to__user__last_name'),
+            output_field=CharField(),
+        ),
+        assigned_to_name=F('assigned_to__user__first_name'),
+        project_name=F('project__name'),
+    )
+
+
 class TaskSerializer(serializers.ModelSerializer):
-    assigned_to_full_name = serializers.SerializerMethodField()
-    project_name = serializers.SerializerMethodField()
+    # Read from annotate_task_names(); views must list through it
+    assigned_to_full_name = serializers.CharField(read_only=True, allow_null=True)
+    project_name = serializers.CharField(read_only=True, allow_null=True)
 
     # New fields for dropdowns
-    assigned_to_name = serializers.CharField(source='assigned_to.first_name', read_only=True)
+    assigned_to_name = serializers.CharField(read_only=True, allow_null=True)
     status = serializers.ChoiceField(choices=Task.STATUS_CHOICES, required=True)
 
     class Meta:
@@ -58,15 +74,12 @@ class TaskSerializer(serializers.ModelSerializer):
     def validate_status(self, value):
         return value.lower()
 
-    def get_assigned_to_full_name(self, obj):
-        if obj.assigned_to:
-            return f"{obj.assigned_to.first_name} {obj.assigned_to.last_name}"
-        return None
+    def _with_names(self, instance):
+        # Written rows carry no (or stale) annotations; re-read them in one query
+        return annotate_task_names(Task.objects.filter(pk=instance.pk)).get()
 
-    def get_project_name(self, obj):
-        if obj.project:
-            return obj.project.name
-        return None
+    def create(self, validated_data):
+        return self._with_names(super().create(validated_data))
 
     # Optional custom update logic for partial updates
     def update(self, instance, validated_data):
@@ -81,7 +94,7 @@ class TaskSerializer(serializers.ModelSerializer):
             instance.project = validated_data['project']
         
         instance.save()
-        return instance
+        return self._with_names(instance)
 
 
  
@@ -168,15 +181,9 @@ class WorkHoursSerializer(serializers.ModelSerializer):
         fields = ['id', 'user', 'clock_in_time', 'clock_out_time', 'total_hours']
         read_only_fields = ['id', 'total_hours']
 
-    # Optional: Auto-calculate total hours if clock_out_time is provided
+    # total_hours is maintained by WorkHours.save(), never on read
     def validate(self, data):
         if data.get('clock_out_time') and data.get('clock_in_time'):
             if data['clock_out_time'] < data['clock_in_time']:
                 raise serializers.ValidationError("Clock out time cannot be before clock in time.")
-        return data
-
-    def to_representation(self, instance):
-        representation = super().to_representation(instance)
-        if instance.clock_out_time:
-            instance.calculate_total_hours()  # Calculate the total hours
-        return representation
\ No newline at end of file
+        return data
\ No newline at end of file
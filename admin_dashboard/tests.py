@@ -1,3 +1,240 @@
-from django.test import TestCase
+import io
+from datetime import date, datetime, timedelta
+from decimal import Decimal
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from timesystem.attendance import rebuild_daily_attendance
+from timesystem.models import ClockInRecord, Employee, Project, Task, TimeEntry, WorkHours
+
+
+class WorkHoursReportTests(APITestCase):
+
+    def setUp(self):
+        self.admin = User.objects.create_user(username='boss', password='Admin123', is_staff=True)
+        self.client.force_authenticate(self.admin)
+        self.url = '/admin-dashboard/api/reports/work-hours/'
+        start = timezone.make_aware(datetime(2024, 1, 1, 8, 0))
+        for index in range(3):
+            user = User.objects.create_user(username=f'worker{index}', first_name='Worker', last_name=str(index))
+            ClockInRecord.objects.create(user=user, time_clocked_in=start, time_clocked_out=start + timedelta(hours=8))
+
+    def test_json_report_joins_users(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url)
+        self.assertEqual(len(response.data), 3)
+        self.assertEqual(response.data[0]['hours_worked'], '8 hrs 0 mins')
+
+    def test_csv_export_streams(self):
+        response = self.client.get(self.url, {'format': 'csv', 'start_date': '2024-01-01'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(lines[0], 'user,clocked_in,clocked_out,hours_worked,extra_hours')
+        self.assertEqual(len(lines), 4)
+
+    def test_ndjson_export_streams(self):
+        response = self.client.get(self.url, {'format': 'ndjson'})
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(len(lines), 3)
+
+    def test_group_by_day_reads_rollup(self):
+        rebuild_daily_attendance(date(2024, 1, 1), date(2024, 1, 1))
+
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, {'group': 'day', 'start_date': '2024-01-01', 'end_date': '2024-01-01'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([row['user'] for row in response.data], ['Worker 0', 'Worker 1', 'Worker 2'])
+        self.assertEqual(response.data[0]['shifts'], 1)
+        self.assertEqual(response.data[0]['hours_worked'], '8 hrs 0 mins')
+
+
+class BillableHoursReportTests(APITestCase):
+
+    def setUp(self):
+        self.admin = User.objects.create_user(username='boss', password='Admin123', is_staff=True)
+        self.client.force_authenticate(self.admin)
+        self.url = '/admin-dashboard/api/reports/billable-hours/'
+        self.project = Project.objects.create(name='Payroll', description='Quarterly run')
+        other_project = Project.objects.create(name='Audit', description='Yearly audit')
+        start = timezone.make_aware(datetime(2024, 2, 1, 9, 0))
+        for index in range(4):
+            user = User.objects.create_user(username=f'consultant{index}', first_name='Consultant', last_name=str(index))
+            employee = Employee.objects.create(user=user, hire_date=date(2023, 1, 1))
+            task = Task.objects.create(name=f'Task {index}', description='', assigned_to=employee,
+                                       project=self.project if index < 3 else other_project)
+            TimeEntry.objects.create(employee=employee, task=task, is_billable=True,
+                                     start_time=start, end_time=start + timedelta(hours=2, minutes=30))
+            TimeEntry.objects.create(employee=employee, task=task, is_billable=False,
+                                     start_time=start, end_time=start + timedelta(hours=1))
+
+    def test_report_is_computed_in_a_fixed_number_of_queries(self):
+        with self.assertNumQueries(3):
+            response = self.client.get(self.url, {'limit': 2})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['totals'], {'entries': 4, 'billable_hours': 10.0})
+        self.assertEqual(len(response.data['groups']), 4)
+        self.assertEqual(len(response.data['results']), 2)
+        self.assertIsNotNone(response.data['next'])
+        self.assertEqual(response.data['results'][0]['employee'], 'Consultant 0')
+        self.assertEqual(response.data['results'][0]['billable_hours'], 2.5)
+
+    def test_group_by_project_with_filters(self):
+        response = self.client.get(self.url, {
+            'group_by': 'project', 'project': self.project.id,
+            'start_date': '2024-02-01', 'end_date': '2024-02-01',
+        })
+
+        self.assertEqual(response.data['groups'], [{
+            'project_id': self.project.id, 'project_name': 'Payroll', 'entries': 3, 'billable_hours': 7.5,
+        }])
+
+    def test_unknown_grouping_is_rejected(self):
+        response = self.client.get(self.url, {'group_by': 'colour'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class ProjectTaskReportTests(APITestCase):
+
+    def setUp(self):
+        self.admin = User.objects.create_user(username='boss', password='Admin123', is_staff=True)
+        self.client.force_authenticate(self.admin)
+        self.url = '/admin-dashboard/api/reports/tasks/'
+        user = User.objects.create_user(username='dev', first_name='Dana', last_name='Dev')
+        employee = Employee.objects.create(user=user, hire_date=date(2023, 1, 1))
+        for index in range(5):
+            project = Project.objects.create(name=f'Project {index}', description='')
+            Task.objects.create(name='Build', description='', project=project, assigned_to=employee, status='pending',
+                                due_date=timezone.make_aware(datetime(2024, 5, 1, 12, 0)))
+            Task.objects.create(name='Ship', description='', project=project, status='completed')
+
+    def test_report_is_one_query(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url)
+
+        self.assertEqual(len(response.data), 5)
+        self.assertEqual(response.data[0]['project'], 'Project 0')
+        self.assertEqual(response.data[0]['tasks'][0]['assigned_to'], 'Dana Dev')
+        self.assertEqual(response.data[0]['tasks'][1]['assigned_to'], 'Unassigned')
+
+    def test_filters_and_pagination_by_project(self):
+        response = self.client.get(self.url, {'status': 'pending', 'assigned_to': 'dev', 'due_date': '2024-05-01',
+                                              'limit': 2, 'offset': 2})
+
+        self.assertEqual(response.data['count'], 5)
+        self.assertEqual([group['project'] for group in response.data['results']], ['Project 2', 'Project 3'])
+        self.assertEqual([len(group['tasks']) for group in response.data['results']], [1, 1])
+
+
+class WorkHoursListTests(APITestCase):
+
+    def setUp(self):
+        self.admin = User.objects.create_user(username='hoursadmin', password='Admin123', is_staff=True)
+        self.client.force_authenticate(self.admin)
+        self.url = '/admin-dashboard/api/workhours/'
+        self.start = timezone.make_aware(datetime(2024, 3, 1, 8, 0))
+        for day in range(3):
+            clock_in = self.start + timedelta(days=day)
+            WorkHours.objects.create(user=self.admin, clock_in_time=clock_in, clock_out_time=clock_in + timedelta(hours=7, minutes=30))
+
+    def test_total_hours_is_computed_on_write(self):
+        self.assertEqual(list(WorkHours.objects.values_list('total_hours', flat=True)), [Decimal('7.50')] * 3)
+
+        for url in (self.url, '/api/workhours/'):
+            response = self.client.post(url, {
+                'user': self.admin.id,
+                'clock_in_time': '2024-03-10T08:00:00Z',
+                'clock_out_time': '2024-03-10T12:15:00Z',
+                'total_hours': '99.00',
+            }, format='json')
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+            self.assertEqual(response.data['total_hours'], '4.25')
+
+    def test_listing_never_writes(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url)
+        self.assertEqual(len(response.data), 3)
+        self.assertFalse([query for query in queries if not query['sql'].lstrip().upper().startswith('SELECT')])
+
+    def test_pages_and_date_range(self):
+        response = self.client.get(self.url, {'limit': 2})
+        self.assertEqual(len(response.data['results']), 2)
+        self.assertIsNotNone(response.data['next'])
+
+        response = self.client.get(self.url, {'start_date': '2024-03-02', 'end_date': '2024-03-02'})
+        self.assertEqual([row['clock_in_time'][:10] for row in response.data], ['2024-03-02'])
+        self.assertEqual(self.client.get(self.url, {'start_date': 'soon'}).status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_recompute_command_updates_in_bulk(self):
+        WorkHours.objects.update(total_hours=0)
+        WorkHours.objects.create(user=self.admin, clock_in_time=self.start + timedelta(days=5))
+
+        call_command('recompute_work_hours', '--from', '2024-03-01', stdout=io.StringIO())
+
+        self.assertEqual(sorted(WorkHours.objects.values_list('total_hours', flat=True)),
+                         [Decimal('0.00'), Decimal('7.50'), Decimal('7.50'), Decimal('7.50')])
+
+
+class TaskListTests(APITestCase):
+
+    def setUp(self):
+        self.admin = User.objects.create_user(username='boss', password='Admin123', is_staff=True)
+        self.client.force_authenticate(self.admin)
+        self.url = '/admin-dashboard/api/tasks/'
+        self.project = Project.objects.create(name='Portal', description='')
+        self.employees = [
+            Employee.objects.create(
+                user=User.objects.create_user(username=f'dev{index}', first_name='Dev', last_name=str(index)),
+                hire_date=date(2023, 1, 1),
+            )
+            for index in range(3)
+        ]
+        for index, employee in enumerate(self.employees):
+            Task.objects.create(name=f'Task {index}', description='', assigned_to=employee, project=self.project,
+                                status='completed' if index == 2 else 'pending')
+        Task.objects.create(name='Loose end', description='')
+
+    def test_names_come_from_one_query(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url)
+
+        self.assertEqual(len(response.data), 4)
+        self.assertEqual(response.data[0]['assigned_to_full_name'], 'Dev 0')
+        self.assertEqual(response.data[0]['assigned_to_name'], 'Dev')
+        self.assertEqual(response.data[0]['project_name'], 'Portal')
+        self.assertIsNone(response.data[3]['assigned_to_full_name'])
+        self.assertIsNone(response.data[3]['project_name'])
+
+    def test_filters_on_status_project_and_assignee(self):
+        response = self.client.get(self.url, {'status': 'pending', 'project': self.project.id})
+        self.assertEqual([task['name'] for task in response.data], ['Task 0', 'Task 1'])
+
+        response = self.client.get(self.url, {'assigned_to': self.employees[2].id})
+        self.assertEqual([task['name'] for task in response.data], ['Task 2'])
+
+        response = self.client.get(self.url, {'assigned_to__isnull': 'true'})
+        self.assertEqual([task['name'] for task in response.data], ['Loose end'])
+
+    def test_written_tasks_carry_fresh_names(self):
+        response = self.client.post(self.url, {
+            'name': 'New', 'description': 'Fresh', 'status': 'pending',
+            'assigned_to': self.employees[1].id, 'project': self.project.id,
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['assigned_to_full_name'], 'Dev 1')
+
+        response = self.client.put(f"{self.url}{response.data['id']}/", {
+            'name': 'New', 'description': 'Fresh', 'status': 'pending',
+            'assigned_to': self.employees[0].id, 'project': None,
+        }, format='json')
+        self.assertEqual(response.data['assigned_to_full_name'], 'Dev 0')
+        self.assertIsNone(response.data['project_name'])
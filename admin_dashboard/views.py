@@ -5,6 +5,7 @@ from rest_framework.permissions import IsAuthenticated
 from datetime import datetime, timedelta
 from rest_framework.exceptions import NotFound
 from django.http import JsonResponse
+from django.utils import timezone
 from django.utils.dateparse import parse_datetime
 from rest_framework.response import Response
 from rest_framework import status
@@ -14,13 +15,22 @@ from django.shortcuts import get_object_or_404
 from django.db.models import Sum, Count
 from django.core.exceptions import ObjectDoesNotExist
 from django.contrib.auth.decorators import login_required
-from django.db import IntegrityError
+from django.db import IntegrityError, transaction
 from django.db.models import Avg, Count,Q
 from django.db import connection
-from django.db.models import Value
-from django.db.models.functions import Concat
+from django.db.models import F, Value
+from django.db.models.functions import Concat, TruncDate
 from rest_framework.decorators import api_view, permission_classes
-from timesystem.models import Employee, Project, Task, LeaveBalance, TimeEntry, ClockInRecord, LeaveRequest,Performance,WorkHours
+from rest_framework.settings import api_settings
+from timesystem.conditional import ConditionalListMixin
+from timesystem.expressions import HoursBetween
+from timesystem.leave_ledger import sync_leave_request
+from timesystem.pagination import (
+    BillableHoursPagination, ClockInPagination, LeaveRequestPagination, ProjectPagination, WorkHoursPagination,
+)
+from timesystem.statistics import get_statistics
+from timesystem.utils import day_bounds, parse_date_param
+from timesystem.models import Employee, Project, Task, LeaveBalance, TimeEntry, ClockInRecord, DailyAttendance, LeaveRequest,Performance,WorkHours
 from .serializers import (
     EmployeeSerializer, 
     ProjectSerializer, 
@@ -31,8 +41,10 @@ from .serializers import (
     ClockInRecordSerializer,
     UserSerializer,
     PerformanceSerializer,
-    WorkHoursSerializer
+    WorkHoursSerializer,
+    annotate_task_names,
 )
+from .exports import CSVRenderer, NDJSONRenderer, iterate_in_chunks, stream_csv, stream_ndjson
 import logging
 
 logger = logging.getLogger(__name__)
@@ -89,10 +101,23 @@ class ProjectDetailView(APIView):
 
 # --- List and create employees ---
 @permission_classes([IsAuthenticated])
-class EmployeeListView(APIView):
+class EmployeeListView(generics.GenericAPIView):
+    queryset = Employee.objects.all()
+    serializer_class = EmployeeSerializer
+    filter_fields = {
+        'department': ['exact', 'in'],
+        'role': ['exact', 'in'],
+        'is_active': ['exact'],
+        'hire_date': ['gte', 'lte'],
+    }
+    ordering_fields = ('id', 'hire_date', 'created_at')
+    ordering = ('id',)
 
     def get(self, request):
-        employees = Employee.objects.all()
+        employees = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(employees)
+        if page is not None:
+            return self.get_paginated_response(EmployeeSerializer(page, many=True).data)
         serializer = EmployeeSerializer(employees, many=True)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
@@ -284,41 +309,40 @@ class AdminStatisticsView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        total_employees = Employee.objects.count()
-        total_projects = Project.objects.count()
-        total_tasks = Task.objects.count()
-        total_clockins = ClockInRecord.objects.count()
-        total_leave_requests = LeaveRequest.objects.count()
-
-        leave_balances = LeaveBalance.objects.aggregate(
-            total_annual=Sum('annual'),
-            total_sick=Sum('sick'),
-            total_casual=Sum('casual'),
-            total_maternity=Sum('maternity')
-        )
+        stats = get_statistics()
+        leave_balances = stats['leave_balances']
 
         data = {
-            'totalEmployees': total_employees,
-            'totalProjects': total_projects,
-            'totalTasks': total_tasks,
-            'totalClockIns': total_clockins,
-            'totalLeaveRequests': total_leave_requests,
+            'totalEmployees': stats['employees'],
+            'totalProjects': stats['projects'],
+            'totalTasks': stats['tasks']['total'],
+            'totalClockIns': stats['clockins']['total'],
+            'totalLeaveRequests': stats['leave_requests']['total'],
             'leaveBalances': {
-                'annual': leave_balances['total_annual'] or 0,
-                'sick': leave_balances['total_sick'] or 0,
-                'casual': leave_balances['total_casual'] or 0,
-                'maternity': leave_balances['total_maternity'] or 0,
+                'annual': leave_balances['annual'],
+                'sick': leave_balances['sick'],
+                'casual': leave_balances['casual'],
+                'maternity': leave_balances['maternity'],
             }
         }
 
         return JsonResponse(data)
 
 
-class LeaveRequestListView(APIView):
+class LeaveRequestListView(generics.GenericAPIView):
     permission_classes = [IsAuthenticated]
+    queryset = LeaveRequest.objects.all()
+    serializer_class = LeaveRequestSerializer
+    pagination_class = LeaveRequestPagination
+    filter_fields = {
+        'leave_type': ['exact'],
+        'status': ['in'],
+    }
+    ordering_fields = ('created_at', 'start_date')
+    ordering = ('-created_at', '-id')
 
     def get(self, request):
-        leave_requests = LeaveRequest.objects.all()
+        leave_requests = self.filter_queryset(self.get_queryset())
         
         # Get query parameters for filtering
         employee_name = request.query_params.get('employee_name', None)
@@ -329,17 +353,20 @@ class LeaveRequestListView(APIView):
         # Apply filters
         if employee_name:
             leave_requests = leave_requests.filter(employee_name__icontains=employee_name)
-        if start_date:
-            parsed_start_date = parse_datetime(start_date)
-            if parsed_start_date:
-                leave_requests = leave_requests.filter(start_date__gte=parsed_start_date)
-        if end_date:
-            parsed_end_date = parse_datetime(end_date)
-            if parsed_end_date:
-                leave_requests = leave_requests.filter(end_date__lte=parsed_end_date)
+        try:
+            # Leave dates are plain dates; a datetime's time part is ignored
+            if start_date:
+                leave_requests = leave_requests.filter(start_date__gte=parse_date_param(start_date[:10]))
+            if end_date:
+                leave_requests = leave_requests.filter(end_date__lte=parse_date_param(end_date[:10]))
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
         if status_param:
             leave_requests = leave_requests.filter(status=status_param)
 
+        page = self.paginate_queryset(leave_requests)
+        if page is not None:
+            return self.get_paginated_response(LeaveRequestSerializer(page, many=True).data)
         serializer = LeaveRequestSerializer(leave_requests, many=True)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
@@ -359,7 +386,9 @@ class LeaveRequestDetailView(APIView):
 
         serializer = LeaveRequestSerializer(leave_request, data=request.data, partial=True)
         if serializer.is_valid():
-            serializer.save()
+            # Approving or un-approving adjusts the leave balance in the same transaction
+            with transaction.atomic():
+                sync_leave_request(serializer.save())
             return Response(serializer.data, status=status.HTTP_200_OK)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -369,14 +398,16 @@ class LeaveRequestDetailView(APIView):
         if not leave_request:
             return Response({'error': 'Leave request not found.'}, status=status.HTTP_404_NOT_FOUND)
 
-        leave_request.delete()
+        with transaction.atomic():
+            sync_leave_request(leave_request, deleting=True)
+            leave_request.delete()
         return Response({'message': 'Leave request deleted successfully.'}, status=status.HTTP_204_NO_CONTENT)
 
 
 
 # List and Create Tasks
 class TaskListCreateView(generics.ListCreateAPIView):
-    queryset = Task.objects.all()
+    queryset = annotate_task_names(Task.objects.all())
     serializer_class = TaskSerializer
     permission_classes = [IsAuthenticated]
 
@@ -387,7 +418,7 @@ class TaskListCreateView(generics.ListCreateAPIView):
 
 # Retrieve, Update, and Delete Task
 class TaskDetailView(generics.RetrieveUpdateDestroyAPIView):
-    queryset = Task.objects.all()
+    queryset = annotate_task_names(Task.objects.all())
     serializer_class = TaskSerializer
     lookup_field = 'id'
 
@@ -406,15 +437,13 @@ class TaskDetailView(generics.RetrieveUpdateDestroyAPIView):
         self.perform_destroy(instance)
         return Response(status=204)  # No Content
     
-class ProjectListView(generics.ListAPIView):
+class ProjectListView(ConditionalListMixin, generics.ListAPIView):
     queryset = Project.objects.all()
     serializer_class = ProjectSerializer
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        projects = Project.objects.all()
-        serializer = ProjectSerializer(projects, many=True)
-        return Response(serializer.data)
+        return self.list(request)
 
     def post(self, request):
         serializer = ProjectSerializer(data=request.data)
@@ -425,7 +454,7 @@ class ProjectListView(generics.ListAPIView):
 
 
 # Fetch Users for Task Assignment
-class UserListView(generics.ListAPIView):
+class UserListView(ConditionalListMixin, generics.ListAPIView):
     queryset = User.objects.all()
     serializer_class = UserSerializer
     permission_classes = [IsAuthenticated]    
@@ -433,22 +462,57 @@ class UserListView(generics.ListAPIView):
 class TaskListView(generics.ListCreateAPIView):
     serializer_class = TaskSerializer
     permission_classes = [IsAuthenticated]
+    # status + due_date is served by task_status_due_idx, assignee + status by task_assignee_status_idx
+    filter_fields = {
+        'status': ['exact', 'in'],
+        'project': ['exact', 'in'],
+        'assigned_to': ['exact', 'in', 'isnull'],
+        'due_date': ['gte', 'lt'],
+    }
+    ordering_fields = ('id', 'due_date', 'created_at')
+    ordering = ('id',)
 
     def get_queryset(self):
-        return Task.objects.select_related('assigned_to', 'project').annotate(
-            assigned_to_full_name=Concat(
-                'assigned_to__first_name',
-                Value(' '),
-                'assigned_to__last_name'
-            )
-        )
+        # Names come back as columns of the same query; the serializer does no per-row lookups
+        return annotate_task_names(Task.objects.all())
     
 
+def _visible_clock_ins(request):
+    # Employees only see their own attendance
+    records = ClockInRecord.objects.all()
+    if not request.user.is_staff:
+        records = records.filter(user=request.user)
+    return records
+
+
 # Fetch all clock-in records or create a new one
 @api_view(['GET', 'POST'])
 def clockin_list(request):
     if request.method == 'GET':
-        records = ClockInRecord.objects.all()
+        records = _visible_clock_ins(request)
+        user_id = request.query_params.get('user')
+        if user_id:
+            try:
+                records = records.filter(user_id=int(user_id))
+            except ValueError:
+                return Response({'error': 'user must be an integer id.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        # Inclusive days on time_clocked_in, served by clockin_user_time_idx / clockin_time_idx
+        start_date = request.query_params.get('start_date')
+        end_date = request.query_params.get('end_date')
+        try:
+            if start_date:
+                records = records.filter(time_clocked_in__gte=day_bounds(parse_date_param(start_date))[0])
+            if end_date:
+                records = records.filter(time_clocked_in__lt=day_bounds(parse_date_param(end_date))[1])
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        # Newest first; ?limit= switches to cursor pages
+        paginator = ClockInPagination()
+        page = paginator.paginate_queryset(records, request)
+        if page is not None:
+            return paginator.get_paginated_response(ClockInRecordSerializer(page, many=True).data)
         serializer = ClockInRecordSerializer(records, many=True)
         return Response(serializer.data)
     
@@ -463,7 +527,7 @@ def clockin_list(request):
 @api_view(['GET', 'PUT', 'DELETE'])
 def clockin_detail(request, pk):
     try:
-        record = ClockInRecord.objects.get(pk=pk)
+        record = _visible_clock_ins(request).get(pk=pk)
     except ClockInRecord.DoesNotExist:
         return Response(status=status.HTTP_404_NOT_FOUND)
     
@@ -543,8 +607,43 @@ class LeaveRequestReportView(APIView):
         
         return Response(data)
 
+def format_duration(hours):
+    """Format a decimal number of hours as 'H hrs M mins'."""
+    total_minutes = int(timedelta(hours=float(hours)).total_seconds() // 60)
+    hours, minutes = divmod(total_minutes, 60)
+    return f"{hours} hrs {minutes} mins"
+
+
+def work_hours_row(first_name, last_name, clocked_in, clocked_out, hours_worked, extra_hours):
+    return {
+        'user': f"{first_name} {last_name}",
+        'clocked_in': clocked_in.strftime('%d/%m/%Y %I:%M %p'),
+        'clocked_out': clocked_out.strftime('%d/%m/%Y %I:%M %p') if clocked_out else 'Still clocked in',
+        'hours_worked': format_duration(hours_worked),
+        'extra_hours': format_duration(extra_hours),
+    }
+
+
+def daily_attendance_row(first_name, last_name, day, first_in, last_out, worked_hours, break_hours, extra_hours, shift_count):
+    return {
+        'user': f"{first_name} {last_name}",
+        'date': day.strftime('%d/%m/%Y'),
+        'first_in': timezone.localtime(first_in).strftime('%I:%M %p'),
+        'last_out': timezone.localtime(last_out).strftime('%I:%M %p') if last_out else 'Still clocked in',
+        'hours_worked': format_duration(worked_hours),
+        'break_hours': format_duration(break_hours),
+        'extra_hours': format_duration(extra_hours),
+        'shifts': shift_count,
+    }
+
+
 class WorkHoursReportView(APIView):
     permission_classes = [IsAuthenticated]
+    # ?format=csv / ?format=ndjson stream the full range instead of building a list
+    renderer_classes = [*api_settings.DEFAULT_RENDERER_CLASSES, CSVRenderer, NDJSONRenderer]
+    row_fields = ('user__first_name', 'user__last_name', 'time_clocked_in', 'time_clocked_out', 'hours_worked', 'extra_hours')
+    daily_row_fields = ('user__first_name', 'user__last_name', 'date', 'first_in', 'last_out',
+                        'worked_hours', 'break_hours', 'extra_hours', 'shift_count')
 
     def get(self, request):
         # Retrieve query parameters
@@ -552,135 +651,199 @@ class WorkHoursReportView(APIView):
         start_date = request.query_params.get('start_date')
         end_date = request.query_params.get('end_date')
 
+        if request.query_params.get('group') == 'day':
+            return self.get_daily(request, user_id, start_date, end_date)
+
         # Filter records based on user and date range if provided
         clock_in_records = ClockInRecord.objects.all()
-        
+
         if user_id:
             clock_in_records = clock_in_records.filter(user_id=user_id)
-        
-        if start_date:
-            start_date = datetime.strptime(start_date, '%Y-%m-%d')
-            clock_in_records = clock_in_records.filter(time_clocked_in__date__gte=start_date)
-        
-        if end_date:
-            end_date = datetime.strptime(end_date, '%Y-%m-%d')
-            clock_in_records = clock_in_records.filter(time_clocked_out__date__lte=end_date)
 
-        # Helper function to format hours and minutes
-        def format_duration(duration):
-            total_minutes = int(duration.total_seconds() // 60)
-            hours, minutes = divmod(total_minutes, 60)
-            return f"{hours} hrs {minutes} mins"
+        try:
+            if start_date:
+                clock_in_records = clock_in_records.filter(time_clocked_in__gte=day_bounds(parse_date_param(start_date))[0])
+            if end_date:
+                clock_in_records = clock_in_records.filter(time_clocked_out__lt=day_bounds(parse_date_param(end_date))[1])
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        export_format = request.accepted_renderer.format
+        if export_format in ('csv', 'ndjson'):
+            rows = (work_hours_row(*values) for values in iterate_in_chunks(clock_in_records, self.row_fields))
+            if export_format == 'csv':
+                return stream_csv(rows, ['user', 'clocked_in', 'clocked_out', 'hours_worked', 'extra_hours'], 'work-hours.csv')
+            return stream_ndjson(rows, 'work-hours.ndjson')
 
         # Prepare the response data with formatted dates and times
-        data = [
-            {
-                'user': f"{record.user.first_name} {record.user.last_name}",
-                'clocked_in': record.time_clocked_in.strftime('%d/%m/%Y %I:%M %p'),
-                'clocked_out': (
-                    record.time_clocked_out.strftime('%d/%m/%Y %I:%M %p')
-                    if record.time_clocked_out else 'Still clocked in'
-                ),
-                'hours_worked': format_duration(timedelta(hours=float(record.hours_worked))),
-                'extra_hours': format_duration(timedelta(hours=float(record.extra_hours)))
-            }
-            for record in clock_in_records
-        ]
+        data = [work_hours_row(*values) for values in clock_in_records.values_list(*self.row_fields)]
+        return Response(data)
+
+    def get_daily(self, request, user_id, start_date, end_date):
+        """One row per user and day, read from the DailyAttendance rollup."""
+        attendance = DailyAttendance.objects.all()
+
+        if user_id:
+            attendance = attendance.filter(user_id=user_id)
 
+        try:
+            if start_date:
+                attendance = attendance.filter(date__gte=parse_date_param(start_date))
+            if end_date:
+                attendance = attendance.filter(date__lte=parse_date_param(end_date))
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        export_format = request.accepted_renderer.format
+        if export_format in ('csv', 'ndjson'):
+            rows = (daily_attendance_row(*values) for values in iterate_in_chunks(attendance, self.daily_row_fields))
+            if export_format == 'csv':
+                return stream_csv(rows, ['user', 'date', 'first_in', 'last_out', 'hours_worked', 'break_hours',
+                                         'extra_hours', 'shifts'], 'daily-attendance.csv')
+            return stream_ndjson(rows, 'daily-attendance.ndjson')
+
+        attendance = attendance.order_by('date', 'user__first_name', 'user__last_name')
+        data = [daily_attendance_row(*values) for values in attendance.values_list(*self.daily_row_fields)]
         return Response(data)
 
 
+def project_task_row(task):
+    user = task.assigned_to.user if task.assigned_to else None
+    return {
+        'task_name': task.name,
+        'status': task.status,
+        'assigned_to': f"{user.first_name} {user.last_name}" if user else "Unassigned",
+        'due_date': task.due_date.strftime('%d/%m/%Y') if task.due_date else 'No due date',
+    }
+
+
 class ProjectTaskReportView(APIView):
     permission_classes = [IsAuthenticated]
+    # Pages over projects (?limit=&offset=); without ?limit= every project is returned
+    pagination_class = ProjectPagination
 
     def get(self, request):
         # Retrieve query parameters for filtering
         project_name = request.query_params.get('project_name')
-        status = request.query_params.get('status')
+        task_status = request.query_params.get('status')
         assigned_to = request.query_params.get('assigned_to')
         due_date = request.query_params.get('due_date')
 
-        # Filter tasks based on provided parameters
-        tasks = Task.objects.all()
+        tasks = Task.objects.filter(project__isnull=False)
 
         if project_name:
             tasks = tasks.filter(project__name__icontains=project_name)
-        
-        if status:
-            tasks = tasks.filter(status__icontains=status)
-        
+        if task_status:
+            tasks = tasks.filter(status=task_status)
         if assigned_to:
-            tasks = tasks.filter(assigned_to__username__icontains=assigned_to)
-        
+            tasks = tasks.filter(assigned_to__user__username__icontains=assigned_to)
         if due_date:
             try:
-                due_date = parse_date(due_date)
-                tasks = tasks.filter(due_date=due_date)
-            except ValueError:
-                pass  # Ignore invalid date formats
+                due_start, due_end = day_bounds(parse_date_param(due_date))
+            except ValueError as e:
+                return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+            tasks = tasks.filter(due_date__gte=due_start, due_date__lt=due_end)
 
-        # Group tasks by project for a structured response
-        project_data = {}
-        for task in tasks:
-            project_name = task.project.name
-            if project_name not in project_data:
-                project_data[project_name] = {
-                    'project': project_name,
-                    'tasks': []
-                }
-            project_data[project_name]['tasks'].append({
-                'task_name': task.name,
-                'status': task.status,
-                'assigned_to': f"{task.assigned_to.first_name} {task.assigned_to.last_name}" if task.assigned_to else "Unassigned",
-                'due_date': task.due_date.strftime('%d/%m/%Y') if task.due_date else 'No due date'
-            })
-
-        # Convert project data to a list for JSON response compatibility
-        data = list(project_data.values())
-        
-        return Response(data)
+        paginator = self.pagination_class()
+        projects = Project.objects.filter(id__in=tasks.values('project_id')).order_by('name', 'id')
+        page = paginator.paginate_queryset(projects, request, view=self)
+        if page is not None:
+            tasks = tasks.filter(project_id__in=[project.id for project in page])
 
-class ProjectTaskReportView(APIView):
-    permission_classes = [IsAuthenticated]
+        tasks = tasks.select_related('project', 'assigned_to__user').order_by('project__name', 'project_id', 'id')
 
-    def get(self, request):
-        projects = Project.objects.all()
+        # Tasks arrive ordered by project, so one pass groups them
         data = []
+        for task in tasks:
+            if not data or data[-1]['project_id'] != task.project_id:
+                data.append({'project_id': task.project_id, 'project': task.project.name, 'tasks': []})
+            data[-1]['tasks'].append(project_task_row(task))
 
-        for project in projects:
-            tasks = Task.objects.filter(assigned_to__project=project)
-            task_data = [
-                {
-                    'task_name': task.name,
-                    'status': task.status,
-                    'assigned_to': task.assigned_to.username,
-                    'due_date': task.due_date
-                }
-                for task in tasks
-            ]
-            data.append({
-                'project': project.name,
-                'tasks': task_data
-            })
-        
+        if page is not None:
+            return paginator.get_paginated_response(data)
         return Response(data)
 
+
+EMPLOYEE_NAME = Concat('employee__user__first_name', Value(' '), 'employee__user__last_name')
+
+# ?group_by= choices: (model fields, computed columns) each summary row is grouped on
+BILLABLE_GROUPINGS = {
+    'employee': (('employee_id',), {'employee_name': EMPLOYEE_NAME}),
+    'task': (('task_id',), {'task_name': F('task__name')}),
+    'project': ((), {'project_id': F('task__project_id'), 'project_name': F('task__project__name')}),
+    'day': ((), {'day': TruncDate('start_time')}),
+}
+
+
 class BillableHoursReportView(APIView):
     permission_classes = [IsAuthenticated]
+    pagination_class = BillableHoursPagination
 
     def get(self, request):
+        group_by = request.query_params.get('group_by', 'employee')
+        if group_by not in BILLABLE_GROUPINGS:
+            return Response({'error': f"group_by must be one of {', '.join(BILLABLE_GROUPINGS)}."},
+                            status=status.HTTP_400_BAD_REQUEST)
+
         time_entries = TimeEntry.objects.filter(is_billable=True)
-        data = [
-            {
-                'employee': entry.employee.first_name + " " + entry.employee.last_name,
-                'task': entry.task.name,
-                'start_time': entry.start_time,
-                'end_time': entry.end_time,
-                'billable_hours': (entry.end_time - entry.start_time).total_seconds() / 3600 if entry.end_time else 0
-            }
-            for entry in time_entries
-        ]
-        return Response(data)
+
+        project_id = request.query_params.get('project')
+        if project_id:
+            time_entries = time_entries.filter(task__project_id=project_id)
+
+        try:
+            start_date = request.query_params.get('start_date')
+            end_date = request.query_params.get('end_date')
+            if start_date:
+                time_entries = time_entries.filter(start_time__gte=day_bounds(parse_date_param(start_date))[0])
+            if end_date:
+                time_entries = time_entries.filter(start_time__lt=day_bounds(parse_date_param(end_date))[1])
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        # Open entries have no end_time, so their duration is NULL and Sum skips them
+        hours = HoursBetween('start_time', 'end_time')
+        totals = time_entries.aggregate(entries=Count('id'), billable_hours=Sum(hours))
+        group_fields, group_columns = BILLABLE_GROUPINGS[group_by]
+        groups = (
+            time_entries.values(*group_fields, **group_columns)
+            .annotate(entries=Count('id'), billable_hours=Sum(hours))
+            .order_by(*group_fields, *group_columns)
+        )
+
+        detail = time_entries.values(
+            'id', 'start_time', 'end_time',
+            employee_name=EMPLOYEE_NAME, task_name=F('task__name'), project_name=F('task__project__name'),
+            billable_hours=hours,
+        )
+        paginator = self.pagination_class()
+        page = paginator.paginate_queryset(detail, request, view=self)
+
+        return Response({
+            'group_by': group_by,
+            'totals': {
+                'entries': totals['entries'],
+                'billable_hours': round(totals['billable_hours'] or 0, 2),
+            },
+            'groups': [
+                {**row, 'billable_hours': round(row['billable_hours'] or 0, 2)}
+                for row in groups
+            ],
+            'next': paginator.get_next_link(),
+            'previous': paginator.get_previous_link(),
+            'results': [
+                {
+                    'id': entry['id'],
+                    'employee': entry['employee_name'],
+                    'task': entry['task_name'],
+                    'project': entry['project_name'],
+                    'start_time': entry['start_time'],
+                    'end_time': entry['end_time'],
+                    'billable_hours': round(entry['billable_hours'] or 0, 2),
+                }
+                for entry in page
+            ],
+        })
 
 
 class PerformanceMetricsReportView(APIView):
@@ -708,17 +871,18 @@ def aggregated_reports(request):
         if not employee:
             return Response({"error": "Employee record not found for the current user."}, status=status.HTTP_404_NOT_FOUND)
 
-        # Calculate various statistics
-        task_completed_count = Task.objects.filter(status='completed').count()
-        task_pending_count = Task.objects.filter(status='pending').count()
-        total_tasks_count = Task.objects.count()
+        # Calculate various statistics from the shared, cached counters
+        stats = get_statistics()
+        task_completed_count = stats['tasks']['completed']
+        task_pending_count = stats['tasks']['pending']
+        total_tasks_count = stats['tasks']['total']
 
-        leave_approved_count = LeaveRequest.objects.filter(status='approved').count()
-        leave_pending_count = LeaveRequest.objects.filter(status='pending').count()
-        leave_rejected_count = LeaveRequest.objects.filter(status='rejected').count()
-        total_leave_requests = LeaveRequest.objects.count()
+        leave_approved_count = stats['leave_requests']['approved']
+        leave_pending_count = stats['leave_requests']['pending']
+        leave_rejected_count = stats['leave_requests']['rejected']
+        total_leave_requests = stats['leave_requests']['total']
 
-        average_hours_worked = ClockInRecord.objects.filter(hours_worked__gt=0).aggregate(Avg('hours_worked'))['hours_worked__avg'] or 0
+        average_hours_worked = stats['clockins']['average_hours_worked'] or 0
 
         # Calculate rates
         task_completion_rate = (task_completed_count / total_tasks_count * 100) if total_tasks_count else 0
@@ -759,8 +923,15 @@ class PerformanceDetailView(generics.RetrieveUpdateDestroyAPIView):
 
 # WorkHours API views
 class WorkHoursListCreateView(generics.ListCreateAPIView):
+    """Listing only reads; ?limit= pages by clock-in, ?start_date=/?end_date= bound it."""
     queryset = WorkHours.objects.all()
     serializer_class = WorkHoursSerializer
+    pagination_class = WorkHoursPagination
+    filter_fields = {
+        'user': ['exact'],
+    }
+    date_range_field = 'clock_in_time'
+    ordering = ('-clock_in_time', '-id')
 
 class WorkHoursDetailView(generics.RetrieveUpdateDestroyAPIView):
     queryset = WorkHours.objects.all()
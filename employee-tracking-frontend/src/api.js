@@ -1,7 +1,11 @@
 import axios from 'axios';
 
 // Base URL (adjust this to point to your backend)
-const API_URL = 'http://localhost:8000/api/'; // Replace with your actual backend URL
+export const SERVER_URL = 'http://localhost:8000/'; // Replace with your actual backend URL
+const API_URL = `${SERVER_URL}api/`;
+
+// How often screens re-fetch when live event streams are not available
+export const POLL_INTERVAL = 30000;
 
 // Function to check if there is an active clock-in
 export const checkActiveClockIn = async (authToken) => {
@@ -177,6 +181,42 @@ export const endBreakRecord = async (authToken, breakId) => {
     }
 };
 
+// Opens a server-sent event stream. EventSource cannot send headers, so it
+// connects with a short-lived ticket for this one stream rather than the
+// access token. Resolves to null when the server does not serve streams
+// (only ASGI deployments do); callers then keep polling.
+export const openEventStream = async (authToken, stream, path, params = {}) => {
+    let ticket;
+    try {
+        const response = await axios.post(
+            `${API_URL}event-streams/ticket/`,
+            { stream },
+            {
+                headers: {
+                    'Authorization': `Bearer ${authToken}`,
+                    'Content-Type': 'application/json',
+                }
+            }
+        );
+        ticket = response.data.ticket;
+    } catch (error) {
+        if (error.response && error.response.status === 501) {
+            return null;
+        }
+        throw error;
+    }
+    const query = new URLSearchParams({ ...params, ticket });
+    return new EventSource(`${SERVER_URL}${path}?${query}`);
+};
+
+// Live clock/break events for the logged-in user
+export const openClockEventStream = (authToken) =>
+    openEventStream(authToken, 'clock', 'api/clock-events/stream/');
+
+// Admin activity feed entries added after `since` (an X-Activity-Cursor value)
+export const openActivityStream = (authToken, since) =>
+    openEventStream(authToken, 'activity', 'admin-dashboard/api/activity/stream/', { since });
+
 export const getEmployeeProfile = async (authToken, userId) => {
     try {
         const response = await axios.get(
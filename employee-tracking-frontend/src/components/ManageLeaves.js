@@ -1,11 +1,14 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useCallback } from 'react';
 import axios from 'axios';
 import { useAuth } from '../AuthProvider';
 
+const LEAVES_URL = 'http://localhost:8000/admin-dashboard/api/leaves/';
+const PAGE_SIZE = 50;
+
 const ManageLeaves = () => {
   const { token } = useAuth();
-  const [leaveRequests, setLeaveRequests] = useState([]);
   const [filteredLeaves, setFilteredLeaves] = useState([]);
+  const [nextUrl, setNextUrl] = useState(null);
   const [error, setError] = useState(null);
   const [loading, setLoading] = useState(true);
   const [employeeName, setEmployeeName] = useState('');
@@ -13,40 +16,38 @@ const ManageLeaves = () => {
   const [endDate, setEndDate] = useState('');
   const [statusFilter, setStatusFilter] = useState('');
 
-  useEffect(() => {
-    const fetchLeaveRequests = async () => {
-      try {
-        const response = await axios.get('http://localhost:8000/admin-dashboard/api/leaves/', {
-          headers: { Authorization: `Bearer ${token}` },
-        });
-        setLeaveRequests(response.data);
-        setFilteredLeaves(response.data);
-      } catch (err) {
-        setError('Error fetching leave requests.');
-      } finally {
-        setLoading(false);
-      }
-    };
-    fetchLeaveRequests();
+  // Pages come from the server; `next` already carries the active filters
+  const fetchLeaveRequests = useCallback(async (url, params, append) => {
+    try {
+      const response = await axios.get(url, {
+        headers: { Authorization: `Bearer ${token}` },
+        params,
+      });
+      const page = response.data.results;
+      setFilteredLeaves((prevState) => (append ? [...prevState, ...page] : page));
+      setNextUrl(response.data.next);
+    } catch (err) {
+      setError('Error fetching leave requests.');
+    } finally {
+      setLoading(false);
+    }
   }, [token]);
 
+  useEffect(() => {
+    fetchLeaveRequests(LEAVES_URL, { limit: PAGE_SIZE }, false);
+  }, [fetchLeaveRequests]);
+
   const handleFilter = () => {
-    let filtered = leaveRequests;
-    if (employeeName) {
-      filtered = filtered.filter(leave => 
-        leave.employee_name.toLowerCase().includes(employeeName.toLowerCase())
-      );
-    }
-    if (startDate) {
-      filtered = filtered.filter(leave => new Date(leave.start_date) >= new Date(startDate));
-    }
-    if (endDate) {
-      filtered = filtered.filter(leave => new Date(leave.end_date) <= new Date(endDate));
-    }
-    if (statusFilter) {
-      filtered = filtered.filter(leave => leave.status === statusFilter);
-    }
-    setFilteredLeaves(filtered);
+    const params = { limit: PAGE_SIZE };
+    if (employeeName) params.employee_name = employeeName;
+    if (startDate) params.start_date = startDate;
+    if (endDate) params.end_date = endDate;
+    if (statusFilter) params.status = statusFilter;
+    fetchLeaveRequests(LEAVES_URL, params, false);
+  };
+
+  const handleLoadMore = () => {
+    fetchLeaveRequests(nextUrl, undefined, true);
   };
 
   const handleUpdateLeaveStatus = async (leaveId, status) => {
@@ -175,6 +176,11 @@ const ManageLeaves = () => {
           ))}
         </tbody>
       </table>
+      {nextUrl && (
+        <button onClick={handleLoadMore} style={{ marginTop: '16px', padding: '8px', backgroundColor: '#1d72b8', color: '#fff', borderRadius: '4px', cursor: 'pointer' }}>
+          Load more
+        </button>
+      )}
     </div>
   );
 };
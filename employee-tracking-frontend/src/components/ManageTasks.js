@@ -3,9 +3,12 @@ import axios from 'axios';
 import { useAuth } from '../AuthProvider';
 import TaskForm from './TaskForm';
 
+const TASKS_PAGE_SIZE = 50;
+
 const ManageTasks = () => {
   const { token } = useAuth();
   const [tasks, setTasks] = useState([]);
+  const [nextTasksUrl, setNextTasksUrl] = useState(null);
   const [employees, setEmployees] = useState([]);
   const [projects, setProjects] = useState([]);
   const [error, setError] = useState(null);
@@ -25,12 +28,17 @@ const ManageTasks = () => {
     const fetchData = async () => {
       try {
         const [tasksRes, employeesRes, projectsRes] = await Promise.all([
-          axios.get('http://localhost:8000/admin-dashboard/api/tasks/', { headers: { Authorization: `Bearer ${token}` } }),
+          // count=false: the list only needs a next link, so skip the COUNT(*)
+          axios.get('http://localhost:8000/admin-dashboard/api/tasks/', {
+            headers: { Authorization: `Bearer ${token}` },
+            params: { limit: TASKS_PAGE_SIZE, count: 'false' },
+          }),
           axios.get('http://localhost:8000/admin-dashboard/api/employees/', { headers: { Authorization: `Bearer ${token}` } }),
           axios.get('http://localhost:8000/admin-dashboard/api/projects/', { headers: { Authorization: `Bearer ${token}` } }),
         ]);
 
-        setTasks(tasksRes.data);
+        setTasks(tasksRes.data.results);
+        setNextTasksUrl(tasksRes.data.next);
         setEmployees(employeesRes.data);
         setProjects(projectsRes.data);
       } catch (err) {
@@ -42,6 +50,17 @@ const ManageTasks = () => {
     fetchData();
   }, [token]);
 
+  const loadMoreTasks = async () => {
+    try {
+      const response = await axios.get(nextTasksUrl, { headers: { Authorization: `Bearer ${token}` } });
+      setTasks((prevTasks) => [...prevTasks, ...response.data.results]);
+      setNextTasksUrl(response.data.next);
+    } catch (err) {
+      console.error('Error fetching tasks:', err);
+      notify('Error fetching tasks.');
+    }
+  };
+
   const openModal = (task = {}) => {
     setCurrentTask(task);
     setIsEditMode(!!task.id);
@@ -208,6 +227,14 @@ const ManageTasks = () => {
           })}
         </tbody>
       </table>
+      {nextTasksUrl && (
+        <button
+          style={{ marginTop: '16px', padding: '8px 16px', backgroundColor: '#007bff', color: '#fff', border: 'none', borderRadius: '4px', cursor: 'pointer' }}
+          onClick={loadMoreTasks}
+        >
+          Load more
+        </button>
+      )}
 
       {/* Modal for Task Form */}
       {isModalOpen && (
@@ -1,7 +1,7 @@
 import React, { useState, useEffect, useCallback } from 'react';
 import { toast, ToastContainer } from 'react-toastify';
 import 'react-toastify/dist/ReactToastify.css';
-import { clockInRecord, clockOutRecord, takeBreakRecord, checkActiveClockIn, endBreakRecord, checkActiveBreak } from '../api';
+import { clockInRecord, clockOutRecord, takeBreakRecord, checkActiveClockIn, endBreakRecord, checkActiveBreak, openClockEventStream, POLL_INTERVAL } from '../api';
 import { useAuth } from '../AuthProvider'; // Import the AuthProvider
 
 
@@ -154,6 +154,106 @@ const ClockInSeconds = () => {
     fetchActiveClockInAndBreak();  
 }, [token, userId]); // Rerun if token or userId changes
 
+  // Follow clock/break changes made elsewhere (another tab, device or kiosk)
+  useEffect(() => {
+    if (!token) return undefined;
+
+    const applyClockIn = (data) => {
+      const parsedTime = new Date(data.time_clocked_in);
+      setIsClockedIn(true);
+      setClockInTime(parsedTime);
+      setRecordId(data.record_id);
+      setWorkingSeconds(Math.floor((Date.now() - parsedTime.getTime()) / 1000));
+    };
+    const applyClockOut = () => {
+      setIsClockedIn(false);
+      setClockInTime(null);
+      setRecordId(null);
+      setBreakActive(false);
+      setBreakId(null);
+      setBreakDuration(0);
+    };
+    const applyBreakStart = (data) => {
+      setBreakActive(true);
+      setBreakId(data.break_id);
+      setBreakType(data.break_type || '');
+      setBreakDuration(Math.floor((Date.now() - new Date(data.time_started).getTime()) / 1000));
+    };
+    const applyBreakEnd = () => {
+      setBreakActive(false);
+      setBreakId(null);
+      setBreakDuration(0);
+      setBreakExceeded(false);
+    };
+    const handlers = {
+      // Sent on connect and after missed events: the full current state
+      state: (data) => {
+        if (data.clock_in) applyClockIn(data.clock_in); else applyClockOut();
+        if (data.break) applyBreakStart(data.break); else applyBreakEnd();
+      },
+      clock_in: applyClockIn,
+      clock_out: applyClockOut,
+      break_start: applyBreakStart,
+      break_end: applyBreakEnd,
+    };
+
+    // Without a stream, fetch the same state periodically
+    const poll = async () => {
+      try {
+        const clockIn = await checkActiveClockIn(token);
+        const activeBreak = clockIn.active ? await checkActiveBreak(token, clockIn.record_id) : { active: false };
+        handlers.state({
+          clock_in: clockIn.active ? { record_id: clockIn.record_id, time_clocked_in: clockIn.time_clocked_in } : null,
+          break: activeBreak.active
+            ? { break_id: activeBreak.break_id, break_type: activeBreak.breakType, time_started: activeBreak.break_start_time }
+            : null,
+        });
+      } catch (error) {
+        console.error('Error polling clock state:', error);
+      }
+    };
+
+    let closed = false;
+    let source = null;
+    let poller = null;
+    let retry = null;
+    const connect = async () => {
+      let opened = null;
+      try {
+        opened = await openClockEventStream(token);
+      } catch (error) {
+        console.error('Error opening clock event stream:', error);
+      }
+      if (closed) {
+        if (opened) opened.close();
+        return;
+      }
+      if (!opened) {
+        poller = setInterval(poll, POLL_INTERVAL);
+        return;
+      }
+      source = opened;
+      Object.entries(handlers).forEach(([type, handler]) => {
+        source.addEventListener(type, (event) => handler(JSON.parse(event.data)));
+      });
+      source.onerror = () => {
+        // The browser reconnects with the same ticket; once that has expired, start over with a new one
+        if (source.readyState === EventSource.CLOSED) {
+          source = null;
+          retry = setTimeout(connect, 5000);
+        }
+      };
+    };
+    connect();
+
+    return () => {
+      closed = true;
+      if (source) source.close();
+      clearInterval(poller);
+      clearTimeout(retry);
+    };
+  }, [token]);
+
 
   
 
@@ -9,6 +9,7 @@ import {
 } from 'react-icons/fa';
 import { Bar, Pie } from 'react-chartjs-2';
 import axios from 'axios';
+import { SERVER_URL, POLL_INTERVAL, openActivityStream } from '../api';
 import {
   Chart as ChartJS,
   CategoryScale,
@@ -35,7 +36,7 @@ ChartJS.register(
 );
 
 const api = axios.create({
-  baseURL: 'http://localhost:8000',
+  baseURL: SERVER_URL,
   withCredentials: true,
   headers: {
     'Content-Type': 'application/json',
@@ -47,6 +48,7 @@ const AdminHomePage = () => {
   const [stats, setStats] = useState(null);
   const [charts, setCharts] = useState(null);
   const [activities, setActivities] = useState([]);
+  const [activityCursor, setActivityCursor] = useState(null);
   const [notifications, setNotifications] = useState([]);
   const [activeTab, setActiveTab] = useState('dashboard');
   const [searchQuery, setSearchQuery] = useState('');
@@ -71,9 +73,9 @@ const AdminHomePage = () => {
         setStats(statsRes.data);
         setCharts(chartsRes.data);
         setActivities(activitiesRes.data);
-        setNotifications(notificationsRes.data.map(n => ({
+        setActivityCursor(activitiesRes.headers['x-activity-cursor'] || null);
+        setNotifications(notificationsRes.data.results.map(n => ({
           ...n,
-          read: n.status !== 'pending',
           time: new Date(n.timestamp).toLocaleTimeString([], { hour: '2-digit', minute: '2-digit' })
         })));
         
@@ -90,15 +92,86 @@ const AdminHomePage = () => {
     }
   }, [token]);
 
+  // Push new activity instead of re-fetching the whole feed; poll ?since= when streams are not served
+  useEffect(() => {
+    if (!token || !activityCursor) return undefined;
+
+    let cursor = activityCursor;
+    const addActivity = (activity) => {
+      setActivities((current) => [activity, ...current.filter((item) => item.id !== activity.id)].slice(0, 10));
+    };
+    const poll = async () => {
+      try {
+        const res = await api.get('/admin-dashboard/api/activity/', {
+          headers: { Authorization: `Bearer ${token}` },
+          params: { since: cursor },
+        });
+        // Oldest first, so the newest ends up on top
+        res.data.forEach(addActivity);
+        cursor = res.headers['x-activity-cursor'] || cursor;
+      } catch (err) {
+        console.error('Error polling activity:', err);
+      }
+    };
+
+    let closed = false;
+    let source = null;
+    let poller = null;
+    let retry = null;
+    const connect = async () => {
+      let opened = null;
+      try {
+        opened = await openActivityStream(token, cursor);
+      } catch (err) {
+        console.error('Error opening activity stream:', err);
+      }
+      if (closed) {
+        if (opened) opened.close();
+        return;
+      }
+      if (!opened) {
+        poller = setInterval(poll, POLL_INTERVAL);
+        return;
+      }
+      source = opened;
+      source.addEventListener('activity', (event) => {
+        cursor = event.lastEventId || cursor;
+        addActivity(JSON.parse(event.data));
+      });
+      source.onerror = () => {
+        // Reconnects reuse the ticket; once it has expired, resume from the cursor with a new one
+        if (source.readyState === EventSource.CLOSED) {
+          source = null;
+          retry = setTimeout(connect, 5000);
+        }
+      };
+    };
+    connect();
+
+    return () => {
+      closed = true;
+      if (source) source.close();
+      clearInterval(poller);
+      clearTimeout(retry);
+    };
+  }, [token, activityCursor]);
+
   const handleLogout = () => {
     logout();
     navigate('/');
   };
 
-  const markNotificationAsRead = (id) => {
+  const markNotificationAsRead = async (id) => {
     setNotifications(notifications.map(notif => 
       notif.id === id ? {...notif, read: true} : notif
     ));
+    try {
+      await api.post('/admin-dashboard/api/notifications/read/', { ids: [id] }, {
+        headers: { Authorization: `Bearer ${token}` },
+      });
+    } catch (err) {
+      console.error('Error marking notification as read:', err);
+    }
   };
 
   const handleQuickAction = (action) => {
@@ -511,7 +584,7 @@ const AdminHomePage = () => {
                 {activities.slice(0, 10).map(activity => {
                   const formattedActivity = formatActivityItem(activity);
                   return (
-                    <div key={activity.timestamp} className="activity-item">
+                    <div key={activity.id} className="activity-item">
                       <div className="activity-avatar">
                         <FaIdCard />
                       </div>
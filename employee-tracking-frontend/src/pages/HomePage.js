@@ -30,44 +30,23 @@ const HomePage = () => {
       // Fetch all dashboard data
       const fetchDashboardData = async () => {
         try {
-          // Fetch clock-in status
-          const clockInResponse = await axios.get('http://localhost:8000/api/clockin-status/', {
+          // One round trip for clock-in status, hours, tasks, leave balance and profile
+          const snapshotResponse = await axios.get('http://localhost:8000/api/home-snapshot/', {
             headers: { Authorization: `Bearer ${token}` }
           });
-          setClockInStatus({
-            clockedIn: clockInResponse.data.clockedIn,
-            time: clockInResponse.data.time_clocked_in
-          });
-
-          // Fetch hours worked
-          const hoursResponse = await axios.get('http://localhost:8000/api/timesheet/today/', {
-            headers: { Authorization: `Bearer ${token}` }
-          });
-          setHoursWorked(hoursResponse.data.hoursWorked);
+          const snapshot = snapshotResponse.data;
 
-          // Fetch tasks
-          const tasksResponse = await axios.get('http://localhost:8000/api/tasks/today', { 
-            headers: { Authorization: `Bearer ${token}` } 
-          });
-          setTasks(tasksResponse.data);
-
-          // Fetch leave balance
-          const leaveResponse = await axios.get('http://localhost:8000/api/leave-balance/', {
-            headers: { Authorization: `Bearer ${token}` }
+          setClockInStatus({
+            clockedIn: snapshot.clock_in.clockedIn,
+            time: snapshot.clock_in.time_clocked_in
           });
-          setLeaveBalance(leaveResponse.data);
+          setHoursWorked(snapshot.hours_worked);
+          setTasks(snapshot.tasks);
+          setLeaveBalance(snapshot.leave_balance);
 
-          // Fetch department and role
-          if (user && user.id) {
-            const employeeResponse = await axios.get(`http://localhost:8000/api/employees/?user=${user.id}`, {
-              headers: { Authorization: `Bearer ${token}` }
-            });
-            
-            if (employeeResponse.data.length > 0) {
-              const employeeData = employeeResponse.data[0];
-              setUserDepartment(employeeData.department);
-              setUserRole(employeeData.role);
-            }
+          if (snapshot.employee) {
+            setUserDepartment(snapshot.employee.department);
+            setUserRole(snapshot.employee.role);
           }
 
           // Fetch notifications (if endpoint exists)
@@ -95,7 +74,7 @@ const HomePage = () => {
 
       fetchDashboardData();
     }
-  }, [token, user]);
+  }, [token]);
 
   const handleLogout = () => {
     logout();
@@ -3,11 +3,13 @@ import axios from 'axios';
 
 const BillableHoursReport = () => {
     const [billableHours, setBillableHours] = useState([]);
+    const [totals, setTotals] = useState(null);
 
     useEffect(() => {
         axios.get('/api/reports/billable-hours/')
             .then(response => {
-                setBillableHours(response.data);
+                setBillableHours(response.data.results);
+                setTotals(response.data.totals);
             })
             .catch(error => {
                 console.error('Error fetching billable hours:', error);
@@ -22,20 +24,28 @@ const BillableHoursReport = () => {
                     <tr>
                         <th>Employee</th>
                         <th>Task</th>
-                        <th>Hours</th>
+                        <th>Project</th>
                         <th>Billable Hours</th>
                     </tr>
                 </thead>
                 <tbody>
                     {billableHours.map(entry => (
-                        <tr key={entry.employee}>
+                        <tr key={entry.id}>
                             <td>{entry.employee}</td>
                             <td>{entry.task}</td>
-                            <td>{entry.hours}</td>
+                            <td>{entry.project}</td>
                             <td>{entry.billable_hours}</td>
                         </tr>
                     ))}
                 </tbody>
+                {totals && (
+                    <tfoot>
+                        <tr>
+                            <td colSpan="3">Total ({totals.entries} entries)</td>
+                            <td>{totals.billable_hours}</td>
+                        </tr>
+                    </tfoot>
+                )}
             </table>
         </div>
     );
@@ -0,0 +1,193 @@
+import logging
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .events import get_broker
+from .models import ActivityLog, BreakRecord, ClockInRecord, Employee, LeaveRequest, Task
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ACTIVITY_FEED = {
+    'LATEST': 10,          # Entries returned when no cursor is given
+    'MAX_PAGE_SIZE': 100,  # Upper bound for ?limit=
+}
+
+# Broker channel poked after new entries commit; streams then read past their cursor
+ACTIVITY_CHANNEL = 'activity'
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
+# Cursor before every entry
+START_CURSOR = '0-0'
+
+
+def get_activity_feed_settings():
+    config = dict(DEFAULT_ACTIVITY_FEED)
+    config.update(getattr(settings, 'ACTIVITY_FEED', {}))
+    return config
+
+
+def encode_cursor(entry):
+    micros = (entry.created_at - _EPOCH) // timedelta(microseconds=1)
+    return f'{micros}-{entry.id}'
+
+
+def decode_cursor(cursor):
+    """Return (created_at, id) for a cursor string or raise ValueError."""
+    micros, _, entry_id = cursor.partition('-')
+    return _EPOCH + timedelta(microseconds=int(micros)), int(entry_id)
+
+
+def entries_after(cursor):
+    """Entries strictly after ``cursor``, oldest first, served by activitylog_cursor_idx."""
+    created_at, entry_id = decode_cursor(cursor)
+    return ActivityLog.objects.select_related('user').filter(
+        Q(created_at__gt=created_at) | Q(created_at=created_at, id__gt=entry_id)
+    ).order_by('created_at', 'id')
+
+
+def latest_entries():
+    return ActivityLog.objects.select_related('user').order_by('-created_at', '-id')
+
+
+def activity_row(entry):
+    return {
+        'id': entry.id,
+        'cursor': encode_cursor(entry),
+        'type': entry.kind,
+        'user': entry.user.username if entry.user else 'System',
+        'action': entry.action,
+        'timestamp': entry.created_at,
+        'details': entry.details,
+    }
+
+
+def _poke_streams():
+    try:
+        get_broker().publish(ACTIVITY_CHANNEL, {'type': 'activity'})
+    except Exception:
+        # Streams still catch up on their next poke or reconnect
+        logger.exception("Could not notify activity streams")
+
+
+def log_activities(entries):
+    """Insert ActivityLog entries once the surrounding transaction commits.
+
+    The entries are stamped and inserted after commit, so (created_at, id)
+    follows commit order and a reader advancing its cursor does not skip
+    rows from slower transactions.
+    """
+    entries = list(entries)
+    if not entries:
+        return
+
+    def insert():
+        # Not when the entries were built: that is before a commit that may come much later
+        created_at = timezone.now()
+        for entry in entries:
+            entry.created_at = created_at
+        ActivityLog.objects.bulk_create(entries)
+        _poke_streams()
+
+    transaction.on_commit(insert, robust=True)
+
+
+def log_activity(kind, action, user_id=None, details='', object_id=None):
+    log_activities([ActivityLog(kind=kind, action=action, user_id=user_id, details=details[:255], object_id=object_id)])
+
+
+def attendance_entry(event_type, record, user_id):
+    """The entry for one clock_in, clock_out, break_start or break_end on ``record``."""
+    if event_type == 'clock_in':
+        return ActivityLog(kind='attendance', action='clocked in', user_id=user_id, object_id=record.pk)
+    if event_type == 'clock_out':
+        return ActivityLog(
+            kind='attendance', action='clocked out', user_id=user_id,
+            details=f'{record.hours_worked:.2f} hours worked', object_id=record.pk,
+        )
+    if event_type == 'break_start':
+        return ActivityLog(
+            kind='attendance', action=f'started {record.break_type} break', user_id=user_id, object_id=record.pk,
+        )
+    return ActivityLog(
+        kind='attendance', action=f'ended {record.break_type} break', user_id=user_id,
+        details=f'{record.duration():.2f} hours', object_id=record.pk,
+    )
+
+
+def _became_set(instance, name):
+    value = getattr(instance, name)
+    return value is not None and instance.loaded_value(name, value) is None
+
+
+def _related_user_id(instance, descriptor, model):
+    """user_id of the row ``descriptor`` points at, without loading it when it is cached."""
+    related_id = getattr(instance, descriptor.field.attname)
+    if related_id is None:
+        return None
+    if descriptor.is_cached(instance):
+        return getattr(instance, descriptor.field.name).user_id
+    return model.objects.filter(pk=related_id).values_list('user_id', flat=True).first()
+
+
+def log_clock_in_record(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    events = ['clock_in'] if created else []
+    if _became_set(instance, 'time_clocked_out'):
+        events.append('clock_out')
+    log_activities(attendance_entry(event_type, instance, instance.user_id) for event_type in events)
+
+
+def log_break_record(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    events = ['break_start'] if created else []
+    if _became_set(instance, 'time_ended'):
+        events.append('break_end')
+    if events:
+        user_id = _related_user_id(instance, BreakRecord.clock_in_record, ClockInRecord)
+        log_activities(attendance_entry(event_type, instance, user_id) for event_type in events)
+
+
+def log_task(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    if created:
+        action = 'created task'
+    elif instance.loaded_value('status', instance.status) != instance.status:
+        action = f'updated task status to {instance.status}'
+    else:
+        return
+    log_activity(
+        'task', action, user_id=_related_user_id(instance, Task.assigned_to, Employee),
+        details=instance.name, object_id=instance.pk,
+    )
+
+
+def log_leave_request(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    if created:
+        action = f'submitted {instance.leave_type} leave request'
+    elif instance.loaded_value('status', instance.status) != instance.status:
+        action = f'{instance.leave_type} leave request {instance.status.lower()}'
+    else:
+        return
+    log_activity(
+        'leave', action, user_id=instance.user_id,
+        details=f'{instance.start_date} to {instance.end_date}', object_id=instance.pk,
+    )
+
+
+# model -> post_save handler; bulk paths call log_activities() themselves
+ACTIVITY_HANDLERS = {
+    ClockInRecord: log_clock_in_record,
+    BreakRecord: log_break_record,
+    Task: log_task,
+    LeaveRequest: log_leave_request,
+}
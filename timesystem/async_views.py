@@ -0,0 +1,317 @@
+"""Async versions of the attendance status endpoints polled on every home page load.
+
+Under an ASGI server these run on the event loop instead of holding a
+worker thread per request. Payloads match the DRF views they replaced.
+The server-sent event streams are only served under ASGI.
+"""
+import asyncio
+import json
+from functools import wraps
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.core.handlers.asgi import ASGIRequest
+from django.http import JsonResponse, StreamingHttpResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_GET, require_POST
+
+from .activity import (
+    ACTIVITY_CHANNEL, START_CURSOR, activity_row, decode_cursor, encode_cursor, entries_after,
+    get_activity_feed_settings, latest_entries,
+)
+from .authentication import async_jwt_required, issue_stream_ticket, stream_ticket_required
+from .events import RESYNC, get_broker, get_event_stream_settings, user_channel
+from .leave_ledger import default_balances
+from .models import BreakRecord, ClockInRecord, Employee, LeaveBalance, Task
+from .serializers import EmployeeSerializer, LeaveBalanceSerializer, TaskSerializer
+from .task_feed import due_today_or_open
+from .utils import today_bounds
+
+
+def _hours(value):
+    # Match DRF's JSON encoder, which renders Decimal as a number
+    return float(value)
+
+
+@require_GET
+@async_jwt_required
+async def clock_in_status(request):
+    today_start, today_end = today_bounds()
+
+    # Query for a clock-in record with no clock-out for today
+    clock_in_record = await ClockInRecord.objects.filter(
+        user=request.user,
+        time_clocked_out__isnull=True,
+        time_clocked_in__gte=today_start,
+        time_clocked_in__lt=today_end,
+    ).afirst()
+
+    if clock_in_record:
+        return JsonResponse({'clockedIn': True, 'time_clocked_in': clock_in_record.time_clocked_in})
+    return JsonResponse({'clockedIn': False})
+
+
+@require_GET
+@async_jwt_required
+async def today_hours_worked(request):
+    hours_worked = await ClockInRecord.aget_today_hours(request.user)
+    return JsonResponse({"hoursWorked": _hours(hours_worked)})
+
+
+@require_GET
+@async_jwt_required
+async def check_active_clock_in(request):
+    active_clock_in = await ClockInRecord.objects.filter(
+        user=request.user, time_clocked_out__isnull=True
+    ).afirst()
+
+    if active_clock_in:
+        return JsonResponse({
+            'active': True,
+            'time_clocked_in': active_clock_in.time_clocked_in,
+            'record_id': active_clock_in.id,
+            'user_id': active_clock_in.user_id,
+        })
+    return JsonResponse({'active': False, 'record_id': None})
+
+
+@require_GET
+@async_jwt_required
+async def check_active_break(request):
+    record_id = request.GET.get('record_id')
+    if not record_id:
+        return JsonResponse({'error': 'Record ID is required.'}, status=400)
+    if not record_id.isdigit():
+        return JsonResponse({'error': 'Record ID must be an integer.'}, status=400)
+
+    active_break = await BreakRecord.objects.filter(
+        clock_in_record__id=record_id,
+        clock_in_record__user=request.user,
+        time_ended__isnull=True,
+    ).afirst()
+
+    if active_break is None:
+        return JsonResponse({'active': False})
+    return JsonResponse({
+        'active': True,
+        'break_id': active_break.id,
+        'break_start_time': active_break.time_started,
+        'clock_in_record__id': active_break.clock_in_record_id,
+        'breakType': active_break.break_type,
+        'record_id': active_break.clock_in_record_id,
+    })
+
+
+async def _snapshot_clock_in(user):
+    today_start, today_end = today_bounds()
+    record = await ClockInRecord.objects.filter(
+        user=user,
+        time_clocked_out__isnull=True,
+        time_clocked_in__gte=today_start,
+        time_clocked_in__lt=today_end,
+    ).afirst()
+    if record is None:
+        return {'clockedIn': False, 'time_clocked_in': None, 'record_id': None}
+    return {'clockedIn': True, 'time_clocked_in': record.time_clocked_in, 'record_id': record.id}
+
+
+async def _snapshot_hours_worked(user):
+    return _hours(await ClockInRecord.aget_today_hours(user))
+
+
+async def _snapshot_tasks(user):
+    tasks = Task.objects.filter(assigned_to__user=user).filter(due_today_or_open()).order_by('due_date', 'id')
+    return TaskSerializer([task async for task in tasks], many=True).data
+
+
+async def _snapshot_leave_balance(user):
+    leave_balance = await LeaveBalance.objects.filter(user=user).afirst()
+    if leave_balance is None:
+        leave_balance = LeaveBalance(user=user, **default_balances())
+    return LeaveBalanceSerializer(leave_balance).data
+
+
+async def _snapshot_employee(user):
+    employee = await Employee.objects.select_related('user', 'department', 'role').filter(user=user).afirst()
+    return EmployeeSerializer(employee).data if employee else None
+
+
+# ?fields= names -> section loaders; every section is returned when fields is omitted
+SNAPSHOT_SECTIONS = {
+    'clock_in': _snapshot_clock_in,
+    'hours_worked': _snapshot_hours_worked,
+    'tasks': _snapshot_tasks,
+    'leave_balance': _snapshot_leave_balance,
+    'employee': _snapshot_employee,
+}
+
+
+@require_GET
+@async_jwt_required
+async def home_snapshot(request):
+    """Everything the home page needs in one authenticated round trip.
+
+    Sections are independent and gathered concurrently; how much of that
+    overlaps in the database depends on the backend and Django's async ORM.
+    """
+    fields = request.GET.get('fields')
+    names = [name.strip() for name in fields.split(',') if name.strip()] if fields else list(SNAPSHOT_SECTIONS)
+    unknown = [name for name in names if name not in SNAPSHOT_SECTIONS]
+    if unknown:
+        return JsonResponse(
+            {'error': f"Unknown fields: {', '.join(unknown)}. Choose from {', '.join(SNAPSHOT_SECTIONS)}."},
+            status=400,
+        )
+
+    results = await asyncio.gather(*(SNAPSHOT_SECTIONS[name](request.user) for name in names))
+    return JsonResponse(dict(zip(names, results)))
+
+
+async def _clock_state(user):
+    """The open shift and open break, sent on connect and whenever events were dropped."""
+    shift = await ClockInRecord.objects.filter(user=user, time_clocked_out__isnull=True).afirst()
+    open_break = None
+    if shift is not None:
+        open_break = await BreakRecord.objects.filter(clock_in_record=shift, time_ended__isnull=True).afirst()
+    return {
+        'clock_in': {'record_id': shift.id, 'time_clocked_in': shift.time_clocked_in} if shift else None,
+        'break': {
+            'break_id': open_break.id,
+            'break_type': open_break.break_type,
+            'time_started': open_break.time_started,
+        } if open_break else None,
+    }
+
+
+# Stream name -> whether only staff may open it
+EVENT_STREAMS = {
+    'clock': False,
+    'activity': True,
+}
+
+
+def asgi_only(view):
+    """Answer 501 unless the request is served by an ASGI server.
+
+    Under WSGI Django drains an async streaming response into a list before
+    sending anything, so an endless event stream would never send a byte and
+    would hold a worker thread for good. Clients poll instead.
+    """
+
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        if not isinstance(request, ASGIRequest):
+            return JsonResponse({'error': 'Event streams are not available on this server; poll instead.'}, status=501)
+        return await view(request, *args, **kwargs)
+
+    return wrapper
+
+
+@csrf_exempt
+@require_POST
+@asgi_only
+@async_jwt_required
+async def stream_ticket(request):
+    """Issue a short-lived ticket for opening one event stream with EventSource.
+
+    Body: ``{"stream": "clock" | "activity"}``. A 501 tells the client that
+    streams are not served here, before it opens one.
+    """
+    try:
+        stream = json.loads(request.body or b'{}').get('stream')
+    except (ValueError, AttributeError):
+        stream = None
+    if stream not in EVENT_STREAMS:
+        return JsonResponse({'error': f"stream must be one of {', '.join(EVENT_STREAMS)}."}, status=400)
+    if EVENT_STREAMS[stream] and not request.user.is_staff:
+        return JsonResponse({"error": "Unauthorized"}, status=403)
+    return JsonResponse({'ticket': issue_stream_ticket(request.user, stream)})
+
+
+def _sse(event_type, data, event_id=None):
+    message = f"event: {event_type}\ndata: {json.dumps(data, cls=DjangoJSONEncoder)}\n\n"
+    return f"id: {event_id}\n{message}" if event_id else message
+
+
+async def _clock_events(user, heartbeat):
+    # Subscribe before reading the state so nothing committed in between is missed
+    async with get_broker().subscribe(user_channel(user.id)) as subscription:
+        yield 'retry: 5000\n\n'
+        yield _sse('state', await _clock_state(user))
+        while True:
+            try:
+                event = await asyncio.wait_for(subscription.get(), timeout=heartbeat)
+            except asyncio.TimeoutError:
+                # Comment line; keeps proxies from closing an idle connection
+                yield ': heartbeat\n\n'
+                continue
+            if event is RESYNC:
+                yield _sse('state', await _clock_state(user))
+            else:
+                yield _sse(event['type'], event)
+
+
+@require_GET
+@asgi_only
+@stream_ticket_required('clock')
+async def clock_event_stream(request):
+    """Server-sent clock_in, clock_out, break_start and break_end events for the caller.
+
+    Each open stream is a coroutine, not a thread. Opened with ?ticket= from
+    stream_ticket(), as EventSource cannot set headers.
+    """
+    heartbeat = get_event_stream_settings()['HEARTBEAT']
+    response = StreamingHttpResponse(_clock_events(request.user, heartbeat), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    # Stop nginx from buffering the stream
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
+async def _activity_events(cursor, heartbeat, page_size):
+    async with get_broker().subscribe(ACTIVITY_CHANNEL) as subscription:
+        yield 'retry: 5000\n\n'
+        while True:
+            # Pokes only say "something new"; the log past the cursor is the source of truth
+            entries = [entry async for entry in entries_after(cursor)[:page_size]]
+            for entry in entries:
+                cursor = encode_cursor(entry)
+                yield _sse('activity', activity_row(entry), event_id=cursor)
+            if len(entries) == page_size:
+                continue
+            try:
+                await asyncio.wait_for(subscription.get(), timeout=heartbeat)
+            except asyncio.TimeoutError:
+                yield ': heartbeat\n\n'
+            # One read covers every poke that arrived meanwhile
+            subscription.clear()
+
+
+@require_GET
+@asgi_only
+@stream_ticket_required('activity')
+async def activity_stream(request):
+    """Server-sent admin activity feed, resuming after ?since= or Last-Event-ID.
+
+    Without either it starts at the newest entry, so a client loads the feed
+    once and then only receives what is added. Opened with ?ticket= like
+    clock_event_stream().
+    """
+    if not request.user.is_staff:
+        return JsonResponse({"error": "Unauthorized"}, status=403)
+
+    cursor = request.headers.get('Last-Event-ID') or request.GET.get('since')
+    if cursor:
+        try:
+            decode_cursor(cursor)
+        except ValueError:
+            return JsonResponse({'error': 'since must be a cursor from X-Activity-Cursor.'}, status=400)
+    else:
+        newest = await latest_entries().afirst()
+        cursor = encode_cursor(newest) if newest else START_CURSOR
+
+    heartbeat = get_event_stream_settings()['HEARTBEAT']
+    page_size = get_activity_feed_settings()['MAX_PAGE_SIZE']
+    response = StreamingHttpResponse(_activity_events(cursor, heartbeat, page_size), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
@@ -0,0 +1,122 @@
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Case, Count, FloatField, Max, Min, Sum, Value, When
+from django.db.models.functions import Round, TruncDate
+from django.utils import timezone
+
+from .expressions import HoursBetween
+from .models import BreakRecord, ClockInRecord, DailyAttendance, WorkHours
+from .utils import day_bounds
+
+TWO_PLACES = Decimal('0.01')
+ROLLUP_FIELDS = ['first_in', 'last_out', 'worked_hours', 'extra_hours', 'break_hours', 'shift_count', 'updated_at']
+
+
+def attendance_day(record):
+    """The rollup day a shift belongs to: the local date it was clocked in on."""
+    return timezone.localdate(record.time_clocked_in)
+
+
+def rebuild_daily_attendance(start_date, end_date, user_ids=None):
+    """Recompute DailyAttendance rows for ``start_date``..``end_date`` (inclusive) from raw shifts.
+
+    Only completed shifts count. Everything is grouped in the database: one
+    aggregate over shifts, one over breaks, then an upsert on (user, date)
+    and a delete of the rows it did not touch. Concurrent refreshes of the
+    same user-day (a clock-out racing an end-break) both land on the unique
+    constraint as updates rather than failing it. Returns the number of rows
+    written.
+    """
+    range_start = day_bounds(start_date)[0]
+    range_end = day_bounds(end_date)[1]
+
+    shifts = ClockInRecord.objects.filter(
+        time_clocked_out__isnull=False,
+        time_clocked_in__gte=range_start,
+        time_clocked_in__lt=range_end,
+    )
+    existing = DailyAttendance.objects.filter(date__gte=start_date, date__lte=end_date)
+    if user_ids is not None:
+        shifts = shifts.filter(user_id__in=user_ids)
+        existing = existing.filter(user_id__in=user_ids)
+
+    shift_rows = (
+        shifts.annotate(day=TruncDate('time_clocked_in'))
+        .values('user_id', 'day')
+        .annotate(
+            first_in=Min('time_clocked_in'),
+            last_out=Max('time_clocked_out'),
+            worked_hours=Sum('hours_worked'),
+            extra_hours=Sum('extra_hours'),
+            shift_count=Count('id'),
+        )
+        .order_by()
+    )
+    break_rows = (
+        BreakRecord.objects.filter(clock_in_record__in=shifts, time_ended__isnull=False)
+        .annotate(day=TruncDate('clock_in_record__time_clocked_in'))
+        .values('clock_in_record__user_id', 'day')
+        .annotate(break_hours=Sum(HoursBetween('time_started', 'time_ended')))
+        .order_by()
+    )
+    break_hours = {
+        (row['clock_in_record__user_id'], row['day']): row['break_hours'] or 0
+        for row in break_rows
+    }
+
+    written_at = timezone.now()
+    rollups = [
+        DailyAttendance(
+            user_id=row['user_id'],
+            date=row['day'],
+            first_in=row['first_in'],
+            last_out=row['last_out'],
+            worked_hours=row['worked_hours'] or 0,
+            extra_hours=row['extra_hours'] or 0,
+            break_hours=Decimal(break_hours.get((row['user_id'], row['day']), 0)).quantize(TWO_PLACES),
+            shift_count=row['shift_count'],
+        )
+        for row in shift_rows
+    ]
+
+    with transaction.atomic():
+        DailyAttendance.objects.bulk_create(
+            rollups, batch_size=1000,
+            update_conflicts=True, unique_fields=['user', 'date'], update_fields=ROLLUP_FIELDS,
+        )
+        # Rows written above carry a later updated_at; what is left has no completed shift any more
+        existing.filter(updated_at__lt=written_at).delete()
+    return len(rollups)
+
+
+def refresh_daily_attendance(user_id, day):
+    """Bring a single user-day up to date after a shift closes or a break ends."""
+    return rebuild_daily_attendance(day, day, user_ids=[user_id])
+
+
+def refresh_attendance_for_shift(sender, instance, created=False, **kwargs):
+    """post_save/post_delete receiver refreshing the user-days a shift was and is counted on.
+
+    Covers clock-outs and admin edits or deletes of a shift, including ones
+    that move it to another day or user. Open shifts are not in the rollup,
+    so clocking in costs nothing here.
+    """
+    user_days = set()
+    if instance.time_clocked_out is not None:
+        user_days.add((instance.user_id, attendance_day(instance)))
+    previous_in = None if created else instance.loaded_value('time_clocked_in', instance.time_clocked_in)
+    if previous_in is not None and instance.loaded_value('time_clocked_out', instance.time_clocked_out) is not None:
+        user_days.add((instance.loaded_value('user_id', instance.user_id), timezone.localdate(previous_in)))
+    for user_id, day in user_days:
+        refresh_daily_attendance(user_id, day)
+
+
+def recompute_work_hours(queryset=None):
+    """Recompute WorkHours.total_hours in one UPDATE, as WorkHours.save() would; returns the row count."""
+    queryset = WorkHours.objects.all() if queryset is None else queryset
+    return queryset.update(total_hours=Case(
+        When(clock_out_time__isnull=True, then=Value(0.0)),
+        default=Round(HoursBetween('clock_in_time', 'clock_out_time'), 2),
+        output_field=FloatField(),
+    ))
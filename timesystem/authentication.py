@@ -0,0 +1,249 @@
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core import signing
+from django.db import transaction
+from django.http import JsonResponse
+from django.utils.module_loading import import_string
+from django.utils.translation import gettext_lazy as _
+from rest_framework import status
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.settings import api_settings
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from .events import get_event_stream_settings
+
+DEFAULT_JWT_USER_CACHE = {
+    'TTL': 60,              # Seconds a resolved user is reused before the row is read again
+    'MAX_ENTRIES': 10000,   # Oldest entries are evicted past this many
+}
+
+# View group -> authentication class paths; groups not listed use DEFAULT_AUTHENTICATION_CLASSES
+DEFAULT_AUTHENTICATION_GROUPS = {
+    # Polled by every employee all day; only the SPA's Bearer tokens reach them
+    'attendance': ('timesystem.authentication.CachedJWTAuthentication',),
+}
+
+STREAM_TICKET_SALT = 'timesystem.authentication.stream-ticket'
+
+
+def get_jwt_user_cache_settings():
+    config = dict(DEFAULT_JWT_USER_CACHE)
+    config.update(getattr(settings, 'JWT_USER_CACHE', {}))
+    return config
+
+
+def get_authentication_groups():
+    config = dict(DEFAULT_AUTHENTICATION_GROUPS)
+    config.update(getattr(settings, 'AUTHENTICATION_GROUPS', {}))
+    return config
+
+
+def authentication_classes_for(group):
+    """Authentication classes for a view group, resolved when the view module is imported."""
+    paths = get_authentication_groups().get(group)
+    if paths is None:
+        return list(api_settings.DEFAULT_AUTHENTICATION_CLASSES)
+    return [import_string(path) for path in paths]
+
+
+class UserCache:
+    """Users resolved from JWTs, keyed by (user id, token ``iat``), shared by this process's threads.
+
+    Entries hold the row's field values rather than a User, so concurrent
+    requests never share a mutable instance. Saving or deleting a user drops
+    their entries here; other processes, and queryset ``update()`` calls,
+    are only caught up by the TTL.
+    """
+
+    def __init__(self):
+        self._entries = OrderedDict()   # (user id, iat) -> (expires at, field values)
+        self._keys_by_user = {}         # user id -> keys cached for that user
+        self._lock = threading.Lock()
+
+    def get(self, key, model):
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            return None
+        fields = model._meta.concrete_fields
+        return model.from_db(None, [field.attname for field in fields], entry[1])
+
+    def set(self, key, user):
+        config = get_jwt_user_cache_settings()
+        values = tuple(getattr(user, field.attname) for field in user._meta.concrete_fields)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + config['TTL'], values)
+            self._entries.move_to_end(key)
+            self._keys_by_user.setdefault(key[0], set()).add(key)
+            while len(self._entries) > config['MAX_ENTRIES']:
+                self._forget(next(iter(self._entries)))
+
+    def invalidate_user(self, user_id):
+        with self._lock:
+            for key in list(self._keys_by_user.get(str(user_id), ())):
+                self._forget(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_user.clear()
+
+    def _forget(self, key):
+        self._entries.pop(key, None)
+        keys = self._keys_by_user.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_user[key[0]]
+
+
+user_cache = UserCache()
+
+
+def invalidate_cached_user(sender, instance, **kwargs):
+    # Deactivation, a password change or any other edit must be seen on the next request.
+    # A request running before the commit can still cache the old row, so drop it again after.
+    user_id = instance.pk
+    user_cache.invalidate_user(user_id)
+    transaction.on_commit(lambda: user_cache.invalidate_user(user_id), robust=True)
+
+
+def _user_cache_key(validated_token):
+    try:
+        user_id = validated_token[jwt_settings.USER_ID_CLAIM]
+    except KeyError as e:
+        raise InvalidToken(_("Token contained no recognizable user identification")) from e
+    return str(user_id), validated_token.get('iat')
+
+
+def _check_user(user, validated_token):
+    # Same checks as JWTAuthentication.get_user, also applied to cached users
+    if jwt_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+        raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+    if jwt_settings.CHECK_REVOKE_TOKEN:
+        if validated_token.get(jwt_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password):
+            raise AuthenticationFailed(_("The user's password has been changed."), code="password_changed")
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWTAuthentication that skips the User query while the token's user is cached."""
+
+    def get_user(self, validated_token):
+        key = _user_cache_key(validated_token)
+        user = user_cache.get(key, self.user_model)
+        if user is None:
+            user = super().get_user(validated_token)
+            user_cache.set(key, user)
+            return user
+        _check_user(user, validated_token)
+        return user
+
+
+class AsyncJWTAuthentication(JWTAuthentication):
+    """JWTAuthentication for plain async Django views.
+
+    Token validation is pure CPU work and is reused as is; only the user
+    lookup goes through the async ORM, and it shares CachedJWTAuthentication's
+    cache. The checks mirror ``get_user``.
+    """
+
+    async def aauthenticate(self, request):
+        header = self.get_header(request)
+        if header is None:
+            return None
+
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+
+        validated_token = self.get_validated_token(raw_token)
+        return await self.aget_user(validated_token), validated_token
+
+    async def aget_user(self, validated_token):
+        key = _user_cache_key(validated_token)
+        user = user_cache.get(key, self.user_model)
+        if user is None:
+            try:
+                user = await self.user_model.objects.aget(**{jwt_settings.USER_ID_FIELD: key[0]})
+            except self.user_model.DoesNotExist as e:
+                raise AuthenticationFailed(_("User not found"), code="user_not_found") from e
+            _check_user(user, validated_token)
+            user_cache.set(key, user)
+            return user
+
+        _check_user(user, validated_token)
+        return user
+
+
+def _unauthorized(authenticator, request, detail):
+    response = JsonResponse(detail if isinstance(detail, dict) else {'detail': detail},
+                            status=status.HTTP_401_UNAUTHORIZED)
+    response['WWW-Authenticate'] = authenticator.authenticate_header(request)
+    return response
+
+
+def async_jwt_required(view):
+    """Authenticate an async view with a Bearer JWT, answering 401 like DRF would."""
+
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        authenticator = AsyncJWTAuthentication()
+        try:
+            result = await authenticator.aauthenticate(request)
+        except (InvalidToken, AuthenticationFailed) as e:
+            return _unauthorized(authenticator, request, e.detail)
+        if result is None:
+            return _unauthorized(authenticator, request, "Authentication credentials were not provided.")
+
+        request.user, request.auth = result
+        return await view(request, *args, **kwargs)
+
+    return wrapper
+
+
+def issue_stream_ticket(user, stream):
+    """A signed ticket that opens ``stream`` for ``user``; see stream_ticket_required()."""
+    return signing.dumps({'user_id': user.pk, 'stream': stream}, salt=STREAM_TICKET_SALT)
+
+
+def stream_ticket_required(stream):
+    """Authenticate an async EventSource view from ``?ticket=``.
+
+    EventSource cannot send headers, and a query string ends up in access
+    logs, so these views take a ticket from issue_stream_ticket() instead of
+    the access token: it only opens this one stream and expires after
+    EVENT_STREAM['TICKET_TTL'] seconds.
+    """
+
+    def decorator(view):
+        @wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            try:
+                payload = signing.loads(
+                    request.GET.get('ticket', ''), salt=STREAM_TICKET_SALT,
+                    max_age=get_event_stream_settings()['TICKET_TTL'],
+                )
+            except signing.BadSignature:
+                payload = {}
+            user = None
+            if payload.get('stream') == stream:
+                user = await get_user_model().objects.filter(pk=payload.get('user_id'), is_active=True).afirst()
+            if user is None:
+                return JsonResponse({'detail': 'Stream ticket is missing, invalid or expired.'},
+                                    status=status.HTTP_401_UNAUTHORIZED)
+
+            request.user = user
+            return await view(request, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
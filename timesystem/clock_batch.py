@@ -0,0 +1,312 @@
+import operator
+from functools import reduce
+
+from django.contrib.auth.models import User
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .activity import attendance_entry, log_activities
+from .attendance import attendance_day, rebuild_daily_attendance
+from .events import publish_clock_event
+from .notifications import notify_late_arrivals
+from .models import BreakRecord, ClockInRecord
+
+CLOCK_IN = 'clock_in'
+CLOCK_OUT = 'clock_out'
+BREAK_START = 'break_start'
+BREAK_END = 'break_end'
+EVENT_TYPES = (CLOCK_IN, CLOCK_OUT, BREAK_START, BREAK_END)
+BREAK_TYPES = {choice for choice, _ in BreakRecord.BREAK_CHOICES}
+
+
+class _UserState:
+    """Open shift and open break for one user while a batch is replayed."""
+
+    def __init__(self, shift=None, open_break=None):
+        self.shift = shift
+        self.open_break = open_break
+
+
+class _Batch:
+    def __init__(self):
+        self.updated_shifts = {}
+        self.new_shifts = []
+        self.updated_breaks = {}
+        self.new_breaks = []
+
+
+def _parse_event(event):
+    """Return (user_id, type, timestamp) or raise ValueError with a client-facing message."""
+    if not isinstance(event, dict):
+        raise ValueError("Event must be an object.")
+
+    event_type = event.get('type')
+    if event_type not in EVENT_TYPES:
+        raise ValueError(f"type must be one of {', '.join(EVENT_TYPES)}.")
+
+    try:
+        user_id = int(event.get('user_id'))
+    except (TypeError, ValueError):
+        raise ValueError("user_id is required.")
+
+    timestamp = event.get('timestamp')
+    parsed = parse_datetime(timestamp) if isinstance(timestamp, str) else None
+    if parsed is None:
+        raise ValueError("timestamp must be an ISO 8601 datetime.")
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+
+    if event_type == BREAK_START and event.get('break_type') not in BREAK_TYPES:
+        raise ValueError(f"break_type must be one of {', '.join(sorted(BREAK_TYPES))}.")
+    return user_id, event_type, parsed
+
+
+def _apply(state, batch, user_id, event_type, timestamp, event):
+    """Apply one event to the in-memory state; return the touched record or raise ValueError."""
+    shift = state.shift
+
+    if event_type == CLOCK_IN:
+        if shift is not None:
+            raise ValueError(f"Already clocked in at {shift.time_clocked_in.isoformat()}.")
+        state.shift = ClockInRecord(user_id=user_id, time_clocked_in=timestamp)
+        batch.new_shifts.append(state.shift)
+        return state.shift
+
+    if shift is None:
+        raise ValueError("No active clock-in.")
+
+    if event_type == CLOCK_OUT:
+        if timestamp < shift.time_clocked_in:
+            raise ValueError("Clock-out is earlier than the clock-in.")
+        if state.open_break is not None:
+            # A shift cannot close with a break still running; end it at the same time
+            _end_break(state, batch, max(timestamp, state.open_break.time_started))
+        shift.time_clocked_out = timestamp
+        shift.compute_hours_worked()
+        if shift.pk:
+            batch.updated_shifts[shift.pk] = shift
+        state.shift = None
+        return shift
+
+    if event_type == BREAK_START:
+        if state.open_break is not None:
+            raise ValueError("There is already an active break for this clock-in.")
+        if timestamp < shift.time_clocked_in:
+            raise ValueError("Break starts before the clock-in.")
+        state.open_break = BreakRecord(
+            clock_in_record=shift,
+            break_type=event['break_type'],
+            break_notes=event.get('break_notes', ''),
+            time_started=timestamp,
+        )
+        batch.new_breaks.append(state.open_break)
+        return state.open_break
+
+    # BREAK_END
+    if state.open_break is None:
+        raise ValueError("No active break.")
+    if timestamp < state.open_break.time_started:
+        raise ValueError("Break ends before it started.")
+    return _end_break(state, batch, timestamp)
+
+
+def _end_break(state, batch, timestamp):
+    break_record = state.open_break
+    break_record.time_ended = timestamp
+    if break_record.pk:
+        batch.updated_breaks[break_record.pk] = break_record
+    state.open_break = None
+    return break_record
+
+
+def _resolve_pks(model, objects, key_fields):
+    """Fill in primary keys after bulk_create on backends that cannot return them (MySQL)."""
+    missing = [obj for obj in objects if obj.pk is None]
+    if not missing:
+        return
+    first_field, second_field = key_fields
+    # Match exact pairs; __in on each field would also pick up rows from the cross product
+    rows = model.objects.filter(reduce(operator.or_, (
+        Q(**{first_field: getattr(obj, first_field), second_field: getattr(obj, second_field)}) for obj in missing
+    ))).values_list('pk', first_field, second_field)
+    pks = {(first, second): pk for pk, first, second in rows}
+    for obj in missing:
+        obj.pk = pks.get((getattr(obj, first_field), getattr(obj, second_field)))
+
+
+def _recorded_events(user_ids, timestamps):
+    """Map (user_id, type, timestamp) to the record already holding that event.
+
+    Kiosks re-upload a batch when they miss the response, so an event that
+    matches a stored clock or break time exactly has been applied before.
+    """
+    recorded = {}
+    shifts = ClockInRecord.objects.filter(user_id__in=user_ids).filter(
+        Q(time_clocked_in__in=timestamps) | Q(time_clocked_out__in=timestamps)
+    )
+    for shift in shifts:
+        recorded[shift.user_id, CLOCK_IN, shift.time_clocked_in] = shift
+        if shift.time_clocked_out is not None:
+            recorded[shift.user_id, CLOCK_OUT, shift.time_clocked_out] = shift
+    breaks = BreakRecord.objects.select_related('clock_in_record').filter(
+        clock_in_record__user_id__in=user_ids,
+    ).filter(Q(time_started__in=timestamps) | Q(time_ended__in=timestamps))
+    for break_record in breaks:
+        user_id = break_record.clock_in_record.user_id
+        recorded[user_id, BREAK_START, break_record.time_started] = break_record
+        if break_record.time_ended is not None:
+            recorded[user_id, BREAK_END, break_record.time_ended] = break_record
+    return recorded
+
+
+def _result(index, status, record):
+    result = {'index': index, 'status': status}
+    if isinstance(record, ClockInRecord):
+        result['record_id'] = record.pk
+        result['hours_worked'] = record.hours_worked
+    else:
+        result['record_id'] = record.clock_in_record_id
+        result['break_id'] = record.pk
+    return result
+
+
+def _refresh_attendance(records):
+    """Rebuild the DailyAttendance rows for every user-day a closed shift or ended break touched."""
+    days = {}
+    for record in records:
+        if isinstance(record, ClockInRecord):
+            if record.time_clocked_out is None:
+                continue
+            shift = record
+        else:
+            if record.time_ended is None:
+                continue
+            shift = record.clock_in_record
+        days.setdefault(attendance_day(shift), set()).add(shift.user_id)
+    for day, user_ids in days.items():
+        rebuild_daily_attendance(day, day, user_ids=user_ids)
+
+
+def _announce(applied):
+    """Queue a live event and an activity entry per applied (user_id, type, timestamp, record).
+
+    bulk_create/bulk_update skip post_save, so the activity entries and
+    late-arrival notifications the signal handlers would have written are
+    added here, in replay order.
+    """
+    entries = []
+    clock_ins = []
+    for user_id, event_type, timestamp, record in applied:
+        entries.append(attendance_entry(event_type, record, user_id))
+        if event_type == CLOCK_IN:
+            clock_ins.append(record)
+        if isinstance(record, ClockInRecord):
+            payload = {'record_id': record.pk}
+            if event_type == CLOCK_IN:
+                payload['time_clocked_in'] = timestamp
+            else:
+                payload.update(time_clocked_out=timestamp, hours_worked=record.hours_worked)
+        else:
+            payload = {'break_id': record.pk, 'record_id': record.clock_in_record_id}
+            if event_type == BREAK_START:
+                payload.update(break_type=record.break_type, time_started=timestamp)
+            else:
+                payload['time_ended'] = timestamp
+        publish_clock_event(user_id, event_type, **payload)
+    log_activities(entries)
+    notify_late_arrivals(clock_ins)
+
+
+def apply_clock_events(events):
+    """Validate and apply a batch of clock/break events in one transaction.
+
+    Events are replayed in timestamp order against each user's open-shift
+    state, loaded once up front. Events already stored, or repeated within
+    the batch, are reported as duplicates and not applied again. Returns one
+    result dict per event, in the order the events were given.
+    """
+    results = [None] * len(events)
+    parsed = []
+    for index, event in enumerate(events):
+        try:
+            parsed.append((index, *_parse_event(event), event))
+        except ValueError as e:
+            results[index] = {'index': index, 'status': 'rejected', 'error': str(e)}
+
+    user_ids = {user_id for _, user_id, _, _, _ in parsed}
+    touched = {}
+    duplicates = {}
+
+    with transaction.atomic():
+        active_users = set(User.objects.filter(id__in=user_ids, is_active=True).values_list('id', flat=True))
+        states = {user_id: _UserState() for user_id in active_users}
+
+        open_shifts = ClockInRecord.objects.select_for_update().filter(
+            user_id__in=active_users, time_clocked_out__isnull=True
+        )
+        shifts_by_id = {}
+        for shift in open_shifts:
+            states[shift.user_id].shift = shift
+            shifts_by_id[shift.pk] = shift
+        open_breaks = BreakRecord.objects.select_for_update().filter(
+            clock_in_record_id__in=shifts_by_id, time_ended__isnull=True
+        )
+        for open_break in open_breaks:
+            open_break.clock_in_record = shifts_by_id[open_break.clock_in_record_id]
+            states[open_break.clock_in_record.user_id].open_break = open_break
+
+        recorded = _recorded_events(active_users, {timestamp for _, _, _, timestamp, _ in parsed})
+        first_seen = {}
+
+        batch = _Batch()
+        for index, user_id, event_type, timestamp, event in sorted(parsed, key=lambda item: (item[3], item[0])):
+            if user_id not in states:
+                results[index] = {'index': index, 'status': 'rejected', 'error': "Unknown or inactive user."}
+                continue
+            key = (user_id, event_type, timestamp)
+            if key in recorded:
+                duplicates[index] = recorded[key]
+                continue
+            if key in first_seen:
+                duplicates[index] = first_seen[key]
+                continue
+            first_seen[key] = index
+            try:
+                touched[index] = _apply(states[user_id], batch, user_id, event_type, timestamp, event)
+            except ValueError as e:
+                results[index] = {'index': index, 'status': 'rejected', 'error': str(e)}
+
+        # Close existing shifts before inserting new ones so the one-open-shift rule holds
+        ClockInRecord.objects.bulk_update(batch.updated_shifts.values(), ['time_clocked_out', 'hours_worked'])
+        ClockInRecord.objects.bulk_create(batch.new_shifts)
+        if not connection.features.can_return_rows_from_bulk_insert:
+            _resolve_pks(ClockInRecord, batch.new_shifts, ('user_id', 'time_clocked_in'))
+
+        BreakRecord.objects.bulk_update(batch.updated_breaks.values(), ['time_ended'])
+        for break_record in batch.new_breaks:
+            break_record.clock_in_record_id = break_record.clock_in_record.pk
+        BreakRecord.objects.bulk_create(batch.new_breaks)
+        if not connection.features.can_return_rows_from_bulk_insert:
+            _resolve_pks(BreakRecord, batch.new_breaks, ('clock_in_record_id', 'time_started'))
+
+        _refresh_attendance(touched.values())
+        _announce(
+            (user_id, event_type, timestamp, touched[index])
+            for index, user_id, event_type, timestamp, _ in sorted(parsed, key=lambda item: (item[3], item[0]))
+            if index in touched
+        )
+
+    for index, record in touched.items():
+        results[index] = _result(index, 'applied', record)
+    for index, original in duplicates.items():
+        if isinstance(original, int):
+            # Repeated within the batch: mirror what happened to its first copy
+            if original in touched:
+                results[index] = _result(index, 'duplicate', touched[original])
+            else:
+                results[index] = dict(results[original], index=index)
+        else:
+            results[index] = _result(index, 'duplicate', original)
+    return results
@@ -0,0 +1,132 @@
+import hashlib
+import uuid
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+from django.utils import timezone
+from django.utils.http import http_date, parse_etags, parse_http_date_safe, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+from .models import Department, Project, Role
+
+DEFAULT_MODEL_VERSION_CACHE = {
+    'ALIAS': 'default',     # Should be shared by all workers (e.g. Redis) outside development
+    'TIMEOUT': None,        # Watermark lifetime in a shared cache; bumps keep it current
+    'LOCAL_TIMEOUT': 30,    # Lifetime in a per-process cache, where other workers never see a bump
+}
+
+MODEL_VERSION_KEY = 'model-version'
+
+# Reference data served with ETag/Last-Modified; saves and deletes bump the watermark
+VERSIONED_MODELS = (Department, Role, Project, User)
+
+# Saves that only touch these fields do not change any served representation
+IGNORED_UPDATE_FIELDS = {'last_login'}
+
+
+def get_model_version_cache_settings():
+    config = dict(DEFAULT_MODEL_VERSION_CACHE)
+    config.update(getattr(settings, 'MODEL_VERSION_CACHE', {}))
+    return config
+
+
+def _cache():
+    return caches[get_model_version_cache_settings()['ALIAS']]
+
+
+def _timeout(cache):
+    # A bump only reaches the worker that made the write when the cache is per
+    # process, so there watermarks expire and each worker re-reads a new one.
+    config = get_model_version_cache_settings()
+    return config['LOCAL_TIMEOUT'] if isinstance(cache, LocMemCache) else config['TIMEOUT']
+
+
+def _key(model):
+    return f'{MODEL_VERSION_KEY}:{model._meta.label_lower}'
+
+
+def _new_watermark():
+    return {'version': uuid.uuid4().hex, 'modified': int(timezone.now().timestamp())}
+
+
+def get_watermarks(models):
+    """Return the (version, modified) watermark of each model, creating missing ones."""
+    cache = _cache()
+    keys = [_key(model) for model in models]
+    found = cache.get_many(keys)
+    for key in keys:
+        if key not in found:
+            # A cold or evicted cache starts a new version; clients refetch once
+            cache.add(key, _new_watermark(), _timeout(cache))
+            found[key] = cache.get(key)
+    return [found[key] for key in keys]
+
+
+def bump_model_version(sender, update_fields=None, **kwargs):
+    """Start a new version for ``sender`` once the transaction commits (signal-compatible)."""
+    if update_fields and set(update_fields) <= IGNORED_UPDATE_FIELDS:
+        return
+    def bump():
+        cache = _cache()
+        cache.set(_key(sender), _new_watermark(), _timeout(cache))
+
+    transaction.on_commit(bump)
+
+
+def _etags_match(request, etag):
+    header = request.META.get('HTTP_IF_NONE_MATCH')
+    if not header:
+        return None
+    candidates = parse_etags(header)
+    if '*' in candidates:
+        return True
+    # Weak comparison, as required for If-None-Match
+    return etag.removeprefix('W/') in {candidate.removeprefix('W/') for candidate in candidates}
+
+
+def _not_modified(request, etag, last_modified):
+    matched = _etags_match(request, etag)
+    if matched is not None:
+        return matched
+    # If-Modified-Since is only consulted when there is no If-None-Match
+    since = parse_http_date_safe(request.META.get('HTTP_IF_MODIFIED_SINCE', ''))
+    return since is not None and last_modified <= since
+
+
+class ConditionalListMixin:
+    """Answer list requests with ETag/Last-Modified and 304 Not Modified.
+
+    Validators come from per-model watermarks kept in the cache and bumped by
+    signals, so neither checking nor computing them touches the table. The
+    ETag also covers the query string and the negotiated media type.
+    """
+    # Models whose changes alter the response; defaults to the queryset's model
+    versioned_models = None
+
+    def get_versioned_models(self):
+        return self.versioned_models or (self.get_queryset().model,)
+
+    def get_validators(self, request):
+        watermarks = get_watermarks(self.get_versioned_models())
+        fingerprint = '|'.join(
+            [watermark['version'] for watermark in watermarks]
+            + [request.get_full_path(), request.accepted_media_type or '']
+        )
+        etag = quote_etag(hashlib.sha1(fingerprint.encode()).hexdigest())
+        return etag, max(watermark['modified'] for watermark in watermarks)
+
+    def list(self, request, *args, **kwargs):
+        etag, last_modified = self.get_validators(request)
+        if _not_modified(request, etag, last_modified):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = super().list(request, *args, **kwargs)
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified)
+        # Let the browser keep the body but revalidate on every use
+        response['Cache-Control'] = 'private, no-cache'
+        return response
@@ -0,0 +1,156 @@
+import asyncio
+import json
+import logging
+import threading
+from collections import defaultdict
+from contextlib import asynccontextmanager
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_EVENT_STREAM = {
+    'BACKEND': 'timesystem.events.InProcessBroker',  # RedisBroker when running several workers
+    'OPTIONS': {},        # Backend keyword arguments, e.g. {'url': 'redis://localhost:6379/0'}
+    'HEARTBEAT': 15,      # Seconds of silence before a keep-alive comment is sent
+    'QUEUE_SIZE': 100,    # Events buffered per connection before it is told to resync
+    'TICKET_TTL': 30,     # Seconds a stream ticket can be used to connect
+}
+
+# Put on a subscriber's queue in place of the events it was too slow to take
+RESYNC = object()
+
+
+def get_event_stream_settings():
+    config = dict(DEFAULT_EVENT_STREAM)
+    config.update(getattr(settings, 'EVENT_STREAM', {}))
+    return config
+
+
+def user_channel(user_id):
+    return f'clock-events:{user_id}'
+
+
+class Subscription:
+    """A bounded per-connection queue living on the subscriber's event loop."""
+
+    def __init__(self, loop, maxsize):
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize)
+
+    def deliver(self, event):
+        # Runs on self.loop. A consumer that fell behind loses the backlog and
+        # re-reads the current state instead of blocking the publisher.
+        if self.queue.full():
+            self.clear()
+            event = RESYNC
+        self.queue.put_nowait(event)
+
+    async def get(self):
+        return await self.queue.get()
+
+    def clear(self):
+        while not self.queue.empty():
+            self.queue.get_nowait()
+
+
+class InProcessBroker:
+    """Fan-out to subscribers in this process only; fine for a single ASGI worker."""
+
+    def __init__(self, queue_size):
+        self.queue_size = queue_size
+        self._channels = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def publish(self, channel, event):
+        with self._lock:
+            subscribers = list(self._channels.get(channel, ()))
+        for subscription in subscribers:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.deliver, event)
+            except RuntimeError:
+                # The subscriber's loop has shut down; it unsubscribes on its way out
+                pass
+
+    @asynccontextmanager
+    async def subscribe(self, channel):
+        subscription = Subscription(asyncio.get_running_loop(), self.queue_size)
+        with self._lock:
+            self._channels[channel].add(subscription)
+        try:
+            yield subscription
+        finally:
+            with self._lock:
+                self._channels[channel].discard(subscription)
+                if not self._channels[channel]:
+                    del self._channels[channel]
+
+
+class RedisBroker:
+    """Fan-out through Redis pub/sub so every worker sees every event (requires ``redis``)."""
+
+    def __init__(self, queue_size, url='redis://localhost:6379/0'):
+        try:
+            import redis
+            import redis.asyncio
+        except ImportError:
+            raise ImproperlyConfigured("RedisBroker requires the 'redis' package.")
+        self.redis = redis
+        self.queue_size = queue_size
+        self.url = url
+        self.client = redis.Redis.from_url(url)
+
+    def publish(self, channel, event):
+        self.client.publish(channel, json.dumps(event, cls=DjangoJSONEncoder))
+
+    @asynccontextmanager
+    async def subscribe(self, channel):
+        client = self.redis.asyncio.Redis.from_url(self.url)
+        pubsub = client.pubsub()
+        await pubsub.subscribe(channel)
+        subscription = Subscription(asyncio.get_running_loop(), self.queue_size)
+
+        async def pump():
+            async for message in pubsub.listen():
+                if message['type'] == 'message':
+                    subscription.deliver(json.loads(message['data']))
+
+        task = asyncio.create_task(pump())
+        try:
+            yield subscription
+        finally:
+            task.cancel()
+            await pubsub.unsubscribe(channel)
+            await pubsub.aclose()
+            await client.aclose()
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    global _broker
+    with _broker_lock:
+        if _broker is None:
+            config = get_event_stream_settings()
+            _broker = import_string(config['BACKEND'])(config['QUEUE_SIZE'], **config['OPTIONS'])
+        return _broker
+
+
+def publish_clock_event(user_id, event_type, **payload):
+    """Publish a clock/break event to the user's stream once the write commits."""
+    event = {'type': event_type, **payload}
+
+    def send():
+        try:
+            get_broker().publish(user_channel(user_id), event)
+        except Exception:
+            # Live updates are best effort; the write itself already succeeded
+            logger.exception("Could not publish %s event for user %s", event_type, user_id)
+
+    transaction.on_commit(send)
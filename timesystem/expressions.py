@@ -0,0 +1,27 @@
+from django.db.models import FloatField, Func
+
+
+class HoursBetween(Func):
+    """Number of hours from ``start`` to ``end`` computed in the database.
+
+    Timestamp subtraction differs per backend, so each one gets its own SQL.
+    """
+    output_field = FloatField()
+    arity = 2
+
+    def _compile_args(self, compiler, connection):
+        start_sql, start_params = compiler.compile(self.source_expressions[0])
+        end_sql, end_params = compiler.compile(self.source_expressions[1])
+        return start_sql, list(start_params), end_sql, list(end_params)
+
+    def as_sql(self, compiler, connection, **extra_context):
+        start_sql, start_params, end_sql, end_params = self._compile_args(compiler, connection)
+        return f"(EXTRACT(EPOCH FROM ({end_sql} - {start_sql})) / 3600.0)", end_params + start_params
+
+    def as_mysql(self, compiler, connection, **extra_context):
+        start_sql, start_params, end_sql, end_params = self._compile_args(compiler, connection)
+        return f"(TIMESTAMPDIFF(MICROSECOND, {start_sql}, {end_sql}) / 3600000000.0)", start_params + end_params
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        start_sql, start_params, end_sql, end_params = self._compile_args(compiler, connection)
+        return f"((julianday({end_sql}) - julianday({start_sql})) * 24.0)", end_params + start_params
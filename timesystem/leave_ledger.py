@@ -0,0 +1,128 @@
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Sum
+
+from .models import LeaveBalance, LeaveLedgerEntry, LeaveRequest
+from .statistics import invalidate_statistics
+
+# Leave type -> (LeaveBalance field, yearly entitlement in days)
+LEAVE_ENTITLEMENTS = {
+    'ANNUAL': ('annual', 21),
+    'SICK': ('sick', 14),
+    'CASUAL': ('casual', 7),
+    'MATERNITY': ('maternity', 40),
+}
+
+APPROVED = 'APPROVED'
+
+
+def default_balances():
+    return {field: entitlement for field, entitlement in LEAVE_ENTITLEMENTS.values()}
+
+
+def leave_days(leave_request):
+    """Number of days a leave request covers, end date included."""
+    return Decimal((leave_request.end_date - leave_request.start_date).days + 1)
+
+
+def remaining(leave_type, used_days):
+    _, entitlement = LEAVE_ENTITLEMENTS[leave_type]
+    return max(Decimal(entitlement) - (used_days or 0), Decimal(0))
+
+
+def sync_leave_request(leave_request, deleting=False):
+    """Post ledger entries so the request counts against the balance only while APPROVED.
+
+    Idempotent: the days already posted for the request are compared with what
+    should be posted now, and only the difference is written. Changes of
+    status, dates or leave type are therefore all handled the same way.
+    """
+    desired = {}
+    if not deleting and leave_request.status == APPROVED and leave_request.leave_type in LEAVE_ENTITLEMENTS:
+        desired[leave_request.leave_type] = leave_days(leave_request)
+
+    with transaction.atomic():
+        balance, _ = LeaveBalance.objects.get_or_create(user_id=leave_request.user_id, defaults=default_balances())
+        # Serialize concurrent approvals for the same user on the balance row
+        balance = LeaveBalance.objects.select_for_update().get(pk=balance.pk)
+
+        posted = dict(
+            LeaveLedgerEntry.objects.filter(leave_request=leave_request)
+            .values_list('leave_type')
+            .annotate(total=Sum('days'))
+        )
+
+        changed_types = []
+        for leave_type in set(posted) | set(desired):
+            delta = desired.get(leave_type, Decimal(0)) - (posted.get(leave_type) or Decimal(0))
+            if delta:
+                LeaveLedgerEntry.objects.create(
+                    user_id=leave_request.user_id,
+                    leave_request=leave_request,
+                    leave_type=leave_type,
+                    days=delta,
+                )
+                changed_types.append(leave_type)
+
+        changed_types = [leave_type for leave_type in changed_types if leave_type in LEAVE_ENTITLEMENTS]
+        if not changed_types:
+            return balance
+
+        used = dict(
+            LeaveLedgerEntry.objects.filter(user_id=leave_request.user_id, leave_type__in=changed_types)
+            .values_list('leave_type')
+            .annotate(total=Sum('days'))
+        )
+        update_fields = []
+        for leave_type in changed_types:
+            field = LEAVE_ENTITLEMENTS[leave_type][0]
+            setattr(balance, field, remaining(leave_type, used.get(leave_type)))
+            update_fields.append(field)
+        balance.save(update_fields=update_fields)
+        return balance
+
+
+def rebuild_balances(user_ids=None):
+    """Rebuild ledger entries and balances from approved leave history in bulk.
+
+    Returns the number of balances written.
+    """
+    approved = LeaveRequest.objects.filter(status=APPROVED, leave_type__in=LEAVE_ENTITLEMENTS)
+    ledger = LeaveLedgerEntry.objects.all()
+    balances = LeaveBalance.objects.all()
+    if user_ids is not None:
+        approved = approved.filter(user_id__in=user_ids)
+        ledger = ledger.filter(user_id__in=user_ids)
+        balances = balances.filter(user_id__in=user_ids)
+
+    with transaction.atomic():
+        ledger.delete()
+        entries = [
+            LeaveLedgerEntry(
+                user_id=leave.user_id,
+                leave_request_id=leave.id,
+                leave_type=leave.leave_type,
+                days=leave_days(leave),
+            )
+            for leave in approved.only('id', 'user_id', 'leave_type', 'start_date', 'end_date').iterator()
+        ]
+        LeaveLedgerEntry.objects.bulk_create(entries, batch_size=1000)
+
+        used = {}
+        for user_id, leave_type, total in ledger.values_list('user_id', 'leave_type').annotate(total=Sum('days')):
+            used.setdefault(user_id, {})[leave_type] = total
+
+        existing = {balance.user_id: balance for balance in balances.select_for_update()}
+        to_update, to_create = [], []
+        for user_id in set(existing) | set(used):
+            balance = existing.get(user_id) or LeaveBalance(user_id=user_id)
+            for leave_type, (field, _) in LEAVE_ENTITLEMENTS.items():
+                setattr(balance, field, remaining(leave_type, used.get(user_id, {}).get(leave_type)))
+            (to_update if balance.pk else to_create).append(balance)
+
+        LeaveBalance.objects.bulk_update(to_update, [field for field, _ in LEAVE_ENTITLEMENTS.values()], batch_size=1000)
+        LeaveBalance.objects.bulk_create(to_create, batch_size=1000)
+        # Bulk writes bypass the model signals
+        invalidate_statistics()
+        return len(to_update) + len(to_create)
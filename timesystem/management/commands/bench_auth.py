@@ -0,0 +1,69 @@
+import statistics
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from rest_framework.authentication import BasicAuthentication, SessionAuthentication, TokenAuthentication
+from rest_framework.request import Request
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.tokens import AccessToken
+
+from timesystem.authentication import CachedJWTAuthentication, authentication_classes_for, user_cache
+
+# (name, authentication classes)
+CHAINS = (
+    ('previous default', (JWTAuthentication, TokenAuthentication, BasicAuthentication, SessionAuthentication)),
+    ('default', None),
+    ('attendance', None),
+    ('cached jwt only', (CachedJWTAuthentication,)),
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure the per-request cost of resolving request.user from a Bearer JWT with the "
+        "previous authentication chain, the current default and attendance groups, and the "
+        "cached backend on its own. Reports mean and p95 microseconds and database queries "
+        "per request; the user cache is cleared before each chain, so the first request of "
+        "each cached chain pays for the lookup."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', required=True, help="Username whose JWT is used for every request.")
+        parser.add_argument('--requests', type=int, default=2000, help="Requests per authentication chain.")
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(username=options['user'])
+        except User.DoesNotExist:
+            raise CommandError(f"User '{options['user']}' does not exist.")
+
+        request = RequestFactory().get('/api/clockin-status/', headers={'Authorization': f'Bearer {AccessToken.for_user(user)}'})
+
+        self.stdout.write(f"{'chain':<18}{'mean us':>10}{'p95 us':>10}{'queries/req':>13}")
+        for name, classes in CHAINS:
+            if classes is None:
+                classes = authentication_classes_for(name)
+            result = self.run_chain(request, classes, options['requests'])
+            self.stdout.write(f"{name:<18}{result['mean']:>10.1f}{result['p95']:>10.1f}{result['queries']:>13.2f}")
+
+    def run_chain(self, request, classes, total):
+        user_cache.clear()
+        latencies = []
+        with CaptureQueriesContext(connection) as queries:
+            for _ in range(total):
+                drf_request = Request(request, authenticators=[cls() for cls in classes])
+                started = time.perf_counter()
+                if not drf_request.user.is_authenticated:
+                    raise CommandError(f"Authentication failed with {[cls.__name__ for cls in classes]}.")
+                latencies.append((time.perf_counter() - started) * 1_000_000)
+
+        latencies.sort()
+        return {
+            'mean': statistics.mean(latencies),
+            'p95': latencies[int(len(latencies) * 0.95) - 1],
+            'queries': len(queries) / total,
+        }
@@ -0,0 +1,145 @@
+import asyncio
+import statistics
+import time
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.test import AsyncRequestFactory
+from rest_framework.decorators import api_view, authentication_classes, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework_simplejwt.tokens import AccessToken
+
+from timesystem import async_views
+from timesystem.authentication import authentication_classes_for
+from timesystem.models import BreakRecord, ClockInRecord
+from timesystem.utils import today_bounds
+
+
+def sync_view(view):
+    """Wrap ``view`` the way the attendance function views in views.py are wrapped."""
+    view = permission_classes([IsAuthenticated])(view)
+    view = authentication_classes(authentication_classes_for('attendance'))(view)
+    return api_view(['GET'])(view)
+
+
+# Sync baselines: the DRF views that served these routes before async_views
+
+
+@sync_view
+def clock_in_status(request):
+    today_start, today_end = today_bounds()
+    record = ClockInRecord.objects.filter(
+        user=request.user, time_clocked_out__isnull=True,
+        time_clocked_in__gte=today_start, time_clocked_in__lt=today_end,
+    ).first()
+    if record:
+        return Response({'clockedIn': True, 'time_clocked_in': record.time_clocked_in})
+    return Response({'clockedIn': False})
+
+
+@sync_view
+def today_hours_worked(request):
+    return Response({'hoursWorked': ClockInRecord.get_today_hours(request.user)})
+
+
+@sync_view
+def check_active_clock_in(request):
+    record = ClockInRecord.objects.filter(user=request.user, time_clocked_out__isnull=True).first()
+    if record:
+        return Response({'active': True, 'time_clocked_in': record.time_clocked_in,
+                         'record_id': record.id, 'user_id': record.user_id})
+    return Response({'active': False, 'record_id': None})
+
+
+@sync_view
+def check_active_break(request):
+    active_break = BreakRecord.objects.filter(
+        clock_in_record__id=request.query_params.get('record_id'),
+        clock_in_record__user=request.user,
+        time_ended__isnull=True,
+    ).first()
+    if active_break is None:
+        return Response({'active': False})
+    return Response({
+        'active': True,
+        'break_id': active_break.id,
+        'break_start_time': active_break.time_started,
+        'clock_in_record__id': active_break.clock_in_record_id,
+        'breakType': active_break.break_type,
+        'record_id': active_break.clock_in_record_id,
+    })
+
+
+# (name, path, sync view, async view)
+ENDPOINTS = (
+    ('clockin-status', '/api/clockin-status/', clock_in_status, async_views.clock_in_status),
+    ('timesheet-today', '/api/timesheet/today/', today_hours_worked, async_views.today_hours_worked),
+    ('check-active-clockin', '/api/check-active-clockin/', check_active_clock_in, async_views.check_active_clock_in),
+    ('check-active-break', '/api/check-active-break/', check_active_break, async_views.check_active_break),
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Fire concurrent requests at the sync and async attendance status views and report "
+        "throughput and latency. Sync views are driven the way the ASGI handler runs them "
+        "(sync_to_async, thread-sensitive), so this shows how each variant scales on one "
+        "event loop. For end-to-end numbers, point an HTTP load tool at "
+        "`uvicorn timesystem.asgi:application` instead."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', required=True, help="Username whose JWT is used for every request.")
+        parser.add_argument('--requests', type=int, default=500, help="Requests per endpoint and variant.")
+        parser.add_argument('--concurrency', type=int, default=50, help="Requests in flight at once.")
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(username=options['user'])
+        except User.DoesNotExist:
+            raise CommandError(f"User '{options['user']}' does not exist.")
+
+        record = ClockInRecord.objects.filter(user=user).order_by('-time_clocked_in').first()
+        headers = {'Authorization': f'Bearer {AccessToken.for_user(user)}'}
+        query = {'record_id': record.id if record else 0}
+
+        self.stdout.write(f"{'endpoint':<22}{'variant':<8}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'errors':>8}")
+        for name, path, sync_view, async_view in ENDPOINTS:
+            for variant, view in (('sync', sync_to_async(sync_view)), ('async', async_view)):
+                result = asyncio.run(self.run_load(view, path, query, headers, options['requests'], options['concurrency']))
+                self.stdout.write(
+                    f"{name:<22}{variant:<8}{result['throughput']:>10.1f}{result['p50']:>10.1f}"
+                    f"{result['p95']:>10.1f}{result['errors']:>8}"
+                )
+
+    async def run_load(self, view, path, query, headers, total, concurrency):
+        factory = AsyncRequestFactory()
+        semaphore = asyncio.Semaphore(concurrency)
+        latencies = []
+        errors = 0
+
+        async def one_request():
+            nonlocal errors
+            async with semaphore:
+                request = factory.get(path, query, headers=headers)
+                started = time.perf_counter()
+                response = await view(request)
+                if hasattr(response, 'render'):
+                    response.render()
+                latencies.append((time.perf_counter() - started) * 1000)
+                if response.status_code != 200:
+                    errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one_request() for _ in range(total)))
+        elapsed = time.perf_counter() - started
+
+        latencies.sort()
+        return {
+            'throughput': total / elapsed,
+            'p50': statistics.median(latencies),
+            'p95': latencies[int(len(latencies) * 0.95) - 1],
+            'errors': errors,
+        }
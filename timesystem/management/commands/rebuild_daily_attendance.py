@@ -0,0 +1,43 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from timesystem.attendance import rebuild_daily_attendance
+from timesystem.models import ClockInRecord
+from timesystem.utils import parse_date_param
+
+
+class Command(BaseCommand):
+    help = "Backfill or rebuild the DailyAttendance rollup for a date range."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--from', dest='date_from', help="First day (YYYY-MM-DD). Defaults to the earliest clock-in.")
+        parser.add_argument('--to', dest='date_to', help="Last day (YYYY-MM-DD). Defaults to today.")
+        parser.add_argument('--user', type=int, action='append', dest='user_ids',
+                            help="Only rebuild this user id (can be repeated).")
+        parser.add_argument('--chunk-days', type=int, default=31,
+                            help="Days rebuilt per transaction.")
+
+    def handle(self, *args, **options):
+        try:
+            date_to = parse_date_param(options['date_to']) if options['date_to'] else timezone.localdate()
+            if options['date_from']:
+                date_from = parse_date_param(options['date_from'])
+            else:
+                first = ClockInRecord.objects.order_by('time_clocked_in').values_list('time_clocked_in', flat=True).first()
+                date_from = timezone.localdate(first) if first else date_to
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        if date_from > date_to:
+            raise CommandError("--from must not be after --to.")
+
+        written = 0
+        chunk_start = date_from
+        while chunk_start <= date_to:
+            chunk_end = min(chunk_start + timedelta(days=options['chunk_days'] - 1), date_to)
+            written += rebuild_daily_attendance(chunk_start, chunk_end, user_ids=options['user_ids'])
+            chunk_start = chunk_end + timedelta(days=1)
+
+        self.stdout.write(self.style.SUCCESS(f"Wrote {written} daily attendance row(s) for {date_from} to {date_to}."))
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from timesystem.leave_ledger import rebuild_balances
+
+
+class Command(BaseCommand):
+    help = "Rebuild the leave ledger and LeaveBalance rows from approved leave requests."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', type=int, action='append', dest='user_ids',
+                            help="Only rebuild this user id (can be repeated).")
+
+    def handle(self, *args, **options):
+        written = rebuild_balances(user_ids=options['user_ids'])
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {written} leave balance(s)."))
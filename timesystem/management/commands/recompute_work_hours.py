@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from timesystem.attendance import recompute_work_hours
+from timesystem.models import WorkHours
+from timesystem.utils import day_bounds, parse_date_param
+
+
+class Command(BaseCommand):
+    help = "Recompute WorkHours.total_hours from the clock-in/out times with a single UPDATE."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--from', dest='date_from', help="First clock-in day (YYYY-MM-DD).")
+        parser.add_argument('--to', dest='date_to', help="Last clock-in day (YYYY-MM-DD).")
+        parser.add_argument('--user', type=int, action='append', dest='user_ids',
+                            help="Only recompute this user id (can be repeated).")
+
+    def handle(self, *args, **options):
+        queryset = WorkHours.objects.all()
+        try:
+            if options['date_from']:
+                queryset = queryset.filter(clock_in_time__gte=day_bounds(parse_date_param(options['date_from']))[0])
+            if options['date_to']:
+                queryset = queryset.filter(clock_in_time__lt=day_bounds(parse_date_param(options['date_to']))[1])
+        except ValueError as e:
+            raise CommandError(str(e))
+        if options['user_ids']:
+            queryset = queryset.filter(user_id__in=options['user_ids'])
+
+        updated = recompute_work_hours(queryset)
+        self.stdout.write(self.style.SUCCESS(f"Recomputed total_hours on {updated} work hours row(s)."))
@@ -1,75 +1,257 @@
-import logging  
-import json  
-from django.db import connection
-from django.utils.deprecation import MiddlewareMixin
+import atexit
+import json
+import logging
+import queue
+import random
+import threading
+import time
 import traceback
+from logging.handlers import QueueHandler, QueueListener
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+from .profiling import (
+    RequestQueryRecorder,
+    get_sql_profiler_settings,
+    install_dispatcher,
+    instrument_connections,
+    record_request,
+    recording,
+)
+
 logger = logging.getLogger(__name__)
-class RequestResponseLoggingMiddleware(MiddlewareMixin):  
-    def __init__(self, get_response):  
-        self.get_response = get_response  
-        self.configure_logging()  
 
-    def configure_logging(self):  
-        # Create a custom logger  
-        self.logger = logging.getLogger("RequestResponseLogger")  
-        self.logger.setLevel(logging.INFO)  
 
-        # Create a console handler for output to the console  
-        ch = logging.StreamHandler()  
-        ch.setLevel(logging.INFO)  
+DEFAULT_REQUEST_LOGGING = {
+    'DEFAULT_SAMPLE_RATE': 1.0,   # Fraction of requests logged when no route rule matches
+    'ROUTE_SAMPLE_RATES': {},     # Path prefix -> sample rate, longest prefix wins
+    'QUEUE_SIZE': 10000,          # Records buffered before new ones are dropped
+    'BODY_PREVIEW_CHARS': 200,    # How much of a JSON body to keep for sampled requests
+}
 
-        # Create a custom formatter  
-        formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')  
-        ch.setFormatter(formatter)  
 
-        # Add the handler to the logger  
-        if not self.logger.hasHandlers():  
-            self.logger.addHandler(ch)  
+def get_request_logging_settings():
+    config = dict(DEFAULT_REQUEST_LOGGING)
+    config.update(getattr(settings, 'REQUEST_LOGGING', {}))
+    return config
 
-    def __call__(self, request):
+
+class LazyJSON:
+    """Defers json.dumps until a handler actually formats the record."""
+
+    def __init__(self, prefix, payload):
+        self.prefix = prefix
+        self.payload = payload
+
+    def __str__(self):
+        return self.prefix + json.dumps(self.payload, default=str)
+
+
+class _BodyPreview:
+    def __init__(self, body, limit):
+        self.body = body
+        self.limit = limit
+
+    def __str__(self):
+        return self.body[:self.limit * 4].decode('utf-8', errors='replace')[:self.limit]
+
+
+class DroppingQueueHandler(QueueHandler):
+    """QueueHandler that never blocks the request thread.
+
+    Records are queued unformatted so serialization happens on the listener
+    thread; when the queue is full the record is dropped and counted.
+    """
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+        self._lock = threading.Lock()
+
+    def prepare(self, record):
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+
+
+class RequestLogPipeline:
+    """Bounded queue drained by a background QueueListener writing to stdout."""
+
+    def __init__(self, queue_size):
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.handler = DroppingQueueHandler(self.queue)
+
+        stream_handler = logging.StreamHandler()
+        stream_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+        self.listener = QueueListener(self.queue, stream_handler, respect_handler_level=True)
+        self.listener.start()
+        atexit.register(self.listener.stop)
+
+    @property
+    def dropped(self):
+        return self.handler.dropped
+
+
+_pipeline = None
+_pipeline_lock = threading.Lock()
+
+
+def get_request_log_pipeline():
+    global _pipeline
+    with _pipeline_lock:
+        if _pipeline is None:
+            _pipeline = RequestLogPipeline(get_request_logging_settings()['QUEUE_SIZE'])
+        return _pipeline
+
+
+class RequestResponseLoggingMiddleware:
+    """Samples requests per route and logs a compact summary off the request thread."""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+        self.config = get_request_logging_settings()
+        self.route_rates = sorted(
+            self.config['ROUTE_SAMPLE_RATES'].items(), key=lambda item: len(item[0]), reverse=True
+        )
+        self.pipeline = get_request_log_pipeline()
+        self.configure_logging()
+
+    def configure_logging(self):
+        self.logger = logging.getLogger("RequestResponseLogger")
+        self.logger.setLevel(logging.INFO)
+        self.logger.propagate = False
+        if self.pipeline.handler not in self.logger.handlers:
+            self.logger.addHandler(self.pipeline.handler)
+
+    def sample_rate(self, path):
+        for prefix, rate in self.route_rates:
+            if path.startswith(prefix):
+                return rate
+        return self.config['DEFAULT_SAMPLE_RATE']
+
+    def should_sample(self, path):
+        rate = self.sample_rate(path)
+        if rate >= 1:
+            return True
+        if rate <= 0:
+            return False
+        return random.random() < rate
+
+    def start_entry(self, request):
         log_entry = {
             "request_method": request.method,
             "request_path": request.path,
-            "request_headers": dict(request.headers),
         }
 
+        # Capture the body before the view consumes the stream; it is only
+        # decoded and trimmed when the record is written.
         if request.content_type and request.content_type.startswith('application/json'):
-            log_entry["request_body"] = request.body.decode('utf-8')[:200]  # Log first 200 chars
-
-        self.logger.info("Incoming request: " + json.dumps(log_entry))
+            log_entry["request_body"] = _BodyPreview(request.body, self.config['BODY_PREVIEW_CHARS'])
+        return log_entry
 
-        response = self.get_response(request)
+    def finish_entry(self, log_entry, response, started):
+        log_entry["response_status"] = response.status_code
+        log_entry["duration_ms"] = round((time.perf_counter() - started) * 1000, 2)
+        log_entry["dropped_records"] = self.pipeline.dropped
 
-        # Capture SQL queries
-        queries = connection.queries
-        total_time = sum(float(query['time']) for query in queries)
-        log_entry["db_queries"] = queries
-        log_entry["total_db_time"] = total_time
-        self.logger.info(f"SQL Queries: {json.dumps(queries)}")
-        self.logger.info(f"Total DB Time: {total_time:.2f} seconds")
+        self.logger.info(LazyJSON("Request: ", log_entry))
 
-        # Create a structured log entry for the response
-        log_entry = {
-            "response_status": response.status_code,
-            "response_headers": dict(response.headers),
-        }
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self.should_sample(request.path):
+            return self.get_response(request)
 
-        # Safely access the Content-Type header
-        content_type = response.get('Content-Type', None)
-        if content_type and content_type.startswith('application/json'):
-            log_entry["response_body"] = response.content.decode('utf-8')[:200]  # Log first 200 chars
+        started = time.perf_counter()
+        log_entry = self.start_entry(request)
+        response = self.get_response(request)
+        self.finish_entry(log_entry, response, started)
+        return response
 
-        self.logger.info("Outgoing response: " + json.dumps(log_entry))
+    async def __acall__(self, request):
+        if not self.should_sample(request.path):
+            return await self.get_response(request)
 
+        started = time.perf_counter()
+        log_entry = self.start_entry(request)
+        response = await self.get_response(request)
+        self.finish_entry(log_entry, response, started)
         return response
 
     def process_exception(self, request, exception):
+        # Errors bypass sampling; the traceback is captured now because it is
+        # gone once the handler thread gets to the record. Format the exception
+        # given: adapted under an async stack, none is "currently handled".
         error_log_entry = {
             "request_method": request.method,
             "request_path": request.path,
             "error_message": str(exception),
-            "traceback": traceback.format_exc(),
+            "traceback": ''.join(traceback.format_exception(exception)),
         }
-        self.logger.error("Exception occurred: " + json.dumps(error_log_entry))
+        self.logger.error(LazyJSON("Exception occurred: ", error_log_entry))
+
+
+class SQLProfilingMiddleware:
+    """Aggregates query count and time per SQL fingerprint for each view.
+
+    Uses connection.execute_wrapper, so it works with DEBUG=False and does not
+    depend on connection.queries.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.config = get_sql_profiler_settings()
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self.config['ENABLED']:
+            return self.get_response(request)
+
+        recorder = RequestQueryRecorder(self.config['STATEMENT_CHARS'])
+        with instrument_connections(recorder):
+            response = self.get_response(request)
+
+        self.finish(request, recorder)
+        return response
+
+    async def __acall__(self, request):
+        if not self.config['ENABLED']:
+            return await self.get_response(request)
+
+        # The view's queries run on a worker thread whose connections are not
+        # reachable from the event loop; process_view installs a dispatcher
+        # there and the recorder travels with the request's context.
+        recorder = RequestQueryRecorder(self.config['STATEMENT_CHARS'])
+        with recording(recorder):
+            response = await self.get_response(request)
+
+        self.finish(request, recorder)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        # Under ASGI Django calls this on the thread that runs sync views and
+        # the async ORM for this request
+        if self.config['ENABLED'] and iscoroutinefunction(self):
+            install_dispatcher()
+        return None
 
-    
\ No newline at end of file
+    def finish(self, request, recorder):
+        match = getattr(request, 'resolver_match', None)
+        view_name = match.view_name if match else request.path
+        record_request(view_name, recorder)
@@ -0,0 +1,28 @@
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('timesystem', '0020_performancereview'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LeaveLedgerEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('leave_type', models.CharField(max_length=50)),
+                ('days', models.DecimalField(decimal_places=2, max_digits=6)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('leave_request', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='timesystem.leaverequest')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['user', 'leave_type'], name='leaveledger_user_type_idx')],
+            },
+        ),
+    ]
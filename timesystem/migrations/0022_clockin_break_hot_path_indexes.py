@@ -0,0 +1,19 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('timesystem', '0021_leaveledgerentry'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='clockinrecord',
+            index=models.Index(fields=['user', 'time_clocked_out', 'time_clocked_in'], name='clockin_user_open_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='breakrecord',
+            index=models.Index(fields=['clock_in_record', 'time_ended'], name='break_record_open_idx'),
+        ),
+    ]
@@ -0,0 +1,66 @@
+from django.db import migrations, models
+from django.db.models import Count
+
+MYSQL_COLUMN = 'open_shift_user_id'
+MYSQL_INDEX = 'clockin_one_open_shift_uniq'
+
+
+def close_duplicate_open_shifts(apps, schema_editor):
+    """Keep only the latest open shift per user so the unique rule can be added.
+
+    Older duplicates are closed at their own clock-in time (zero hours worked).
+    """
+    ClockInRecord = apps.get_model('timesystem', 'ClockInRecord')
+    duplicated_users = (
+        ClockInRecord.objects.filter(time_clocked_out__isnull=True)
+        .values('user_id')
+        .annotate(open_count=Count('id'))
+        .filter(open_count__gt=1)
+        .values_list('user_id', flat=True)
+    )
+    for user_id in list(duplicated_users):
+        open_records = ClockInRecord.objects.filter(user_id=user_id, time_clocked_out__isnull=True)
+        latest = open_records.order_by('-time_clocked_in', '-id').first()
+        for record in open_records.exclude(pk=latest.pk):
+            record.time_clocked_out = record.time_clocked_in
+            record.hours_worked = 0
+            record.save(update_fields=['time_clocked_out', 'hours_worked'])
+
+
+def add_mysql_open_shift_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'mysql':
+        return
+    schema_editor.execute(
+        f"ALTER TABLE timesystem_clockinrecord "
+        f"ADD COLUMN {MYSQL_COLUMN} INT GENERATED ALWAYS AS "
+        f"(IF(time_clocked_out IS NULL, user_id, NULL)) VIRTUAL, "
+        f"ADD UNIQUE INDEX {MYSQL_INDEX} ({MYSQL_COLUMN})"
+    )
+
+
+def drop_mysql_open_shift_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'mysql':
+        return
+    schema_editor.execute(
+        f"ALTER TABLE timesystem_clockinrecord DROP INDEX {MYSQL_INDEX}, DROP COLUMN {MYSQL_COLUMN}"
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('timesystem', '0022_clockin_break_hot_path_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(close_duplicate_open_shifts, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='clockinrecord',
+            constraint=models.UniqueConstraint(
+                condition=models.Q(time_clocked_out__isnull=True),
+                fields=('user',),
+                name='clockin_one_open_shift_per_user',
+            ),
+        ),
+        migrations.RunPython(add_mysql_open_shift_index, drop_mysql_open_shift_index),
+    ]
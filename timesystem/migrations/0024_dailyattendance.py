@@ -0,0 +1,33 @@
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('timesystem', '0023_clockinrecord_one_open_shift_per_user'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyAttendance',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('first_in', models.DateTimeField()),
+                ('last_out', models.DateTimeField(blank=True, null=True)),
+                ('worked_hours', models.DecimalField(decimal_places=2, default=0, max_digits=6)),
+                ('break_hours', models.DecimalField(decimal_places=2, default=0, max_digits=6)),
+                ('extra_hours', models.DecimalField(decimal_places=2, default=0, max_digits=6)),
+                ('shift_count', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['date'], name='dailyattendance_date_idx')],
+                'constraints': [models.UniqueConstraint(fields=('user', 'date'), name='dailyattendance_user_date_uniq')],
+            },
+        ),
+    ]
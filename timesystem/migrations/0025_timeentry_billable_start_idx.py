@@ -0,0 +1,15 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('timesystem', '0024_dailyattendance'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='timeentry',
+            index=models.Index(fields=['is_billable', 'start_time'], name='timeentry_billable_start_idx'),
+        ),
+    ]
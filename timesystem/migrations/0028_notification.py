@@ -0,0 +1,45 @@
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('timesystem', '0027_activitylog'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Notification',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('leave', 'Leave'), ('task', 'Task'), ('attendance', 'Attendance')], max_length=20)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('warning', 'Warning'), ('resolved', 'Resolved')], max_length=20)),
+                ('title', models.CharField(max_length=100)),
+                ('message', models.CharField(max_length=255)),
+                ('object_id', models.PositiveIntegerField()),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'indexes': [
+                    models.Index(fields=['created_at', 'id'], name='notification_created_idx'),
+                    models.Index(fields=['kind', 'object_id'], name='notification_object_idx'),
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name='NotificationRead',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('read_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('notification', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='timesystem.notification')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('user', 'notification'), name='notificationread_user_uniq')],
+            },
+        ),
+    ]
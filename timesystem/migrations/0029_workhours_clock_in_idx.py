@@ -0,0 +1,15 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('timesystem', '0028_notification'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='workhours',
+            index=models.Index(fields=['clock_in_time'], name='workhours_clock_in_idx'),
+        ),
+    ]
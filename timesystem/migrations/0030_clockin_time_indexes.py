@@ -0,0 +1,19 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('timesystem', '0029_workhours_clock_in_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='clockinrecord',
+            index=models.Index(fields=['user', 'time_clocked_in'], name='clockin_user_time_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='clockinrecord',
+            index=models.Index(fields=['time_clocked_in'], name='clockin_time_idx'),
+        ),
+    ]
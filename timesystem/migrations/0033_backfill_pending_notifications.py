@@ -0,0 +1,57 @@
+from django.db import migrations
+
+
+def _display_name(first_name, last_name, username):
+    return f'{first_name} {last_name}'.strip() or username
+
+
+def create_pending_notifications(apps, schema_editor):
+    """Notify admins about leave requests and tasks that were already waiting before 0028.
+
+    The post_save handlers only cover changes made after the upgrade; the
+    admin notifications used to list these items straight from their tables.
+    Items that already have a pending notification are skipped.
+    """
+    Notification = apps.get_model('timesystem', 'Notification')
+    LeaveRequest = apps.get_model('timesystem', 'LeaveRequest')
+    Task = apps.get_model('timesystem', 'Task')
+
+    def already_notified(kind):
+        return set(Notification.objects.filter(kind=kind, status='pending').values_list('object_id', flat=True))
+
+    notified = already_notified('leave')
+    leave_requests = LeaveRequest.objects.filter(status='PENDING').order_by('id').values_list(
+        'id', 'leave_type', 'user__first_name', 'user__last_name', 'user__username',
+    )
+    Notification.objects.bulk_create([
+        Notification(
+            kind='leave', status='pending', title='Leave Request', object_id=request_id,
+            message=f'{_display_name(first_name, last_name, username)} requested {leave_type} leave',
+        )
+        for request_id, leave_type, first_name, last_name, username in leave_requests
+        if request_id not in notified
+    ], batch_size=1000)
+
+    notified = already_notified('task')
+    tasks = Task.objects.filter(status='awaiting_approval').order_by('id').values_list(
+        'id', 'name', 'assigned_to__user__first_name', 'assigned_to__user__last_name', 'assigned_to__user__username',
+    )
+    Notification.objects.bulk_create([
+        Notification(
+            kind='task', status='pending', title='Task Approval', object_id=task_id,
+            message=f'Task "{name}" by {_display_name(first_name or "", last_name or "", username or "Someone")} needs approval',
+        )
+        for task_id, name, first_name, last_name, username in tasks
+        if task_id not in notified
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('timesystem', '0032_task_updated_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_pending_notifications, migrations.RunPython.noop),
+    ]
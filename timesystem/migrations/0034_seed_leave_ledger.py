@@ -0,0 +1,65 @@
+from decimal import Decimal
+
+from django.db import migrations
+from django.db.models import Sum
+
+# Frozen copy of leave_ledger.LEAVE_ENTITLEMENTS at the time of this migration
+LEAVE_ENTITLEMENTS = {
+    'ANNUAL': ('annual', 21),
+    'SICK': ('sick', 14),
+    'CASUAL': ('casual', 7),
+    'MATERNITY': ('maternity', 40),
+}
+
+
+def rebuild_ledger(apps, schema_editor):
+    """Post a ledger entry per approved request and recompute every balance from the ledger.
+
+    A frozen copy of leave_ledger.rebuild_balances(). Stored LeaveBalance rows
+    were only refreshed when their owner opened the balance page, so they are
+    recomputed from approved history, as that page used to do, rather than
+    trusted. Users with approved leave but no row get one.
+    """
+    LeaveBalance = apps.get_model('timesystem', 'LeaveBalance')
+    LeaveLedgerEntry = apps.get_model('timesystem', 'LeaveLedgerEntry')
+    LeaveRequest = apps.get_model('timesystem', 'LeaveRequest')
+
+    LeaveLedgerEntry.objects.all().delete()
+    approved = LeaveRequest.objects.filter(status='APPROVED', leave_type__in=LEAVE_ENTITLEMENTS).values_list(
+        'id', 'user_id', 'leave_type', 'start_date', 'end_date',
+    )
+    LeaveLedgerEntry.objects.bulk_create([
+        LeaveLedgerEntry(user_id=user_id, leave_request_id=request_id, leave_type=leave_type,
+                         days=Decimal((end_date - start_date).days + 1))
+        for request_id, user_id, leave_type, start_date, end_date in approved.iterator()
+    ], batch_size=1000)
+
+    used = {}
+    for user_id, leave_type, total in LeaveLedgerEntry.objects.values_list('user_id', 'leave_type').annotate(
+        total=Sum('days'),
+    ).order_by():
+        used.setdefault(user_id, {})[leave_type] = total
+
+    existing = {balance.user_id: balance for balance in LeaveBalance.objects.all()}
+    to_update, to_create = [], []
+    for user_id in set(existing) | set(used):
+        balance = existing.get(user_id) or LeaveBalance(user_id=user_id)
+        for leave_type, (field, entitlement) in LEAVE_ENTITLEMENTS.items():
+            days = used.get(user_id, {}).get(leave_type) or 0
+            setattr(balance, field, max(Decimal(entitlement) - days, Decimal(0)))
+        (to_update if balance.pk else to_create).append(balance)
+
+    fields = [field for field, _ in LEAVE_ENTITLEMENTS.values()]
+    LeaveBalance.objects.bulk_update(to_update, fields, batch_size=1000)
+    LeaveBalance.objects.bulk_create(to_create, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('timesystem', '0033_backfill_pending_notifications'),
+    ]
+
+    operations = [
+        migrations.RunPython(rebuild_ledger, migrations.RunPython.noop),
+    ]
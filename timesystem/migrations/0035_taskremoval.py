@@ -0,0 +1,25 @@
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('timesystem', '0034_seed_leave_ledger'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskRemoval',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('task_id', models.PositiveIntegerField()),
+                ('removed_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('employee', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='timesystem.employee')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['employee', 'removed_at'], name='taskremoval_employee_idx')],
+            },
+        ),
+    ]
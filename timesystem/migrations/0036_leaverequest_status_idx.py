@@ -0,0 +1,15 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('timesystem', '0035_taskremoval'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='leaverequest',
+            index=models.Index(fields=['status'], name='leaverequest_status_idx'),
+        ),
+    ]
@@ -3,6 +3,34 @@ from django.contrib.auth.models import User
 from django.utils import timezone
 from django.core.exceptions import ValidationError
 
+from .utils import today_bounds
+
+
+class TrackedFieldsMixin:
+    """Remember the stored value of ``tracked_fields`` so signal handlers can spot transitions."""
+    tracked_fields = ()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.mark_stored()
+        return instance
+
+    def mark_stored(self):
+        # Deferred fields are left out; loaded_value() reports them as unknown
+        self._loaded_values = {name: self.__dict__[name] for name in self.tracked_fields if name in self.__dict__}
+
+    def loaded_value(self, name, default=None):
+        """The value ``name`` had in the database, None for unsaved rows, ``default`` if unknown."""
+        if not hasattr(self, '_loaded_values'):
+            return None
+        return self._loaded_values.get(name, default)
+
+
+def remember_stored_values(sender, instance, **kwargs):
+    """post_save receiver; connect it after every handler that compares loaded values."""
+    instance.mark_stored()
+
 # Define Department first
 class Department(models.Model):
     name = models.CharField(max_length=100, unique=True)
@@ -59,7 +87,7 @@ class Project(models.Model):
     def __str__(self):
         return self.name
 
-class Task(models.Model):
+class Task(TrackedFieldsMixin, models.Model):
     STATUS_CHOICES = [
         ('pending', 'Pending'),
         ('in_progress', 'In Progress'),
@@ -76,11 +104,41 @@ class Task(models.Model):
     assigned_to = models.ForeignKey('Employee', on_delete=models.SET_NULL, null=True)
     project = models.ForeignKey('Project', null=True, on_delete=models.SET_NULL)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     completed_date = models.DateTimeField(null=True, blank=True)
 
+    tracked_fields = ('status', 'assigned_to_id')
+
+    class Meta:
+        indexes = [
+            # Project task report: tasks per project, optionally by status
+            models.Index(fields=['project', 'status'], name='task_project_status_idx'),
+            # Task lists filtered by status and due date, or by assignee and status
+            models.Index(fields=['status', 'due_date'], name='task_status_due_idx'),
+            models.Index(fields=['assigned_to', 'status'], name='task_assignee_status_idx'),
+            # Per-user feeds: due today, and changes since the client's last sync
+            models.Index(fields=['assigned_to', 'due_date'], name='task_assignee_due_idx'),
+            models.Index(fields=['assigned_to', 'updated_at'], name='task_assignee_updated_idx'),
+        ]
+
     def __str__(self):
         return self.name
 
+
+class TaskRemoval(models.Model):
+    """Tombstone for a task deleted or reassigned away from an employee, for incremental task feeds."""
+    employee = models.ForeignKey('Employee', on_delete=models.CASCADE)
+    task_id = models.PositiveIntegerField()
+    removed_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['employee', 'removed_at'], name='taskremoval_employee_idx'),
+        ]
+
+    def __str__(self):
+        return f'Task {self.task_id} removed from {self.employee_id}'
+
 class TimeStampedModel(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)  # optional
@@ -95,6 +153,12 @@ class TimeEntry(TimeStampedModel):
     end_time = models.DateTimeField(null=True, blank=True)
     is_billable = models.BooleanField(default=False)
 
+    class Meta:
+        indexes = [
+            # Billable-hours report: billable entries in a date range
+            models.Index(fields=['is_billable', 'start_time'], name='timeentry_billable_start_idx'),
+        ]
+
     def __str__(self):
         return f"{self.employee} - {self.task}"
 
@@ -102,28 +166,55 @@ class TimeEntry(TimeStampedModel):
         if self.end_time and self.start_time and self.end_time < self.start_time:
             raise ValidationError("End time must be after start time.")
     
-class ClockInRecord(models.Model):
+class ClockInRecord(TrackedFieldsMixin, models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     time_clocked_in = models.DateTimeField(default=timezone.now)
     time_clocked_out = models.DateTimeField(null=True, blank=True)
     hours_worked = models.DecimalField(max_digits=5, decimal_places=2, default=0)
     extra_hours = models.DecimalField(max_digits=5, decimal_places=2, default=0)
 
+    tracked_fields = ('time_clocked_out', 'time_clocked_in', 'user_id')
+
+    class Meta:
+        indexes = [
+            # Open-shift lookups: user + time_clocked_out IS NULL, optionally bounded by a clock-in range
+            models.Index(fields=['user', 'time_clocked_out', 'time_clocked_in'], name='clockin_user_open_idx'),
+            # Attendance history: one user's shifts, or everyone's, by clock-in time
+            models.Index(fields=['user', 'time_clocked_in'], name='clockin_user_time_idx'),
+            models.Index(fields=['time_clocked_in'], name='clockin_time_idx'),
+        ]
+        constraints = [
+            # At most one open shift per user. MySQL has no partial unique indexes, so
+            # migration 0023 enforces the same rule there with a generated column.
+            models.UniqueConstraint(
+                fields=['user'],
+                condition=models.Q(time_clocked_out__isnull=True),
+                name='clockin_one_open_shift_per_user',
+            ),
+        ]
+
     def __str__(self):
         return f'{self.user.username} - {self.time_clocked_in.strftime("%Y-%m-%d %H:%M:%S")}'
 
     def save(self, *args, **kwargs):
+        self.compute_hours_worked()
+        super().save(*args, **kwargs)
+
+    def compute_hours_worked(self):
+        """Set hours_worked from the clock-in/out times; also used for bulk updates, which skip save()."""
         if self.time_clocked_out:
             worked_duration = (self.time_clocked_out - self.time_clocked_in).total_seconds() / 3600
             self.hours_worked = round(worked_duration, 2)
-        super().save(*args, **kwargs)
 
     @staticmethod
-    def get_today_hours(user):
-        today = timezone.now().date()
-        # Get the latest clock-in record for today
-        clock_in_record = ClockInRecord.objects.filter(user=user, time_clocked_in__date=today).last()
+    def _today_records(user):
+        today_start, today_end = today_bounds()
+        return ClockInRecord.objects.filter(
+            user=user, time_clocked_in__gte=today_start, time_clocked_in__lt=today_end
+        )
 
+    @staticmethod
+    def _hours_so_far(clock_in_record):
         if clock_in_record:
             if clock_in_record.time_clocked_out is None:
                 # User is currently clocked in, calculate worked hours from clock-in time to now
@@ -137,6 +228,38 @@ class ClockInRecord(models.Model):
             # No clock-in record for today
             return 0
 
+    @staticmethod
+    def get_today_hours(user):
+        # Get the latest clock-in record for today
+        return ClockInRecord._hours_so_far(ClockInRecord._today_records(user).last())
+
+    @staticmethod
+    async def aget_today_hours(user):
+        return ClockInRecord._hours_so_far(await ClockInRecord._today_records(user).alast())
+
+class DailyAttendance(models.Model):
+    """Per-user, per-day rollup of completed shifts, kept current by clock-out and end-break."""
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    date = models.DateField()
+    first_in = models.DateTimeField()
+    last_out = models.DateTimeField(null=True, blank=True)
+    worked_hours = models.DecimalField(max_digits=6, decimal_places=2, default=0)
+    break_hours = models.DecimalField(max_digits=6, decimal_places=2, default=0)
+    extra_hours = models.DecimalField(max_digits=6, decimal_places=2, default=0)
+    shift_count = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'date'], name='dailyattendance_user_date_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['date'], name='dailyattendance_date_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.user_id} - {self.date}: {self.worked_hours} hours'
+
 class JobRecord(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     job_name = models.CharField(max_length=100)
@@ -145,7 +268,7 @@ class JobRecord(models.Model):
     def __str__(self):
         return f'{self.job_name} by {self.user.username}'
 
-class BreakRecord(models.Model):
+class BreakRecord(TrackedFieldsMixin, models.Model):
     BREAK_CHOICES = (
         ('tea', 'Tea Break'),
         ('lunch', 'Lunch Break'),
@@ -156,6 +279,14 @@ class BreakRecord(models.Model):
     time_started = models.DateTimeField(default=timezone.now)
     time_ended = models.DateTimeField(null=True, blank=True)
 
+    tracked_fields = ('time_ended',)
+
+    class Meta:
+        indexes = [
+            # Active-break lookups: clock_in_record + time_ended IS NULL
+            models.Index(fields=['clock_in_record', 'time_ended'], name='break_record_open_idx'),
+        ]
+
     def __str__(self):
         return f'{self.break_type} by {self.clock_in_record.user.username}'
 
@@ -171,7 +302,7 @@ class BreakRecord(models.Model):
         return 0
 
 
-class LeaveRequest(models.Model):
+class LeaveRequest(TrackedFieldsMixin, models.Model):
     employee_name = models.CharField(max_length=100)
     employee_email = models.EmailField()
     leave_type = models.CharField(max_length=50)
@@ -182,6 +313,14 @@ class LeaveRequest(models.Model):
     user = models.ForeignKey('auth.User', on_delete=models.CASCADE)
     created_at = models.DateTimeField(auto_now_add=True)  # 👈 add this
 
+    tracked_fields = ('status',)
+
+    class Meta:
+        indexes = [
+            # Pending/approved/rejected counts and lists
+            models.Index(fields=['status'], name='leaverequest_status_idx'),
+        ]
+
     def __str__(self):
         return f"{self.employee_name} ({self.leave_type})"
     
@@ -195,6 +334,23 @@ class LeaveBalance(models.Model):
 
     def __str__(self):
         return f'{self.user.username} Leave Balance'
+
+
+class LeaveLedgerEntry(models.Model):
+    """Signed leave-day movements; LeaveBalance is derived from these on every approval change."""
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    leave_request = models.ForeignKey(LeaveRequest, on_delete=models.SET_NULL, null=True, blank=True)
+    leave_type = models.CharField(max_length=50)
+    days = models.DecimalField(max_digits=6, decimal_places=2)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'leave_type'], name='leaveledger_user_type_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.user_id} {self.leave_type} {self.days:+}'
     
 
 class Performance(models.Model):
@@ -214,16 +370,98 @@ class WorkHours(models.Model):
     clock_out_time = models.DateTimeField(null=True, blank=True)
     total_hours = models.DecimalField(max_digits=5, decimal_places=2, default=0.00)  # Calculated as the difference between clock_in_time and clock_out_time
 
-    def calculate_total_hours(self):
+    class Meta:
+        indexes = [
+            # Date-range listings ordered by clock-in
+            models.Index(fields=['clock_in_time'], name='workhours_clock_in_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        self.compute_total_hours()
+        super().save(*args, **kwargs)
+
+    def compute_total_hours(self):
+        """Set total_hours from the clock-in/out times; recompute_work_hours does the same in SQL."""
         if self.clock_out_time:
-            time_diff = self.clock_out_time - self.clock_in_time
-            self.total_hours = time_diff.total_seconds() / 3600  # Convert seconds to hours
-            self.save()
+            worked_duration = (self.clock_out_time - self.clock_in_time).total_seconds() / 3600
+            self.total_hours = round(worked_duration, 2)
+        else:
+            self.total_hours = 0
 
     def __str__(self):
         return f"{self.user.username} - {self.total_hours} hours"
     
 
+class ActivityLog(models.Model):
+    """Append-only feed of attendance, task and leave events for the admin dashboard."""
+    KIND_CHOICES = (
+        ('attendance', 'Attendance'),
+        ('task', 'Task'),
+        ('leave', 'Leave'),
+    )
+    created_at = models.DateTimeField(default=timezone.now)
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    user = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True)
+    action = models.CharField(max_length=255)
+    details = models.CharField(max_length=255, blank=True)
+    object_id = models.PositiveIntegerField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            # Keyset cursor for the feed: (created_at, id) > (t, n)
+            models.Index(fields=['created_at', 'id'], name='activitylog_cursor_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.kind}: {self.action}'
+
+
+class Notification(models.Model):
+    """Admin notification, created when a request needs attention rather than on read."""
+    KIND_CHOICES = (
+        ('leave', 'Leave'),
+        ('task', 'Task'),
+        ('attendance', 'Attendance'),
+    )
+    STATUS_CHOICES = (
+        ('pending', 'Pending'),
+        ('warning', 'Warning'),
+        ('resolved', 'Resolved'),
+    )
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES)
+    title = models.CharField(max_length=100)
+    message = models.CharField(max_length=255)
+    object_id = models.PositiveIntegerField()
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            # Newest-first pages, optionally by status
+            models.Index(fields=['created_at', 'id'], name='notification_created_idx'),
+            # Resolving the notifications of a leave request or task
+            models.Index(fields=['kind', 'object_id'], name='notification_object_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.title}: {self.message}'
+
+
+class NotificationRead(models.Model):
+    """Per-admin read marker; a notification without one is unread for that admin."""
+    notification = models.ForeignKey(Notification, on_delete=models.CASCADE)
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    read_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'notification'], name='notificationread_user_uniq'),
+        ]
+
+    def __str__(self):
+        return f'{self.user_id} read {self.notification_id}'
+
+
 class PerformanceReview(models.Model):
     employee = models.ForeignKey('Employee', on_delete=models.CASCADE)
     review_date = models.DateField()
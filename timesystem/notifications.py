@@ -0,0 +1,153 @@
+from datetime import time
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from .models import ClockInRecord, Employee, LeaveRequest, Notification, NotificationRead, Task
+
+DEFAULT_NOTIFICATIONS = {
+    'LATE_ARRIVAL_FROM': time(10, 0),  # Local clock-in time from which an arrival counts as late
+}
+
+
+def get_notification_settings():
+    config = dict(DEFAULT_NOTIFICATIONS)
+    config.update(getattr(settings, 'NOTIFICATIONS', {}))
+    return config
+
+
+def _display_name(first_name, last_name, username):
+    return f'{first_name} {last_name}'.strip() or username
+
+
+def _user_name(user_id):
+    row = User.objects.filter(pk=user_id).values_list('first_name', 'last_name', 'username').first()
+    return _display_name(*row) if row else 'Someone'
+
+
+def _employee_name(employee_id):
+    row = Employee.objects.filter(pk=employee_id).values_list(
+        'user__first_name', 'user__last_name', 'user__username'
+    ).first()
+    return _display_name(*row) if row else 'Someone'
+
+
+def resolve_notifications(kind, object_id):
+    Notification.objects.filter(kind=kind, object_id=object_id, status='pending').update(status='resolved')
+
+
+def is_late_arrival(time_clocked_in):
+    return timezone.localtime(time_clocked_in).time() >= get_notification_settings()['LATE_ARRIVAL_FROM']
+
+
+def late_arrival_notification(record, username):
+    clockin_time = timezone.localtime(record.time_clocked_in).strftime('%H:%M:%S')
+    return Notification(
+        kind='attendance', status='warning', title='Late Arrival', object_id=record.pk,
+        message=f'{username} clocked in late at {clockin_time}',
+    )
+
+
+def notify_late_arrivals(records):
+    """Flag late clock-ins once they commit; also called by bulk paths that skip post_save.
+
+    Deferred so the clock-in transaction stays a single insert.
+    """
+    late = [record for record in records if is_late_arrival(record.time_clocked_in)]
+    if not late:
+        return
+
+    def create():
+        usernames = dict(User.objects.filter(pk__in={record.user_id for record in late}).values_list('id', 'username'))
+        Notification.objects.bulk_create(
+            late_arrival_notification(record, usernames.get(record.user_id, 'Someone')) for record in late
+        )
+
+    transaction.on_commit(create, robust=True)
+
+
+def notify_clock_in(sender, instance, created, raw=False, **kwargs):
+    if raw or not created:
+        return
+    notify_late_arrivals([instance])
+
+
+def notify_leave_request(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    if created:
+        if instance.status == 'PENDING':
+            Notification.objects.create(
+                kind='leave', status='pending', title='Leave Request', object_id=instance.pk,
+                message=f'{_user_name(instance.user_id)} requested {instance.leave_type} leave',
+            )
+    elif instance.loaded_value('status', instance.status) == 'PENDING' and instance.status != 'PENDING':
+        resolve_notifications('leave', instance.pk)
+
+
+def notify_task(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    previous = None if created else instance.loaded_value('status', instance.status)
+    if previous == instance.status:
+        return
+    if instance.status == 'awaiting_approval':
+        user_name = _employee_name(instance.assigned_to_id) if instance.assigned_to_id else 'Someone'
+        Notification.objects.create(
+            kind='task', status='pending', title='Task Approval', object_id=instance.pk,
+            message=f'Task "{instance.name}" by {user_name} needs approval',
+        )
+    elif previous == 'awaiting_approval':
+        resolve_notifications('task', instance.pk)
+
+
+# model -> post_save handler; bulk paths call notify_late_arrivals() themselves
+NOTIFICATION_HANDLERS = {
+    ClockInRecord: notify_clock_in,
+    LeaveRequest: notify_leave_request,
+    Task: notify_task,
+}
+
+
+def notifications_for(user):
+    """Notifications newest first, each annotated with whether ``user`` has read it."""
+    return Notification.objects.annotate(
+        read=Exists(NotificationRead.objects.filter(notification=OuterRef('pk'), user=user))
+    )
+
+
+def notification_row(notification):
+    return {
+        'id': notification.id,
+        'type': notification.kind,
+        'object_id': notification.object_id,
+        'title': notification.title,
+        'message': notification.message,
+        'timestamp': notification.created_at,
+        'status': notification.status,
+        'read': notification.read,
+    }
+
+
+def mark_read(user, notification_ids):
+    """Mark notifications read for ``user``; already-read ones are left alone. Returns the ids marked."""
+    ids = list(
+        Notification.objects.filter(pk__in=notification_ids)
+        .exclude(notificationread__user=user)
+        .values_list('id', flat=True)
+    )
+    NotificationRead.objects.bulk_create(
+        [NotificationRead(notification_id=pk, user=user) for pk in ids], ignore_conflicts=True,
+    )
+    return ids
+
+
+def mark_all_read(user):
+    ids = list(notifications_for(user).filter(read=False).values_list('id', flat=True))
+    NotificationRead.objects.bulk_create(
+        [NotificationRead(notification_id=pk, user=user) for pk in ids], ignore_conflicts=True, batch_size=1000,
+    )
+    return ids
@@ -0,0 +1,92 @@
+from rest_framework.pagination import CursorPagination, LimitOffsetPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class TimeOrderedCursorPagination(CursorPagination):
+    """Keyset pagination over a timestamp column.
+
+    Pagination only kicks in when the client asks for a page size, so existing
+    callers that expect a plain list keep working.
+    """
+    page_size = None
+    page_size_query_param = 'limit'
+    max_page_size = 500
+    ordering = '-created_at'
+
+
+class TimesheetPagination(TimeOrderedCursorPagination):
+    ordering = 'time_clocked_in'
+
+
+class ClockInPagination(TimeOrderedCursorPagination):
+    ordering = ('-time_clocked_in', '-id')
+
+
+class LeaveRequestPagination(TimeOrderedCursorPagination):
+    ordering = ('-created_at', '-id')
+
+
+class WorkHoursPagination(TimeOrderedCursorPagination):
+    ordering = ('-clock_in_time', '-id')
+
+
+class NotificationPagination(TimeOrderedCursorPagination):
+    # The backlog only grows, so this one always pages
+    page_size = 10
+    max_page_size = 100
+    ordering = ('-created_at', '-id')
+
+
+class BillableHoursPagination(TimeOrderedCursorPagination):
+    # Invoicing pulls hundreds of thousands of rows, so this one always pages
+    page_size = 100
+    ordering = ('start_time', 'id')
+
+
+class ReferencePagination(LimitOffsetPagination):
+    """Limit/offset pagination for small reference tables; opt-in via ?limit=.
+
+    ``?count=false`` skips the ``COUNT(*)``: one extra row is fetched to tell
+    whether there is a next page and the response has no ``count``.
+    """
+    default_limit = None
+    max_limit = 500
+    count_query_param = 'count'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if request.query_params.get(self.count_query_param, '').lower() not in ('false', '0'):
+            return super().paginate_queryset(queryset, request, view)
+
+        self.limit = self.get_limit(request)
+        if self.limit is None:
+            return None
+        self.offset = self.get_offset(request)
+        self.count = None
+        self.request = request
+        rows = list(queryset[self.offset:self.offset + self.limit + 1])
+        self.has_next = len(rows) > self.limit
+        return rows[:self.limit]
+
+    def get_next_link(self):
+        if self.count is not None:
+            return super().get_next_link()
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        url = replace_query_param(url, self.limit_query_param, self.limit)
+        return replace_query_param(url, self.offset_query_param, self.offset + self.limit)
+
+    def get_paginated_response(self, data):
+        if self.count is not None:
+            return super().get_paginated_response(data)
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+
+class ProjectPagination(ReferencePagination):
+    """Pages over projects for grouped reports."""
+    max_limit = 100
@@ -0,0 +1,209 @@
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_SQL_PROFILER = {
+    'ENABLED': True,
+    'N_PLUS_ONE_THRESHOLD': 10,   # Same fingerprint more often than this in one request is flagged
+    'MAX_FINGERPRINTS': 1000,     # (view, fingerprint) pairs kept; least recently used are evicted
+    'STATEMENT_CHARS': 1000,      # Length kept for the slowest statement sample
+}
+
+
+def get_sql_profiler_settings():
+    config = dict(DEFAULT_SQL_PROFILER)
+    config.update(getattr(settings, 'SQL_PROFILER', {}))
+    return config
+
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER = re.compile(r"%s|\?")
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def fingerprint(sql):
+    """Normalize a statement so queries differing only in literals group together."""
+    sql = _STRING_LITERAL.sub('?', sql)
+    sql = _NUMBER_LITERAL.sub('?', sql)
+    sql = _PLACEHOLDER.sub('?', sql)
+    sql = _IN_LIST.sub('(...)', sql)
+    return _WHITESPACE.sub(' ', sql).strip()
+
+
+class QueryStats:
+    __slots__ = ('count', 'total_time', 'slowest_time', 'slowest_sql', 'n_plus_one_requests')
+
+    def __init__(self):
+        self.count = 0
+        self.total_time = 0.0
+        self.slowest_time = 0.0
+        self.slowest_sql = ''
+        self.n_plus_one_requests = 0
+
+    def add(self, duration, sql):
+        self.count += 1
+        self.total_time += duration
+        if duration >= self.slowest_time:
+            self.slowest_time = duration
+            self.slowest_sql = sql
+
+    def merge(self, other):
+        self.count += other.count
+        self.total_time += other.total_time
+        if other.slowest_time >= self.slowest_time:
+            self.slowest_time = other.slowest_time
+            self.slowest_sql = other.slowest_sql
+
+    def as_dict(self):
+        return {
+            'count': self.count,
+            'total_time_ms': round(self.total_time * 1000, 3),
+            'avg_time_ms': round(self.total_time * 1000 / self.count, 3) if self.count else 0,
+            'slowest_time_ms': round(self.slowest_time * 1000, 3),
+            'slowest_sql': self.slowest_sql,
+            'n_plus_one_requests': self.n_plus_one_requests,
+        }
+
+
+class RequestQueryRecorder:
+    """execute_wrapper hook collecting per-fingerprint stats for a single request."""
+
+    def __init__(self, statement_chars):
+        self.statement_chars = statement_chars
+        self.queries = {}
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - started
+            key = fingerprint(sql)
+            stats = self.queries.get(key)
+            if stats is None:
+                stats = self.queries[key] = QueryStats()
+            stats.add(duration, sql[:self.statement_chars])
+
+
+class SQLProfile:
+    """Process-wide rolling aggregates keyed by (view, fingerprint)."""
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._requests = {}
+        self._lock = threading.Lock()
+
+    def record(self, view_name, recorder, n_plus_one_threshold):
+        flagged = []
+        with self._lock:
+            self._requests[view_name] = self._requests.get(view_name, 0) + 1
+            for key, request_stats in recorder.queries.items():
+                entry_key = (view_name, key)
+                stats = self._entries.get(entry_key)
+                if stats is None:
+                    stats = self._entries[entry_key] = QueryStats()
+                else:
+                    self._entries.move_to_end(entry_key)
+                stats.merge(request_stats)
+                if request_stats.count > n_plus_one_threshold:
+                    stats.n_plus_one_requests += 1
+                    flagged.append((key, request_stats.count))
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return flagged
+
+    def snapshot(self, view_name=None):
+        with self._lock:
+            items = [
+                (key, stats.as_dict())
+                for key, stats in self._entries.items()
+                if view_name is None or key[0] == view_name
+            ]
+            requests = dict(self._requests)
+
+        views = {}
+        for (view, key), stats in items:
+            view_data = views.setdefault(view, {
+                'view': view,
+                'requests': requests.get(view, 0),
+                'queries': 0,
+                'total_time_ms': 0,
+                'fingerprints': [],
+            })
+            view_data['queries'] += stats['count']
+            view_data['total_time_ms'] = round(view_data['total_time_ms'] + stats['total_time_ms'], 3)
+            view_data['fingerprints'].append(dict(stats, fingerprint=key))
+
+        for view_data in views.values():
+            view_data['fingerprints'].sort(key=lambda item: item['total_time_ms'], reverse=True)
+        return sorted(views.values(), key=lambda item: item['total_time_ms'], reverse=True)
+
+    def reset(self):
+        with self._lock:
+            self._entries.clear()
+            self._requests.clear()
+
+
+sql_profile = SQLProfile(get_sql_profiler_settings()['MAX_FINGERPRINTS'])
+
+
+@contextmanager
+def instrument_connections(recorder):
+    """Route every statement on every database connection through ``recorder``."""
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(recorder))
+        yield recorder
+
+
+# Recorder of the ASGI request running in this context. sync_to_async copies
+# the context into the worker thread that runs sync views and async ORM calls,
+# so the dispatcher below finds it there.
+_current_recorder = ContextVar('sql_profile_recorder', default=None)
+
+
+def _dispatch(execute, sql, params, many, context):
+    recorder = _current_recorder.get()
+    if recorder is None:
+        return execute(sql, params, many, context)
+    return recorder(execute, sql, params, many, context)
+
+
+def install_dispatcher():
+    """Add the context-aware wrapper to this thread's connections, once each."""
+    for connection in connections.all():
+        if _dispatch not in connection.execute_wrappers:
+            connection.execute_wrappers.append(_dispatch)
+
+
+@contextmanager
+def recording(recorder):
+    """Send statements reaching the dispatcher in this context to ``recorder``."""
+    token = _current_recorder.set(recorder)
+    try:
+        yield recorder
+    finally:
+        _current_recorder.reset(token)
+
+
+def record_request(view_name, recorder):
+    if not recorder.queries:
+        return
+    config = get_sql_profiler_settings()
+    flagged = sql_profile.record(view_name, recorder, config['N_PLUS_ONE_THRESHOLD'])
+    for key, count in flagged:
+        logger.warning("Possible N+1 in %s: %d executions of %s", view_name, count, key)
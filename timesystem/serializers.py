@@ -71,7 +71,7 @@ class ProjectSerializer(serializers.ModelSerializer):
 class TaskSerializer(serializers.ModelSerializer):
     class Meta:
         model = Task
-        fields = ['id', 'name', 'description', 'due_date', 'status', 'assigned_to']
+        fields = ['id', 'name', 'description', 'due_date', 'status', 'assigned_to', 'updated_at']
 
     def update(self, instance, validated_data):
         for attr, value in validated_data.items():
@@ -140,6 +140,8 @@ class WorkHoursSerializer(serializers.ModelSerializer):
     class Meta:
         model = WorkHours
         fields = '__all__'
+        # Computed by WorkHours.save() from the clock-in/out times
+        read_only_fields = ['total_hours']
 
 
 class PerformanceReviewSerializer(serializers.ModelSerializer):
@@ -0,0 +1,40 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+
+from .activity import ACTIVITY_HANDLERS
+from .attendance import refresh_attendance_for_shift
+from .authentication import invalidate_cached_user
+from .conditional import VERSIONED_MODELS, bump_model_version
+from .models import ClockInRecord, Task, TrackedFieldsMixin, remember_stored_values
+from .notifications import NOTIFICATION_HANDLERS
+from .statistics import STATISTICS_MODELS, invalidate_statistics
+from .task_feed import record_deletion, record_reassignment
+
+post_save.connect(invalidate_cached_user, sender=get_user_model(), dispatch_uid='jwt-user-cache-save')
+post_delete.connect(invalidate_cached_user, sender=get_user_model(), dispatch_uid='jwt-user-cache-delete')
+
+# Clock-outs and admin edits or deletes of a shift; the batch endpoint bulk-writes and refreshes itself
+post_save.connect(refresh_attendance_for_shift, sender=ClockInRecord, dispatch_uid='daily-attendance-save')
+post_delete.connect(refresh_attendance_for_shift, sender=ClockInRecord, dispatch_uid='daily-attendance-delete')
+
+post_save.connect(record_reassignment, sender=Task, dispatch_uid='task-removal-save')
+post_delete.connect(record_deletion, sender=Task, dispatch_uid='task-removal-delete')
+
+for model in STATISTICS_MODELS:
+    post_save.connect(invalidate_statistics, sender=model, dispatch_uid=f'statistics-save-{model.__name__}')
+    post_delete.connect(invalidate_statistics, sender=model, dispatch_uid=f'statistics-delete-{model.__name__}')
+
+for model in VERSIONED_MODELS:
+    post_save.connect(bump_model_version, sender=model, dispatch_uid=f'model-version-save-{model.__name__}')
+    post_delete.connect(bump_model_version, sender=model, dispatch_uid=f'model-version-delete-{model.__name__}')
+
+for model, handler in ACTIVITY_HANDLERS.items():
+    post_save.connect(handler, sender=model, dispatch_uid=f'activity-save-{model.__name__}')
+
+for model, handler in NOTIFICATION_HANDLERS.items():
+    post_save.connect(handler, sender=model, dispatch_uid=f'notification-save-{model.__name__}')
+
+# Last, so the handlers above still see the values loaded before the save
+for model in {*ACTIVITY_HANDLERS, *NOTIFICATION_HANDLERS}:
+    if issubclass(model, TrackedFieldsMixin):
+        post_save.connect(remember_stored_values, sender=model, dispatch_uid=f'stored-values-{model.__name__}')
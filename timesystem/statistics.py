@@ -0,0 +1,128 @@
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connection, transaction
+from django.db.models import F, Func
+from django.utils import timezone
+
+from .models import ClockInRecord, DailyAttendance, Employee, LeaveBalance, LeaveRequest, Project, Task
+from .utils import today_bounds
+
+DEFAULT_STATISTICS_CACHE = {
+    'ALIAS': 'default',  # Any configured cache: locmem, file-based, Redis, ...
+    'TTL': 30,           # Seconds; writes to STATISTICS_MODELS invalidate earlier
+}
+
+STATISTICS_CACHE_KEY = 'dashboard-statistics'
+TWO_PLACES = Decimal('0.01')
+
+# Models whose writes invalidate the counters below. Clock-ins are left to the
+# TTL: every clock-in and clock-out would otherwise empty the cache at shift start.
+STATISTICS_MODELS = (Employee, Project, Task, LeaveRequest, LeaveBalance)
+
+
+def get_statistics_cache_settings():
+    config = dict(DEFAULT_STATISTICS_CACHE)
+    config.update(getattr(settings, 'STATISTICS_CACHE', {}))
+    return config
+
+
+def _cache():
+    return caches[get_statistics_cache_settings()['ALIAS']]
+
+
+def _cache_key():
+    # "Today" counters roll over at midnight even without any write
+    return f'{STATISTICS_CACHE_KEY}:{timezone.localdate().isoformat()}'
+
+
+def _aggregate(queryset, function, field='pk'):
+    """``queryset`` reduced to a one-value subquery: ``function`` (COUNT, SUM) of ``field``."""
+    return queryset.order_by().annotate(value=Func(F(field), function=function)).values('value')
+
+
+def _select(subqueries):
+    """Evaluate ``{name: one-value queryset}`` in a single SELECT of scalar subqueries."""
+    columns, params = [], []
+    for queryset in subqueries.values():
+        sql, query_params = queryset.query.get_compiler(connection=connection).as_sql()
+        columns.append(f'({sql})')
+        params.extend(query_params)
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT {', '.join(columns)}", params)
+        return dict(zip(subqueries, cursor.fetchone()))
+
+
+def _days(value):
+    # Raw SUMs of DecimalFields come back as floats on some backends
+    return Decimal(str(value)).quantize(TWO_PLACES) if value is not None else 0
+
+
+def compute_statistics():
+    """Compute every dashboard counter in one round trip.
+
+    Each counter is its own scalar subquery filtered on the stored values, so
+    the status and time indexes narrow them instead of one scan per table.
+    """
+    today_start, today_end = today_bounds()
+    tasks = Task.objects.all()
+    leaves = LeaveRequest.objects.all()
+    clockins = ClockInRecord.objects.all()
+
+    row = _select({
+        'employees': _aggregate(Employee.objects.all(), 'COUNT'),
+        'projects': _aggregate(Project.objects.all(), 'COUNT'),
+        'tasks.total': _aggregate(tasks, 'COUNT'),
+        'tasks.pending': _aggregate(tasks.filter(status='pending'), 'COUNT'),
+        'tasks.in_progress': _aggregate(tasks.filter(status='in_progress'), 'COUNT'),
+        'tasks.completed': _aggregate(tasks.filter(status='completed'), 'COUNT'),
+        'tasks.awaiting_approval': _aggregate(tasks.filter(status='awaiting_approval'), 'COUNT'),
+        'leave_requests.total': _aggregate(leaves, 'COUNT'),
+        'leave_requests.pending': _aggregate(leaves.filter(status='PENDING'), 'COUNT'),
+        'leave_requests.approved': _aggregate(leaves.filter(status='APPROVED'), 'COUNT'),
+        'leave_requests.rejected': _aggregate(leaves.filter(status='REJECTED'), 'COUNT'),
+        'clockins.total': _aggregate(clockins, 'COUNT'),
+        'clockins.today': _aggregate(
+            clockins.filter(time_clocked_in__gte=today_start, time_clocked_in__lt=today_end), 'COUNT',
+        ),
+        'clockins.active': _aggregate(clockins.filter(time_clocked_out__isnull=True), 'COUNT'),
+        # Average per completed shift, read from the per-day rollup rather than every shift
+        'attendance.hours': _aggregate(DailyAttendance.objects.all(), 'SUM', 'worked_hours'),
+        'attendance.shifts': _aggregate(DailyAttendance.objects.all(), 'SUM', 'shift_count'),
+        **{
+            f'leave_balances.{field}': _aggregate(LeaveBalance.objects.all(), 'SUM', field)
+            for field in ('annual', 'sick', 'casual', 'maternity')
+        },
+    })
+
+    stats = {}
+    for name, value in row.items():
+        section, _, counter = name.partition('.')
+        if counter:
+            stats.setdefault(section, {})[counter] = value
+        else:
+            stats[section] = value
+
+    attendance = stats.pop('attendance')
+    stats['clockins']['average_hours_worked'] = (
+        float(attendance['hours']) / attendance['shifts'] if attendance['shifts'] else None
+    )
+    stats['leave_balances'] = {key: _days(value) for key, value in stats['leave_balances'].items()}
+    return stats
+
+
+def get_statistics():
+    """Return the cached dashboard counters, computing them on a miss."""
+    cache = _cache()
+    key = _cache_key()
+    stats = cache.get(key)
+    if stats is None:
+        stats = compute_statistics()
+        cache.set(key, stats, get_statistics_cache_settings()['TTL'])
+    return stats
+
+
+def invalidate_statistics(**kwargs):
+    """Drop the cached counters once the current transaction commits (signal-compatible)."""
+    transaction.on_commit(lambda: _cache().delete(_cache_key()))
@@ -0,0 +1,87 @@
+"""Per-user task queries behind the home page and "my tasks" lists.
+
+Everything filters on ``assigned_to`` first so task_assignee_due_idx and
+task_assignee_updated_idx narrow the scan to the caller's own tasks.
+Incremental callers also get the ids of tasks that left their list, from
+the TaskRemoval tombstones written when a task is deleted or reassigned.
+"""
+from django.db.models import Q
+from rest_framework.exceptions import ValidationError
+
+from .models import Employee, Task, TaskRemoval
+from .utils import parse_datetime_param, today_bounds
+
+# Shown on the home page whatever their due date
+OPEN_STATUSES = ('pending', 'awaiting_approval')
+
+
+def employee_id_for(request):
+    """The caller's Employee id, or None; looked up at most once per request."""
+    if not hasattr(request, '_employee_id'):
+        request._employee_id = Employee.objects.filter(user=request.user).values_list('id', flat=True).first()
+    return request._employee_id
+
+
+def due_today_or_open():
+    # A half-open range rather than due_date__date, so the index applies
+    today_start, today_end = today_bounds()
+    return Q(due_date__gte=today_start, due_date__lt=today_end) | Q(status__in=OPEN_STATUSES)
+
+
+def updated_since(request):
+    """``?updated_since=`` as an aware datetime, or None when absent."""
+    value = request.query_params.get('updated_since')
+    if not value:
+        return None
+    try:
+        return parse_datetime_param(value)
+    except ValueError as e:
+        raise ValidationError({'error': str(e)})
+
+
+def tasks_for(request):
+    """The caller's tasks, only those changed after ``?updated_since=`` when given.
+
+    Incremental callers pass the largest ``updated_at`` they hold and drop
+    the ids from removed_since().
+    """
+    employee_id = employee_id_for(request)
+    if employee_id is None:
+        return Task.objects.none()
+    tasks = Task.objects.filter(assigned_to_id=employee_id)
+    since = updated_since(request)
+    if since is not None:
+        tasks = tasks.filter(updated_at__gt=since)
+    return tasks.order_by('due_date', 'id')
+
+
+def removed_since(request, since, visible=None):
+    """Ids of tasks that left the caller's list after ``since``.
+
+    Covers tasks deleted or reassigned away and, when ``visible`` narrows the
+    list, the caller's own tasks that changed and no longer match it.
+    """
+    employee_id = employee_id_for(request)
+    if employee_id is None:
+        return []
+    removed = set(TaskRemoval.objects.filter(employee_id=employee_id, removed_at__gt=since).values_list('task_id', flat=True))
+    tasks = Task.objects.filter(assigned_to_id=employee_id)
+    if visible is not None:
+        removed.update(tasks.filter(updated_at__gt=since).exclude(visible).values_list('id', flat=True))
+        tasks = tasks.filter(visible)
+    # Reassigned back, or changed back into view: listed with the updated tasks instead
+    removed.difference_update(tasks.filter(id__in=removed).values_list('id', flat=True))
+    return sorted(removed)
+
+
+def record_reassignment(sender, instance, created, **kwargs):
+    """post_save receiver: tombstone the task for the employee it was taken from."""
+    previous = None if created else instance.loaded_value('assigned_to_id', instance.assigned_to_id)
+    if previous is not None and previous != instance.assigned_to_id:
+        TaskRemoval.objects.create(employee_id=previous, task_id=instance.pk)
+
+
+def record_deletion(sender, instance, **kwargs):
+    """post_delete receiver: tombstone the task for its assignee."""
+    if instance.assigned_to_id is not None:
+        TaskRemoval.objects.create(employee_id=instance.assigned_to_id, task_id=instance.pk)
@@ -3,6 +3,7 @@ from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 from rest_framework_simplejwt import views as jwt_views
 
+from . import async_views
 from .views import (
     CustomTokenObtainPairView,
     SimpleAuthView,
@@ -25,8 +26,7 @@ from .views import (
     clock_out,
     take_break,
     end_break,
-    check_active_break,
-    check_active_clock_in,
+    clock_events_batch,
 
     # Task Views
     UserTaskListView,
@@ -34,8 +34,6 @@ from .views import (
     TodayTasksView,
 
     # Timesheet Views
-    ClockInStatusView,
-    TodayHoursWorkedView,
     TimesheetView,
 
     # Leave
@@ -46,6 +44,8 @@ from .views import (
     AdminDashboardChartsView,
     AdminDashboardRecentActivityView,
     AdminDashboardNotificationsView,
+    AdminNotificationsReadView,
+    SQLProfileView,
 )
 
 # Set up router
@@ -68,6 +68,11 @@ urlpatterns = [
     path('api/token/obtain/', CustomTokenObtainPairView.as_view(), name='token_obtain_pair'),
     path('api/token/refresh/', jwt_views.TokenRefreshView.as_view(), name='token_refresh'),
 
+    # Tasks; before the router, whose tasks/<pk>/ route would swallow user/ and today/
+    path('api/tasks/user/', UserTaskListView.as_view(), name='user-tasks'),
+    path('api/tasks/<int:pk>/update/', TaskUpdateView.as_view(), name='task-update'),
+    path('api/tasks/today/', TodayTasksView.as_view(), name='today-tasks'),
+
     # Main API routes
     path('api/', include(router.urls)),
 
@@ -76,28 +81,31 @@ urlpatterns = [
     path('api/clock-out/', clock_out, name='clock_out'),
     path('api/take-break/', take_break, name='take_break'),
     path('api/end-break/', end_break, name='end_break'),
-    path('api/check-active-break/', check_active_break, name='check_active_break'),
-    path('api/check-active-clockin/', check_active_clock_in, name='check_active_clockin'),
-
-    # Tasks
-    path('api/tasks/user/', UserTaskListView.as_view(), name='user-tasks'),
-    path('api/tasks/<int:pk>/update/', TaskUpdateView.as_view(), name='task-update'),
-    path('api/tasks/today/', TodayTasksView.as_view(), name='today-tasks'),
+    # Polled on every page load; async so they do not tie up a worker thread under ASGI
+    path('api/check-active-break/', async_views.check_active_break, name='check_active_break'),
+    path('api/check-active-clockin/', async_views.check_active_clock_in, name='check_active_clockin'),
+    path('api/clock-events/batch/', clock_events_batch, name='clock_events_batch'),
+    # Server-sent events; needs an ASGI server
+    path('api/event-streams/ticket/', async_views.stream_ticket, name='stream-ticket'),
+    path('api/clock-events/stream/', async_views.clock_event_stream, name='clock_events_stream'),
 
     # Timesheet
-    path('api/clockin-status/', ClockInStatusView.as_view(), name='clockin-status'),
-    path('api/timesheet/today/', TodayHoursWorkedView.as_view(), name='today-worked-hours'),
+    path('api/clockin-status/', async_views.clock_in_status, name='clockin-status'),
+    path('api/timesheet/today/', async_views.today_hours_worked, name='today-worked-hours'),
+    path('api/home-snapshot/', async_views.home_snapshot, name='home-snapshot'),
     path('api/timesheet/', TimesheetView.as_view(), name='timesheet'),
 
     # Leave
     path('api/leave-balance/', LeaveBalanceView.as_view(), name='leave-balance'),
 
     # Admin Dashboard (your custom admin views)
-    path('api/tasks/today/', TodayTasksView.as_view(), name='today-tasks'),
     path('admin-dashboard/api/statistics/', AdminDashboardStatisticsView.as_view()),
     path('admin-dashboard/api/charts/', AdminDashboardChartsView.as_view()),
     path('admin-dashboard/api/activity/', AdminDashboardRecentActivityView.as_view()),
-    path('admin-dashboard/api/notifications/', AdminDashboardNotificationsView.as_view()),
+    path('admin-dashboard/api/activity/stream/', async_views.activity_stream, name='activity-stream'),
+    path('admin-dashboard/api/notifications/', AdminDashboardNotificationsView.as_view(), name='admin-notifications'),
+    path('admin-dashboard/api/notifications/read/', AdminNotificationsReadView.as_view(), name='admin-notifications-read'),
+    path('admin-dashboard/api/sql-profile/', SQLProfileView.as_view(), name='sql-profile'),
 
     
     # Admin dashboard routes (if more views in separate app)
@@ -0,0 +1,40 @@
+from datetime import datetime, time, timedelta
+
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+
+def day_bounds(day):
+    """Return the half-open [start, end) datetimes covering ``day`` in the current time zone.
+
+    Filtering on ``field__gte=start, field__lt=end`` can use an index on the
+    column, unlike ``field__date=day``.
+    """
+    start = timezone.make_aware(datetime.combine(day, time.min))
+    return start, start + timedelta(days=1)
+
+
+def today_bounds():
+    return day_bounds(timezone.localdate())
+
+
+def parse_date_param(value):
+    """Parse a YYYY-MM-DD query parameter, raising ValueError on bad input."""
+    parsed = parse_date(value)
+    if parsed is None:
+        raise ValueError(f"Invalid date '{value}', expected YYYY-MM-DD.")
+    return parsed
+
+
+def parse_datetime_param(value):
+    """Parse an ISO 8601 timestamp query parameter, raising ValueError on bad input.
+
+    Naive values are taken to be in the current time zone.
+    """
+    # An unescaped '+' in the UTC offset arrives as a space
+    parsed = parse_datetime(value.replace(' ', '+'))
+    if parsed is None:
+        raise ValueError(f"Invalid timestamp '{value}', expected ISO 8601.")
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
@@ -1,4 +1,5 @@
 from rest_framework import viewsets, response, status
+from django.conf import settings
 from django.utils import timezone
 from datetime import timedelta,datetime
 from rest_framework.permissions import IsAuthenticated
@@ -8,9 +9,9 @@ from rest_framework.authtoken.models import Token
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from django.contrib.auth.models import User
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, authentication_classes, permission_classes
 from rest_framework import viewsets, permissions
-from rest_framework.permissions import AllowAny
+from rest_framework.permissions import AllowAny, IsAdminUser
 from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.views import TokenObtainPairView
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
@@ -20,8 +21,23 @@ from django.contrib.auth.decorators import login_required
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 from rest_framework.exceptions import ValidationError
-from django.db.models import Count, Sum, F, Q
+from django.db.models import Count, Sum, F, Q, Prefetch
 from django.db.models.functions import TruncDate
+from django.db import IntegrityError, transaction
+
+from .activity import START_CURSOR, activity_row, encode_cursor, entries_after, get_activity_feed_settings, latest_entries
+from .attendance import attendance_day, refresh_daily_attendance
+from .authentication import authentication_classes_for
+from .clock_batch import apply_clock_events
+from .conditional import ConditionalListMixin
+from .events import publish_clock_event
+from .leave_ledger import default_balances, sync_leave_request
+from .notifications import mark_all_read, mark_read, notification_row, notifications_for
+from .pagination import ClockInPagination, NotificationPagination, TimeOrderedCursorPagination, TimesheetPagination
+from .profiling import sql_profile
+from .statistics import get_statistics
+from .task_feed import due_today_or_open, removed_since, tasks_for, updated_since
+from .utils import day_bounds, parse_date_param
 
 
 from .models import (
@@ -32,6 +48,7 @@ from .models import (
     ClockInRecord,
     BreakRecord,
     ClockInRecord,
+    DailyAttendance,
     LeaveRequest,
     LeaveBalance,
     Department, Role,
@@ -54,6 +71,9 @@ from .serializers import (
 
 User = get_user_model()
 
+# Hot attendance endpoints run the JWT check only
+ATTENDANCE_AUTHENTICATION = authentication_classes_for('attendance')
+
 # Custom JWT Token Serializer
 class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
     @classmethod
@@ -67,11 +87,51 @@ class CustomTokenObtainPairView(TokenObtainPairView):
     serializer_class = CustomTokenObtainPairSerializer
 
 class EmployeeViewSet(viewsets.ModelViewSet):
-    queryset = Employee.objects.all()
+    """Employees with their user, department and role joined in.
+
+    ``?view=compact`` returns flat ids and names straight from ``values()``,
+    skipping the nested serializers, for directories and lookups.
+    """
+    queryset = Employee.objects.select_related('user', 'department', 'role')
     serializer_class = EmployeeSerializer
     permission_classes = [IsAuthenticated]
+    filter_fields = {
+        'department': ['exact', 'in'],
+        'role': ['exact', 'in'],
+        'is_active': ['exact'],
+        'hire_date': ['gte', 'lte'],
+    }
+    ordering_fields = ('id', 'hire_date', 'created_at')
+    ordering = ('id',)
+    compact_fields = ('id', 'user_id', 'department_id', 'role_id', 'hire_date', 'is_active')
+    compact_names = {
+        'username': F('user__username'),
+        'first_name': F('user__first_name'),
+        'last_name': F('user__last_name'),
+        'department_name': F('department__name'),
+        'role_title': F('role__title'),
+    }
+
+    def is_compact(self):
+        return self.request.method == 'GET' and self.request.query_params.get('view') == 'compact'
+
+    def get_queryset(self):
+        if self.is_compact():
+            return Employee.objects.values(*self.compact_fields, **self.compact_names)
+        return super().get_queryset()
+
+    def list(self, request, *args, **kwargs):
+        if not self.is_compact():
+            return super().list(request, *args, **kwargs)
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(list(page))
+        return Response(list(queryset))
 
     def retrieve(self, request, pk=None):
+        if self.is_compact():
+            return Response(self.get_object())
         try:
             employee = self.get_object()
             serializer = self.get_serializer(employee)
@@ -79,7 +139,7 @@ class EmployeeViewSet(viewsets.ModelViewSet):
         except Exception as e:
             return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
-class ProjectViewSet(viewsets.ModelViewSet):
+class ProjectViewSet(ConditionalListMixin, viewsets.ModelViewSet):
     queryset = Project.objects.all()
     serializer_class = ProjectSerializer
     permission_classes = [permissions.IsAuthenticated]
@@ -87,22 +147,83 @@ class ProjectViewSet(viewsets.ModelViewSet):
 class TimeEntryViewSet(viewsets.ModelViewSet):
     queryset = TimeEntry.objects.all()
     serializer_class = TimeEntrySerializer
+    pagination_class = TimeOrderedCursorPagination
+    filter_fields = {
+        'employee': ['exact'],
+        'task': ['exact'],
+        'is_billable': ['exact'],
+        'start_time': ['gte', 'lt'],
+    }
+    ordering_fields = ('start_time',)
+    ordering = ('-start_time', '-id')
 
 
 # Task ViewSet
 class TaskViewSet(viewsets.ModelViewSet):
     queryset = Task.objects.all()
     serializer_class = TaskSerializer
+    filter_fields = {
+        'status': ['exact', 'in'],
+        'project': ['exact'],
+        'assigned_to': ['exact'],
+        'due_date': ['gte', 'lt'],
+    }
+    ordering_fields = ('id', 'due_date', 'created_at')
+    ordering = ('id',)
 
 # Leave Request ViewSet
 class LeaveRequestViewSet(viewsets.ModelViewSet):
     queryset = LeaveRequest.objects.all()
     serializer_class = LeaveRequestSerializer
+    pagination_class = TimeOrderedCursorPagination
+    filter_fields = {
+        'user': ['exact'],
+        'status': ['exact', 'in'],
+        'leave_type': ['exact'],
+        'start_date': ['gte'],
+        'end_date': ['lte'],
+    }
+    ordering_fields = ('created_at', 'start_date')
+    ordering = ('-created_at', '-id')
+
+    # Keep the leave ledger in step with approvals
+    def perform_create(self, serializer):
+        with transaction.atomic():
+            sync_leave_request(serializer.save())
+
+    def perform_update(self, serializer):
+        with transaction.atomic():
+            sync_leave_request(serializer.save())
+
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            sync_leave_request(instance, deleting=True)
+            instance.delete()
 
 # Clock In Record ViewSet
 class ClockInRecordViewSet(viewsets.ModelViewSet):
+    authentication_classes = ATTENDANCE_AUTHENTICATION
     queryset = ClockInRecord.objects.all()
     serializer_class = ClockInRecordSerializer
+    pagination_class = ClockInPagination
+    filter_fields = {
+        'user': ['exact'],
+        'time_clocked_in': ['gte', 'lt'],
+        'time_clocked_out': ['isnull'],
+    }
+    date_range_field = 'time_clocked_in'
+    ordering_fields = ('time_clocked_in',)
+    ordering = ('-time_clocked_in', '-id')
+
+    def get_queryset(self):
+        # One query for the users and one for every page's breaks, whatever the page size
+        queryset = ClockInRecord.objects.select_related('user').prefetch_related(
+            Prefetch('breakrecord_set', queryset=BreakRecord.objects.order_by('time_started'))
+        )
+        # Employees only see their own attendance; clockin_user_time_idx serves both cases
+        if not self.request.user.is_staff:
+            queryset = queryset.filter(user=self.request.user)
+        return queryset
 
 # Existing Login Logic
 class LoginView(APIView):
@@ -144,20 +265,27 @@ class LoginView(APIView):
 
 # Clock-In Endpoint
 @api_view(['POST'])
+@authentication_classes(ATTENDANCE_AUTHENTICATION)
 @permission_classes([IsAuthenticated])
 def clock_in(request):
     user = request.user
-    # Check if the user already has an active clock-in record
-    active_clock_in = ClockInRecord.objects.filter(user=user, time_clocked_out__isnull=True).first()
-    
-    if active_clock_in:
-        return Response({'message': f'You are already clocked in at {active_clock_in.time_clocked_in}.'}, status=status.HTTP_400_BAD_REQUEST)
-    
-    record = ClockInRecord.objects.create(user=user)
+    # Insert straight away; the one-open-shift-per-user constraint rejects a
+    # second open record, so concurrent taps cannot both succeed.
+    try:
+        with transaction.atomic():
+            record = ClockInRecord.objects.create(user=user)
+    except IntegrityError:
+        active_clock_in = ClockInRecord.objects.filter(user=user, time_clocked_out__isnull=True).first()
+        if active_clock_in:
+            return Response({'message': f'You are already clocked in at {active_clock_in.time_clocked_in}.'}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({'message': 'You are already clocked in.'}, status=status.HTTP_400_BAD_REQUEST)
+
+    publish_clock_event(user.id, 'clock_in', record_id=record.id, time_clocked_in=record.time_clocked_in)
     return Response({'message': 'Clocked in successfully', 'record_id': record.id}, status=status.HTTP_201_CREATED)
 
 # Clock-Out Endpoint
 @api_view(['POST'])
+@authentication_classes(ATTENDANCE_AUTHENTICATION)
 @permission_classes([IsAuthenticated])
 def clock_out(request):
     print("Data received from frontend:", request.data)
@@ -179,6 +307,10 @@ def clock_out(request):
         worked_hours = (record.time_clocked_out - record.time_clocked_in).total_seconds() / 3600
         record.hours_worked = round(worked_hours, 2)
         record.save()
+        publish_clock_event(
+            record.user_id, 'clock_out', record_id=record.id,
+            time_clocked_out=record.time_clocked_out, hours_worked=record.hours_worked,
+        )
         
         response_data = {
             'message': 'Clocked out successfully',
@@ -192,36 +324,9 @@ def clock_out(request):
         return Response({'error': 'Record not found'}, status=status.HTTP_404_NOT_FOUND)
 
 
-# Check Active Break Endpoint
-@api_view(['GET'])
-@permission_classes([IsAuthenticated])
-def check_active_break(request):
-    record_id = request.query_params.get('record_id')
-    if not record_id:
-        return Response({'error': 'Record ID is required.'}, status=status.HTTP_400_BAD_REQUEST)
-
-    try:
-        # Check for an active break associated with the clock-in record
-        active_break = BreakRecord.objects.get(
-            clock_in_record__id=record_id,
-            clock_in_record__user=request.user,
-            time_ended__isnull=True
-        )
-        return Response({
-            'active': True,
-            'break_id': active_break.id,
-            'break_start_time': active_break.time_started,
-            'clock_in_record__id': active_break.clock_in_record_id,
-            'breakType':active_break.break_type,
-            'record_id':active_break.clock_in_record_id
-        }, status=status.HTTP_200_OK)
-
-    except BreakRecord.DoesNotExist:
-        # No active break found
-        return Response({'active': False}, status=status.HTTP_200_OK)
-
 # Start Break Endpoint
 @api_view(['POST'])
+@authentication_classes(ATTENDANCE_AUTHENTICATION)
 @permission_classes([IsAuthenticated])
 def take_break(request):
     record_id = request.data.get('record_id')
@@ -253,6 +358,10 @@ def take_break(request):
         break_notes=break_notes,
         time_started=timezone.now()
     )
+    publish_clock_event(
+        request.user.id, 'break_start', break_id=break_record.id, record_id=clock_in_record.id,
+        break_type=break_record.break_type, time_started=break_record.time_started,
+    )
     return Response({
         'message': 'Break started successfully',
         'break_id': break_record.id
@@ -260,6 +369,7 @@ def take_break(request):
 
 # End Break Endpoint
 @api_view(['POST'])
+@authentication_classes(ATTENDANCE_AUTHENTICATION)
 @permission_classes([IsAuthenticated])
 def end_break(request):
     break_id = request.data.get('break_id')
@@ -275,6 +385,11 @@ def end_break(request):
         )
         break_record.time_ended = timezone.now()
         break_record.save()
+        refresh_daily_attendance(request.user.id, attendance_day(break_record.clock_in_record))
+        publish_clock_event(
+            request.user.id, 'break_end', break_id=break_record.id,
+            record_id=break_record.clock_in_record_id, time_ended=break_record.time_ended,
+        )
         
         # Calculate the duration of the break
         duration = break_record.duration()
@@ -288,6 +403,32 @@ def end_break(request):
     except BreakRecord.DoesNotExist:
         return Response({'error': 'Break record not found or already ended'}, status=status.HTTP_404_NOT_FOUND)
 
+# Batch Clock Events Endpoint (kiosks and badge readers)
+@api_view(['POST'])
+@authentication_classes(ATTENDANCE_AUTHENTICATION)
+@permission_classes([IsAdminUser])
+def clock_events_batch(request):
+    events = request.data.get('events') if isinstance(request.data, dict) else None
+    if not isinstance(events, list) or not events:
+        return Response({'error': 'events must be a non-empty list.'}, status=status.HTTP_400_BAD_REQUEST)
+
+    limit = getattr(settings, 'CLOCK_EVENT_BATCH_LIMIT', 1000)
+    if len(events) > limit:
+        return Response({'error': f'At most {limit} events can be sent in one batch.'}, status=status.HTTP_400_BAD_REQUEST)
+
+    try:
+        results = apply_clock_events(events)
+    except IntegrityError:
+        # Another request opened a shift for one of these users mid-batch; nothing was applied
+        return Response({'error': 'Clock state changed while applying the batch. Please retry.'}, status=status.HTTP_409_CONFLICT)
+
+    return Response({
+        'applied': sum(1 for result in results if result['status'] == 'applied'),
+        'duplicate': sum(1 for result in results if result['status'] == 'duplicate'),
+        'rejected': sum(1 for result in results if result['status'] == 'rejected'),
+        'results': results,
+    }, status=status.HTTP_200_OK)
+
 # Sample Authenticated View
 class SimpleAuthView(APIView):
     permission_classes = [IsAuthenticated]
@@ -301,7 +442,15 @@ class UserTaskListView(generics.ListAPIView):
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
-        return Task.objects.filter(assigned_to=self.request.user)
+        return tasks_for(self.request)
+
+    def list(self, request, *args, **kwargs):
+        since = updated_since(request)
+        if since is None:
+            return super().list(request, *args, **kwargs)
+        # Incremental sync: changed tasks plus the ids to drop
+        serializer = self.get_serializer(self.get_queryset(), many=True)
+        return Response({'tasks': serializer.data, 'removed': removed_since(request, since)})
     
 
 class TaskUpdateView(APIView):
@@ -359,78 +508,74 @@ class TodayTasksView(APIView):
     serializer_class = TaskSerializer
 
     def get(self, request):
-        today = timezone.now().date()
-        tasks = Task.objects.filter(
-            Q(due_date__date=today) | Q(status__in=['pending', 'awaiting_approval'])
-        )
+        tasks = tasks_for(request).filter(due_today_or_open())
         serializer = self.serializer_class(tasks, many=True)
-        return Response(serializer.data)
-
-
-class ClockInStatusView(APIView):
-    permission_classes = [IsAuthenticated]
-
-    def get(self, request):
-        user = request.user
-        today = timezone.now().date()
-
-        # Query for a clock-in record with no clock-out for today
-        clock_in_record = ClockInRecord.objects.filter(user=user, time_clocked_out__isnull=True, time_clocked_in__date=today).first()
-
-        if clock_in_record:
-            # Return the clock-in time along with the clockedIn status
-            return Response({
-                'clockedIn': True,
-                'time_clocked_in': clock_in_record.time_clocked_in
-            })
-        else:
-            return Response({'clockedIn': False})
-        
-class TodayHoursWorkedView(APIView):
-    permission_classes = [IsAuthenticated]
+        since = updated_since(request)
+        if since is None:
+            return Response(serializer.data)
+        return Response({'tasks': serializer.data, 'removed': removed_since(request, since, due_today_or_open())})
 
-    def get(self, request):
-        user = request.user
-        hours_worked = ClockInRecord.get_today_hours(user)
-        return Response({"hoursWorked": hours_worked}, status=200)
-    
 
 class TimesheetView(APIView):
+    authentication_classes = ATTENDANCE_AUTHENTICATION
     permission_classes = [IsAuthenticated]  # Ensure user is authenticated
+    pagination_class = TimesheetPagination
 
     def get(self, request):
         user = request.user
-        date = request.query_params.get('date')  # Get the date parameter from the request
 
-        # Fetch clock-in records for the user
-        clock_in_records = ClockInRecord.objects.filter(user=user)
+        # Fetch clock-in records for the user; breaks come from a single prefetch query
+        clock_in_records = ClockInRecord.objects.filter(user=user).prefetch_related(
+            Prefetch('breakrecord_set', queryset=BreakRecord.objects.order_by('time_started'))
+        ).order_by('time_clocked_in', 'id')
 
-        # If a date is provided, filter clock-in records by that date
-        if date:
-            clock_in_records = clock_in_records.filter(time_clocked_in__date=date)
+        try:
+            clock_in_records = self.filter_by_dates(clock_in_records, request.query_params)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        # Keyset pagination over time_clocked_in when ?limit= is given
+        paginator = self.pagination_class()
+        page = paginator.paginate_queryset(clock_in_records, request, view=self)
+        records = page if page is not None else list(clock_in_records)
 
-        # Fetch breaks associated with the filtered clock-in records
-        break_records = BreakRecord.objects.filter(clock_in_record__in=clock_in_records)
+        # Serialize every break in one pass, then group them per clock-in in memory
+        breaks = [break_record for record in records for break_record in record.breakrecord_set.all()]
+        breaks_by_record = {}
+        for break_data in BreakRecordSerializer(breaks, many=True).data:
+            breaks_by_record.setdefault(break_data['clock_in_record'], []).append(break_data)
 
         # Create structured data for output
-        structured_data = []
-        for record in clock_in_records:
-            # Calculate duration
-            duration = self.calculate_duration(record.time_clocked_in, record.time_clocked_out)
-            # Get associated breaks
-            breaks = break_records.filter(clock_in_record=record)
-
-            # Append record data along with breaks
-            structured_data.append({
+        structured_data = [
+            {
                 'time_clocked_in': record.time_clocked_in.isoformat(),  # Return full ISO format
                 'time_clocked_out': record.time_clocked_out.isoformat() if record.time_clocked_out else None,
-                'duration': duration,
+                'duration': self.calculate_duration(record.time_clocked_in, record.time_clocked_out),
                 'notes': "N/A",  # Remove this or set to default as ClockInRecord has no notes field
-                'breaks': BreakRecordSerializer(breaks, many=True).data,
-            })
+                'breaks': breaks_by_record.get(record.id, []),
+            }
+            for record in records
+        ]
 
+        if page is not None:
+            return paginator.get_paginated_response(structured_data)
         return Response(structured_data)
 
+    def filter_by_dates(self, clock_in_records, params):
+        """Apply ?date= (single day) or ?from=/?to= (inclusive range) as index-friendly ranges."""
+        date = params.get('date')
+        if date:
+            start, end = day_bounds(parse_date_param(date))
+            return clock_in_records.filter(time_clocked_in__gte=start, time_clocked_in__lt=end)
+
+        date_from = params.get('from')
+        date_to = params.get('to')
+        if date_from:
+            clock_in_records = clock_in_records.filter(time_clocked_in__gte=day_bounds(parse_date_param(date_from))[0])
+        if date_to:
+            clock_in_records = clock_in_records.filter(time_clocked_in__lt=day_bounds(parse_date_param(date_to))[1])
+        return clock_in_records
+
     def calculate_duration(self, time_in, time_out):
         if time_out:
             # Calculate total duration in seconds
@@ -450,95 +595,30 @@ class TimesheetView(APIView):
         return "0m"  # Default if no time_out is available
 
 
-@api_view(['GET'])
-@permission_classes([IsAuthenticated])  # Require authentication
-def check_active_clock_in(request):
-    user = request.user  # Get the current logged-in user
-    print(f"Checking active clock-in for user ID: {user.id}")
-    try:
-        # Check if there's an active clock-in record for the user
-        active_clock_in = ClockInRecord.objects.filter(user=user, time_clocked_out__isnull=True).first()
-
-        if active_clock_in:
-            return Response({
-                'active': True,
-                'time_clocked_in': active_clock_in.time_clocked_in,
-                'record_id': active_clock_in.id,
-                'user_id': active_clock_in.user_id
-            }, status=status.HTTP_200_OK)
-        else:
-            return Response({'active': False, 'record_id': None}, status=status.HTTP_200_OK)  # Include record_id as None
-
-    except Exception as e:
-        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
-
 class LeaveBalanceView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        """Retrieve the user's leave balance, calculating any approved leave deductions."""
-        user = request.user
-        leave_balance, created = LeaveBalance.objects.get_or_create(
-            user=user,
-            defaults={
-                'annual': 21,  # Default for annual leave
-                'sick': 14,    # Default for sick leave
-                'casual': 7,   # Default for casual leave
-                'maternity': 40 # Default for maternity leave
-            }
-        )
-        
-        # Calculate and deduct approved leave days
-        self._deduct_approved_leave_days(user, leave_balance)
+        """Retrieve the user's leave balance.
+
+        Balances are kept up to date by the leave ledger whenever a request is
+        approved or un-approved, so this is a pure read.
+        """
+        leave_balance = LeaveBalance.objects.filter(user=request.user).first()
+        if leave_balance is None:
+            # Nothing approved yet: report the full entitlement without creating a row
+            leave_balance = LeaveBalance(user=request.user, **default_balances())
 
         serializer = LeaveBalanceSerializer(leave_balance)
         return Response(serializer.data)
 
-    def _deduct_approved_leave_days(self, user, leave_balance):
-        """Calculate and deduct days for all 'APPROVED' leave requests."""
-        # Get all approved leave requests for this user
-        approved_leaves = LeaveRequest.objects.filter(user=user, status='APPROVED')
-        
-        # Initialize counters for each leave type
-        annual_days = 0
-        sick_days = 0
-        casual_days = 0
-        maternity_days = 0
-
-        # Calculate the total number of approved leave days for each type
-        for leave in approved_leaves:
-            start_date = leave.start_date
-            end_date = leave.end_date
-            leave_days = (end_date - start_date).days + 1  # Include end date
-            
-            if leave.leave_type == 'ANNUAL':
-                annual_days += leave_days
-            elif leave.leave_type == 'SICK':
-                sick_days += leave_days
-            elif leave.leave_type == 'CASUAL':
-                casual_days += leave_days
-            elif leave.leave_type == 'MATERNITY':
-                maternity_days += leave_days
-
-        # Deduct approved leave days from the balance based on defaults
-        leave_balance.annual = max(21 - annual_days, 0)  # Default 21 days for annual
-        leave_balance.sick = max(14 - sick_days, 0)      # Default 14 days for sick
-        leave_balance.casual = max(7 - casual_days, 0)   # Default 7 days for casual
-        leave_balance.maternity = max(40 - maternity_days, 0)  # Default 40 days for maternity
-
-        # Save the updated leave balance
-        leave_balance.save()
-
-        # Debugging output
-        print(f"Updated Leave Balances - Annual: {leave_balance.annual}, Sick: {leave_balance.sick}, Casual: {leave_balance.casual}, Maternity: {leave_balance.maternity}")
-
-
-class DepartmentViewSet(viewsets.ReadOnlyModelViewSet):
+
+class DepartmentViewSet(ConditionalListMixin, viewsets.ReadOnlyModelViewSet):
     queryset = Department.objects.all()
     serializer_class = DepartmentSerializer
     permission_classes = [IsAuthenticated]
 
-class RoleViewSet(viewsets.ReadOnlyModelViewSet):
+class RoleViewSet(ConditionalListMixin, viewsets.ReadOnlyModelViewSet):
     queryset = Role.objects.all()
     serializer_class = RoleSerializer
     permission_classes = [IsAuthenticated]
@@ -547,6 +627,14 @@ class WorkHoursViewSet(viewsets.ModelViewSet):
     queryset = WorkHours.objects.all()
     serializer_class = WorkHoursSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = TimeOrderedCursorPagination
+    filter_fields = {
+        'user': ['exact'],
+        'clock_in_time': ['gte', 'lt'],
+    }
+    date_range_field = 'clock_in_time'
+    ordering_fields = ('clock_in_time',)
+    ordering = ('-clock_in_time', '-id')
 
 
 class PerformanceViewSet(viewsets.ModelViewSet):
@@ -564,33 +652,20 @@ class AdminDashboardStatisticsView(APIView):
         if not request.user.is_staff:
             return Response({"error": "Unauthorized"}, status=status.HTTP_403_FORBIDDEN)
         
-        # Calculate statistics
-        total_employees = Employee.objects.count()
-        total_projects = Project.objects.count()
-        total_tasks = Task.objects.count()
-        
-        # Clock-ins today
-        today = timezone.now().date()
-        total_clockins_today = ClockInRecord.objects.filter(
-            time_clocked_in__date=today
-        ).count()
-        
-        # Pending leave requests
-        pending_leave_requests = LeaveRequest.objects.filter(status='PENDING').count()
-        
-        # Pending approvals (tasks + leave requests)
-        pending_task_approvals = Task.objects.filter(status='awaiting_approval').count()
-        pending_approvals = pending_leave_requests + pending_task_approvals
-        
+        # Shared, cached counters (see timesystem.statistics)
+        stats = get_statistics()
+        pending_leave_requests = stats['leave_requests']['pending']
+
         return Response({
-            'total_employees': total_employees,
-            'total_projects': total_projects,
-            'total_tasks': total_tasks,
-            'total_clockins_today': total_clockins_today,
+            'total_employees': stats['employees'],
+            'total_projects': stats['projects'],
+            'total_tasks': stats['tasks']['total'],
+            'total_clockins_today': stats['clockins']['today'],
             'pending_leave_requests': pending_leave_requests,
-            'pending_approvals': pending_approvals
+            # Pending approvals (tasks + leave requests)
+            'pending_approvals': pending_leave_requests + stats['tasks']['awaiting_approval'],
         })
-        
+
 
 class AdminDashboardChartsView(APIView):
     permission_classes = [IsAuthenticated]
@@ -619,14 +694,12 @@ class AdminDashboardChartsView(APIView):
             total_maternity=Sum('maternity')
         )
         
-        # 4. Weekly Hours Distribution
-        last_week = timezone.now() - timedelta(days=7)
-        weekly_hours = WorkHours.objects.filter(
-            clock_in_time__gte=last_week
-        ).annotate(
-            date=TruncDate('clock_in_time')
+        # 4. Weekly Hours Distribution (from the DailyAttendance rollup)
+        last_week = timezone.localdate() - timedelta(days=7)
+        weekly_hours = DailyAttendance.objects.filter(
+            date__gte=last_week
         ).values('date').annotate(
-            total_hours=Sum('total_hours')
+            total_hours=Sum('worked_hours')
         ).order_by('date')
         
         return Response({
@@ -637,110 +710,100 @@ class AdminDashboardChartsView(APIView):
         })
 
 class AdminDashboardRecentActivityView(APIView):
+    """Admin activity feed, read from the append-only ActivityLog.
+
+    Without ``?since=`` the newest entries come back newest first. With a
+    cursor only the entries after it come back, oldest first, for the client
+    to append. X-Activity-Cursor is the cursor to send next time.
+    """
     permission_classes = [IsAuthenticated]
     
     def get(self, request):
         if not request.user.is_staff:
             return Response({"error": "Unauthorized"}, status=status.HTTP_403_FORBIDDEN)
-            
-        # Get recent activities from multiple models
-        recent_activities = []
-        
-        # Clock in/out activities
-        clock_records = ClockInRecord.objects.select_related('user').order_by('-time_clocked_in')[:10]
-        for record in clock_records:
-            action = "clocked in" if not record.time_clocked_out else "clocked out"
-            recent_activities.append({
-                'type': 'attendance',
-                'user': record.user.username,
-                'action': action,
-                'timestamp': record.time_clocked_in,
-                'details': f"{record.hours_worked} hours worked"
-            })
-        
-        # Task activities
-        task_changes = Task.objects.select_related('assigned_to__user').order_by('-created_at')[:10]
-        for task in task_changes:
-            recent_activities.append({
-                'type': 'task',
-                'user': task.assigned_to.user.username if task.assigned_to else 'System',
-                'action': f"updated task status to {task.status}",
-                'timestamp': task.created_at,
-                'details': task.name
-            })
-        
-        # Leave request activities
-        leave_requests = LeaveRequest.objects.select_related('user').order_by('-created_at')[:10]
-        for leave in leave_requests:
-            recent_activities.append({
-                'type': 'leave',
-                'user': leave.user.username,
-                'action': f"submitted {leave.leave_type} leave request",
-                'timestamp': leave.created_at,
-                'details': f"{leave.start_date} to {leave.end_date}"
-            })
-        
-        # Sort all activities by timestamp
-        recent_activities.sort(key=lambda x: x['timestamp'], reverse=True)
-        
-        return Response(recent_activities[:10])  # Return top 10
 
+        config = get_activity_feed_settings()
+        since = request.query_params.get('since')
+        try:
+            limit = int(request.query_params.get('limit', config['MAX_PAGE_SIZE'] if since else config['LATEST']))
+            if limit < 1:
+                raise ValueError
+            limit = min(limit, config['MAX_PAGE_SIZE'])
+            entries = list((entries_after(since) if since else latest_entries())[:limit])
+        except ValueError:
+            return Response(
+                {'error': 'since must be a cursor from X-Activity-Cursor and limit a positive integer.'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        if entries:
+            cursor = encode_cursor(entries[-1] if since else entries[0])
+        else:
+            cursor = since or START_CURSOR
+        response = Response([activity_row(entry) for entry in entries])
+        response['X-Activity-Cursor'] = cursor
+        return response
+
+
+
+class AdminDashboardNotificationsView(generics.GenericAPIView):
+    """Notifications for the requesting admin, newest first, in pages of 10.
+
+    Rows are written when a leave request or task needs approval and when
+    someone clocks in late (see timesystem.notifications), so reading is one
+    indexed page. ``?unread=true`` and ``?status=`` narrow the list.
+    """
+    permission_classes = [IsAuthenticated]
+    pagination_class = NotificationPagination
+
+    def get_queryset(self):
+        queryset = notifications_for(self.request.user)
+        if self.request.query_params.get('unread', '').lower() in ('1', 'true', 'yes'):
+            queryset = queryset.filter(read=False)
+        notification_status = self.request.query_params.get('status')
+        if notification_status:
+            queryset = queryset.filter(status=notification_status)
+        return queryset
+
+    def get(self, request):
+        if not request.user.is_staff:
+            return Response({"error": "Unauthorized"}, status=status.HTTP_403_FORBIDDEN)
+
+        page = self.paginate_queryset(self.get_queryset())
+        return self.get_paginated_response([notification_row(notification) for notification in page])
+
+
+class AdminNotificationsReadView(APIView):
+    """Mark notifications read for the requesting admin: ``{"ids": [...]}`` or ``{"all": true}``."""
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        if not request.user.is_staff:
+            return Response({"error": "Unauthorized"}, status=status.HTTP_403_FORBIDDEN)
+
+        if request.data.get('all') is True:
+            marked = mark_all_read(request.user)
+        else:
+            ids = request.data.get('ids')
+            if not isinstance(ids, list) or not all(isinstance(pk, int) for pk in ids):
+                return Response({'error': 'ids must be a list of notification ids.'}, status=status.HTTP_400_BAD_REQUEST)
+            marked = mark_read(request.user, ids)
+        return Response({'marked': marked})
 
 
-class AdminDashboardNotificationsView(APIView):
+class SQLProfileView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
         if not request.user.is_staff:
             return Response({"error": "Unauthorized"}, status=status.HTTP_403_FORBIDDEN)
 
-        notifications = []
-
-        # 1. Pending leave requests
-        pending_leaves = LeaveRequest.objects.filter(status='PENDING').select_related('user')
-        for leave in pending_leaves:
-            notifications.append({
-                'type': 'leave',
-                'id': leave.id,
-                'title': 'Leave Request',
-                'message': f'{leave.user.get_full_name()} requested {leave.leave_type} leave',
-                'timestamp': leave.created_at,
-                'status': 'pending'
-            })
-
-        # 2. Tasks awaiting approval
-        pending_tasks = Task.objects.filter(status='awaiting_approval').select_related('assigned_to__user')
-        for task in pending_tasks:
-            user_name = task.assigned_to.user.get_full_name() if task.assigned_to else 'Someone'
-            notifications.append({
-                'type': 'task',
-                'id': task.id,
-                'title': 'Task Approval',
-                'message': f'Task "{task.name}" by {user_name} needs approval',
-                'timestamp': task.created_at,
-                'status': 'pending'
-            })
-
-        # 3. Late clock-ins (after 9 AM today)
-        today = datetime.now().date()
-        late_clockins = ClockInRecord.objects.filter(
-            time_clocked_in__date=today,
-            time_clocked_in__hour__gt=9
-        ).select_related('user')
-
-        for record in late_clockins:
-            clockin_time = record.time_clocked_in.strftime('%H:%M:%S')
-            notifications.append({
-                'type': 'attendance',
-                'id': record.id,
-                'title': 'Late Arrival',
-                'message': f'{record.user.username} clocked in late at {clockin_time}',
-                'timestamp': record.time_clocked_in,
-                'status': 'warning'
-            })
-
-        # Sort by timestamp descending
-        notifications.sort(key=lambda x: x['timestamp'], reverse=True)
-
-        # Return top 10 recent notifications
-        return Response(notifications[:10])
+        # Rolling per-view aggregates collected by SQLProfilingMiddleware
+        return Response(sql_profile.snapshot(view_name=request.query_params.get('view')))
+
+    def delete(self, request):
+        if not request.user.is_staff:
+            return Response({"error": "Unauthorized"}, status=status.HTTP_403_FORBIDDEN)
+
+        sql_profile.reset()
+        return Response(status=status.HTTP_204_NO_CONTENT)